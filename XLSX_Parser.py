@@ -1,230 +1,303 @@
+import argparse
 import json
 import xlsxwriter
+from xlsxwriter.utility import xl_range_abs, xl_rowcol_to_cell
 
-# -------- Load the JSON schedule --------
-with open("match_schedule.json", "r", encoding="utf-8") as f:
-    final_schedule = json.load(f)
+from match_model import A_TEAM_RANKS, read_schedule, slot_adjacency
 
-# -------- Helpers to parse entries (supports both old & new JSON shapes) --------
-def parse_entry(entry):
-    """
-    Accepts either:
-      ["MS4", ["UCD:", ["Neil"]], ["UCSC:", ["Eric"]]]
-    or:
-      ["MS4", ["Neil"], ["Eric"]]
-    Returns: (event_code, left_label, left_players, right_label, right_players)
-    """
-    event_code = entry[0]
-    # New shape with team label layer
-    if len(entry) >= 3 and isinstance(entry[1], list) and len(entry[1]) == 2 and isinstance(entry[1][1], list):
-        left_label = entry[1][0].rstrip(":").strip() if entry[1][0] else ""
-        left_players = [p.strip() for p in entry[1][1]]
-        right_label = entry[2][0].rstrip(":").strip() if entry[2][0] else ""
-        right_players = [p.strip() for p in entry[2][1]]
-    else:
-        # Old shape without team labels
-        left_label = ""
-        right_label = ""
-        left_players = [p.strip() for p in entry[1]]
-        right_players = [p.strip() for p in entry[2]]
-    return event_code, left_label, left_players, right_label, right_players
-
-def collect_team_labels(schedule_dict):
+def collect_team_labels(matches):
     """Collect unique team labels (without trailing ':') if present."""
     teams = set()
-    for _, courts in schedule_dict.items():
-        for _, entry in courts.items():
-            try:
-                _, llabel, _, rlabel, _ = parse_entry(entry)
-                if llabel:
-                    teams.add(llabel)
-                if rlabel:
-                    teams.add(rlabel)
-            except Exception:
-                pass
+    for m in matches:
+        teams.update(t for t in m.teams if t)
     teams = sorted(teams)
     return teams
 
-# -------- Build title + team headers --------
-all_teams = collect_team_labels(final_schedule)
-title = " vs ".join(all_teams) if all_teams else "Match Schedule"
-
-# Pad to 3 team headers if needed
-while len(all_teams) < 3:
-    all_teams.append(f"Team {len(all_teams)+1}")
-
-# -------- Excel setup --------
-workbook = xlsxwriter.Workbook('result.xlsx')
-worksheet = workbook.add_worksheet()
-worksheet.set_column("A:O", 15)
-worksheet.set_column("E:E", 12)  # T1 Team
-worksheet.set_column("H:H", 12)  # T2 Team
-worksheet.set_column("F:G", 20)
-worksheet.set_column("K:L", 12)
-worksheet.set_column("I:J", 20)
-worksheet.set_row(5, 20)
-for row in range(7, 201):
-    worksheet.set_row(row, 20)
-
-# -------- Formats --------
-meet_title_format = workbook.add_format({
-    "bold": 1, "underline": 0, "border": 1,
-    "align": "center", "valign": "vcenter",
-    "fg_color": "#8B5259", "font": "raleway", "size": 22,
-})
-categories = workbook.add_format({
-    "bold": 1, "border": 1, "align": "center", "valign": "vcenter",
-    "color": "#FFFFFF", "fg_color": "#355B85", "font": "raleway",
-    "size": 12, "bottom": 6,
-})
-data_blue = workbook.add_format({
-    "font": "raleway", "align": "center", "size": 10,
-    "border": 1, "fg_color": "#B1D3FA",
-    "border_color": "#789FCC",
-})
-data_blue2 = workbook.add_format({
-    "font": "raleway", "align": "center", "size": 10,
-    "border": 1, "fg_color": "#A1CAFF",
-    "border_color": "#789FCC",
-})
-data_yellow = workbook.add_format({
-    "font": "raleway", "align": "center", "size": 10,
-    "border": 1, "fg_color": "#FFDF80",
-    "border_color": "#E4C032",
-})
-data_black = workbook.add_format({
-    "font": "raleway", "align": "center", "size": 10,
-    "border": 1, "bold": 1, "color": "#FFFFFF", "fg_color": "#333333",
-})
-data_red = workbook.add_format({
-    "font": "raleway", "align": "center", "size": 10,
-    "border": 1, "bold": 1, "color": "#FFFFFF", "fg_color": "#79242F",
-})
-data_grey = workbook.add_format({
-    "font": "raleway", "align": "center", "size": 10,
-    "border": 1, "fg_color": "#CCCCCC",
-})
-
-# -------- Title + Headers --------
-worksheet.merge_range("D1:K5", title, meet_title_format)
-worksheet.merge_range(
-    "A1:C5",
-    "Instructions:\n"
-    "• Add checkboxes in the 'In progress' column if you like.\n"
-    "• Enter 1 in column M if Team 1 (left) wins; enter 1 in column N if Team 2 (right) wins.\n"
+HEADER_ROW = 5        # "Schedule / Court / ..." category row
+FIRST_DATA_ROW = 6    # first match row (Excel row 7)
+TALLY_COL = 11        # column L: one tally column per team from here
+HELPER_COL = 14       # columns O-R: event, rank, A-team flag, winning team (per match row)
+
+INSTRUCTIONS = [
+    "Instructions:",
+    "• Add checkboxes in the 'In progress' column if you like.",
+    "• Enter 1 in column M if Team 1 (left) wins; enter 1 in column N if Team 2 (right) wins.",
     "• Tallies update automatically.",
-    data_red
-)
-
-worksheet.write('A6', 'Schedule', categories)
-worksheet.write('B6', 'Court', categories)
-worksheet.write('C6', 'In progress', categories)
-worksheet.write('D6', 'Event', categories)
-worksheet.write('E6', 'T1 Team', categories)
-worksheet.merge_range('F6:G6', 'Team 1', categories)
-worksheet.write('H6', 'T2 Team', categories)
-worksheet.merge_range('I6:J6', 'Team 2', categories)
-worksheet.merge_range('K6:L6', 'Score (Winner First)', categories)
-worksheet.merge_range('M6:N6', 'Winner Flags (M=Team1, N=Team2)', categories)
-
-# -------- Row Writing --------
-start_counter = 7
-for sched_time, courts_dict in final_schedule.items():
-    court_count = max(1, len(courts_dict))
-    if courts_dict:
-        start_cell = "A" + str(start_counter)
-        end_cell = "A" + str(start_counter + court_count - 1)
-        worksheet.merge_range(f"{start_cell}:{end_cell}", sched_time, categories)
-
-    c_number = 1
-    for row in range(start_counter, start_counter + court_count):
-        court_cell = "B"+ str(row)
-        progress_cell = "C"+ str(row)
-        event_cell = "D"+ str(row)
-        t1_team_cell = "E" + str(row)
-        team1_cell = "F"+ str(row) + ":G" + str(row)
-        t2_team_cell = "H" + str(row)
-        team2_cell = "I" + str(row) + ":J" + str(row)
-        score_cell = "K" + str(row) + ":L" + str(row)
-        victory_cell_t1 = "M" + str(row)  # type 1 for left win
-        victory_cell_t2 = "N" + str(row)  # type 1 for right win
-
-        entry = courts_dict.get(str(c_number))
-        if entry:
-            try:
-                event_code, left_label, left_players, right_label, right_players = parse_entry(entry)
-
-                left_text = " + ".join(left_players)
-                right_text = " + ".join(right_players)
-
-                worksheet.write(progress_cell, "", data_yellow)
-                worksheet.write(event_cell, event_code, data_yellow)
-                worksheet.write(t1_team_cell, left_label, data_blue2)
-                worksheet.write(t2_team_cell, right_label, data_blue2)
-                worksheet.merge_range(team1_cell, left_text, data_blue)
-                worksheet.merge_range(team2_cell, right_text, data_blue)
-                worksheet.merge_range(score_cell, "", data_yellow)
-
-                # Leave winner flags BLANK; user enters 1 in M or N
-                worksheet.write(victory_cell_t1, "", data_blue)
-                worksheet.write(victory_cell_t2, "", data_blue)
-
-                worksheet.write(court_cell, c_number, data_blue)
-
-            except Exception:
-                pass
-        c_number += 1
-    start_counter += court_count
-
-# -------- Totals / Tally (Dynamic) --------
-# Team headers
-worksheet.write("L1", all_teams[0], data_red)
-worksheet.write("M1", all_teams[1], data_red)
-worksheet.write("N1", all_teams[2], data_red)
-worksheet.merge_range("L2:N2", "A-Team Tally", data_black)
-worksheet.merge_range("L4:N4", "Overall Tally", data_black)
-
-# Build SUMPRODUCT formulas over the full used range
-first_row = 7
-last_row = start_counter - 1  # last filled row
-
-E_rng = f"$E${first_row}:$E${last_row}"
-H_rng = f"$H${first_row}:$H${last_row}"
-D_rng = f"$D${first_row}:$D${last_row}"
-M_rng = f"$M${first_row}:$M${last_row}"
-N_rng = f"$N${first_row}:$N${last_row}"
-
-def overall_formula(header_cell):
-    # Sum Team1 wins where left team equals header, plus Team2 wins where right team equals header
-    return (
-        f"=SUMPRODUCT(({E_rng}={header_cell})*{M_rng})"
-        f"+SUMPRODUCT(({H_rng}={header_cell})*{N_rng})"
-    )
-
-def ateam_formula(header_cell):
+]
+
+def add_formats(workbook):
+    base = {"font": "raleway", "align": "center", "size": 10, "border": 1}
+    return {
+        "title": workbook.add_format({
+            "bold": 1, "underline": 0, "align": "center", "valign": "vcenter",
+            "fg_color": "#8B5259", "font": "raleway", "size": 22,
+        }),
+        "categories": workbook.add_format({
+            "bold": 1, "border": 1, "align": "center", "valign": "vcenter",
+            "color": "#FFFFFF", "fg_color": "#355B85", "font": "raleway",
+            "size": 12, "bottom": 6,
+        }),
+        "blue": workbook.add_format({**base, "fg_color": "#B1D3FA", "border_color": "#789FCC"}),
+        "blue2": workbook.add_format({**base, "fg_color": "#A1CAFF", "border_color": "#789FCC"}),
+        "yellow": workbook.add_format({**base, "fg_color": "#FFDF80", "border_color": "#E4C032"}),
+        "black": workbook.add_format({**base, "bold": 1, "color": "#FFFFFF", "fg_color": "#333333"}),
+        "red": workbook.add_format({**base, "bold": 1, "color": "#FFFFFF", "fg_color": "#79242F"}),
+        "grey": workbook.add_format({**base, "fg_color": "#CCCCCC"}),
+    }
+
+def _court_order(court):
+    return (0, int(court), "") if str(court).isdigit() else (1, 0, str(court))
+
+def sheet_rows(final_schedule, by_position, split=None, slot_minutes=None):
+    """
+    Group the schedule into sheets: [(sheet name, [(time_key, court key, match), ...]), ...].
+    split=None   : one "Schedule" sheet, every court of every slot
+    split="court": one sheet per court
+    split="session": one sheet per block of back-to-back slots (a break starts a new one)
+    A slot without any courts gets one empty row (court None) on the unsplit sheets.
+    slot_minutes: slot length for the session split (see match_model.slot_adjacency).
+    """
+    def rows_for(time_key, courts):
+        if not courts:
+            return [(time_key, None, None)]
+        return [(time_key, c, by_position.get((time_key, c))) for c in sorted(courts, key=_court_order)]
+
+    if split is None:
+        rows = []
+        for time_key, courts in final_schedule.items():
+            rows.extend(rows_for(time_key, courts))
+        return [("Schedule", rows)]
+
+    if split == "court":
+        per_court = {}
+        for time_key, courts in final_schedule.items():
+            for row in rows_for(time_key, courts):
+                if row[1] is not None:
+                    per_court.setdefault(row[1], []).append(row)
+        return [(f"Court {c}", per_court[c]) for c in sorted(per_court, key=_court_order)]
+
+    if split == "session":
+        time_keys = list(final_schedule)
+        adjacent = slot_adjacency(time_keys, slot_minutes)
+        sheets, rows = [], []
+        for i, time_key in enumerate(time_keys):
+            if i and not adjacent[i - 1] and rows:
+                sheets.append((f"Session {len(sheets) + 1}", rows))
+                rows = []
+            rows.extend(rows_for(time_key, final_schedule[time_key]))
+        if rows or not sheets:
+            sheets.append((f"Session {len(sheets) + 1}", rows))
+        return sheets
+
+    raise ValueError(f"split must be None, 'court' or 'session', not {split!r}")
+
+def tally_layout(teams, events, max_rank):
+    """
+    Every tally cell, shared by the scoring sheets and the Totals sheet:
+      [(row, col, value, format key, spec, last merged col or None), ...]
+    spec is None for labels, else ("ateam", i), ("overall", i), ("event", i, event)
+    or ("rank", i, rank) for team i. The A-Team/Overall block sits in rows 1-5 from
+    column L; the per-event and per-rank blocks sit to the right of the match rows.
+    """
+    n = len(teams)
+    last_col = TALLY_COL + n - 1
+    cells = [(0, TALLY_COL + i, team, "red", None, None) for i, team in enumerate(teams)]
+    cells.append((1, TALLY_COL, "A-Team Tally", "black", None, last_col))
+    cells += [(2, TALLY_COL + i, None, "grey", ("ateam", i), None) for i in range(n)]
+    cells.append((3, TALLY_COL, "Overall Tally", "black", None, last_col))
+    cells += [(4, TALLY_COL + i, None, "grey", ("overall", i), None) for i in range(n)]
+
+    col = max(HELPER_COL + 5, last_col + 2)
+    blocks = [("Event", [(e, e) for e in events]),
+              ("Rank", [(f"Rank {r}", r) for r in range(1, max_rank + 1)])]
+    row = 0
+    for label, keys in blocks:
+        cells.append((row, col, f"{label} Tally", "black", None, None))
+        cells += [(row, col + 1 + i, team, "red", None, None) for i, team in enumerate(teams)]
+        for text, key in keys:
+            row += 1
+            cells.append((row, col, text, "black", None, None))
+            cells += [(row, col + 1 + i, None, "grey", (label.lower(), i, key), None)
+                      for i in range(n)]
+        row += 2
+    return cells
+
+def write_tally_cells(worksheet, fmt, cells, formula):
+    """Write one row's worth of tally_layout cells; formula(spec, row, col) gives the formula text."""
+    for row, col, value, key, spec, merge_to in cells:
+        if spec is not None:
+            worksheet.write_formula(row, col, formula(spec, row, col), fmt[key])
+        elif merge_to is not None:
+            worksheet.merge_range(row, col, row, merge_to, value, fmt[key])
+        else:
+            worksheet.write(row, col, value, fmt[key])
+
+def _by_row(cells):
+    rows = {}
+    for cell in cells:
+        rows.setdefault(cell[0], []).append(cell)
+    return rows
+
+def write_schedule_sheet(workbook, fmt, name, title, teams, rows, names, layout):
+    """
+    One scoring sheet. The workbook is in constant-memory mode, so everything is written
+    strictly row by row: header band and tallies (ranges known up front), then one row
+    per (slot, court), with the per-event/per-rank tally rows written alongside. Each row
+    repeats its time label instead of merging the time column, which constant-memory
+    mode can't do across rows.
+    """
+    worksheet = workbook.add_worksheet(name)
+    worksheet.set_column(0, 14, 15)
+    worksheet.set_column(4, 4, 12)    # T1 Team
+    worksheet.set_column(7, 7, 12)    # T2 Team
+    worksheet.set_column(5, 6, 20)
+    worksheet.set_column(10, 11, 12)
+    worksheet.set_column(8, 9, 20)
+    worksheet.set_column(HELPER_COL, HELPER_COL + 3, 12)
+
+    # -------- Tally ranges over the rows this sheet will have --------
+    # Python fills O-Q (event, rank, A-team flag); R holds a per-row formula naming the
+    # winning team from the M/N flags. The tallies are plain COUNTIFS over those columns.
+    last_row = FIRST_DATA_ROW + max(1, len(rows)) - 1
+    event_rng, rank_rng, ateam_rng, winner_rng = (
+        xl_range_abs(FIRST_DATA_ROW, HELPER_COL + k, last_row, HELPER_COL + k) for k in range(4))
+    team_cells = [xl_rowcol_to_cell(0, TALLY_COL + i, True, True) for i in range(len(teams))]
+
+    def formula(spec, _row, _col):
+        kind, i = spec[0], spec[1]
+        won = f"{winner_rng},{team_cells[i]}"
+        if kind == "ateam":
+            return f"=COUNTIFS({won},{ateam_rng},1)"
+        if kind == "event":
+            return f"=COUNTIFS({won},{event_rng},\"{spec[2]}\")"
+        if kind == "rank":
+            return f"=COUNTIFS({won},{rank_rng},{spec[2]})"
+        return f"=COUNTIFS({won})"
+
+    tallies = _by_row(layout)
+
+    # -------- Title band, instructions and tallies (rows 1-5) --------
+    for row in range(5):
+        text = INSTRUCTIONS[row] if row < len(INSTRUCTIONS) else ""
+        worksheet.merge_range(row, 0, row, 2, text, fmt["red"])
+        worksheet.merge_range(row, 3, row, 10, title if row == 2 else "", fmt["title"])
+        write_tally_cells(worksheet, fmt, tallies.pop(row, ()), formula)
+
+    # -------- Headers --------
+    worksheet.set_row(HEADER_ROW, 20)
+    cat = fmt["categories"]
+    worksheet.write_row(HEADER_ROW, 0, ["Schedule", "Court", "In progress", "Event", "T1 Team"], cat)
+    worksheet.merge_range(HEADER_ROW, 5, HEADER_ROW, 6, "Team 1", cat)
+    worksheet.write(HEADER_ROW, 7, "T2 Team", cat)
+    worksheet.merge_range(HEADER_ROW, 8, HEADER_ROW, 9, "Team 2", cat)
+    worksheet.merge_range(HEADER_ROW, 10, HEADER_ROW, 11, "Score (Winner First)", cat)
+    worksheet.merge_range(HEADER_ROW, 12, HEADER_ROW, 13, "Winner Flags (M=Team1, N=Team2)", cat)
+    worksheet.write_row(HEADER_ROW, HELPER_COL, ["Event Type", "Rank", "A-Team", "Winner"], cat)
+    write_tally_cells(worksheet, fmt, tallies.pop(HEADER_ROW, ()), formula)
+
+    # -------- Row Writing --------
+    for row, (sched_time, court, m) in enumerate(rows, start=FIRST_DATA_ROW):
+        worksheet.set_row(row, 20)
+        write_tally_cells(worksheet, fmt, tallies.pop(row, ()), formula)
+        if court is None:
+            continue
+        worksheet.write(row, 0, sched_time, cat)
+        if m is None:
+            continue
+        left_label, right_label = m.teams
+        worksheet.write(row, 1, int(court) if str(court).isdigit() else court, fmt["blue"])
+        worksheet.write(row, 2, "", fmt["yellow"])
+        worksheet.write(row, 3, m.code, fmt["yellow"])
+        worksheet.write(row, 4, left_label, fmt["blue2"])
+        worksheet.merge_range(row, 5, row, 6, " + ".join(names[p] for p in m.sides[0]), fmt["blue"])
+        worksheet.write(row, 7, right_label, fmt["blue2"])
+        worksheet.merge_range(row, 8, row, 9, " + ".join(names[p] for p in m.sides[1]), fmt["blue"])
+        worksheet.merge_range(row, 10, row, 11, "", fmt["yellow"])
+        # Leave winner flags BLANK; user enters 1 in M or N
+        worksheet.write(row, 12, "", fmt["blue"])
+        worksheet.write(row, 13, "", fmt["blue"])
+
+        # -------- Helper columns --------
+        worksheet.write_row(row, HELPER_COL, [m.event, m.rank, int(m.rank <= A_TEAM_RANKS)], fmt["grey"])
+        e, h, flag1, flag2 = (xl_rowcol_to_cell(row, c) for c in (4, 7, 12, 13))
+        worksheet.write_formula(row, HELPER_COL + 3,
+                                f"=IF({flag1}=1,{e},IF({flag2}=1,{h},\"\"))", fmt["grey"])
+
+    # tally rows below the last match row
+    for row in sorted(tallies):
+        write_tally_cells(worksheet, fmt, tallies[row], formula)
+
+def write_totals_sheet(workbook, fmt, title, sheet_names, layout):
+    """First sheet of a split workbook: each tally summed over the per-court/per-session sheets."""
+    worksheet = workbook.add_worksheet("Totals")
+    worksheet.set_column(0, 14, 15)
+
+    def formula(_spec, row, col):
+        cell = xl_rowcol_to_cell(row, col, True, True)
+        return "=" + "+".join(f"'{sheet}'!{cell}" for sheet in sheet_names) if sheet_names else "=0"
+
+    tallies = _by_row(layout)
+    for row in range(5):
+        worksheet.merge_range(row, 3, row, 10, title if row == 2 else "", fmt["title"])
+        write_tally_cells(worksheet, fmt, tallies.pop(row, ()), formula)
+    for row in sorted(tallies):
+        write_tally_cells(worksheet, fmt, tallies[row], formula)
+
+def export_schedule(final_schedule, output="result.xlsx", split=None, slot_minutes=None):
     """
-    Restrict to A-Team matches (event codes ending in 1, 2, or 3).
-    Excel trick: use ISNUMBER(FIND(...)) instead of VALUE(RIGHT()) for text-safe matching.
+    Write the scripted results workbook for a match_schedule.json object.
+    split: None (one sheet), "court" or "session" (one sheet each, plus a Totals sheet).
+    slot_minutes: slot length for the session split; give the longest match for timed schedules.
+    Returns the skipped entries as (time_key, court key, reason); they are also printed.
     """
-    cond_text = (
-        f"(ISNUMBER(FIND(\"1\",RIGHT({D_rng},1)))"
-        f"+ISNUMBER(FIND(\"2\",RIGHT({D_rng},1)))"
-        f"+ISNUMBER(FIND(\"3\",RIGHT({D_rng},1))))"
-    )
-    return (
-        f"=SUMPRODUCT(({E_rng}={header_cell})*{M_rng}*({cond_text}>0))"
-        f"+SUMPRODUCT(({H_rng}={header_cell})*{N_rng}*({cond_text}>0))"
-    )
-
-
-# Write formulas for each team column (L/M/N)
-worksheet.write_formula("L3", ateam_formula("$L$1"), data_grey)
-worksheet.write_formula("M3", ateam_formula("$M$1"), data_grey)
-worksheet.write_formula("N3", ateam_formula("$N$1"), data_grey)
-
-worksheet.write_formula("L5", overall_formula("$L$1"), data_grey)
-worksheet.write_formula("M5", overall_formula("$M$1"), data_grey)
-worksheet.write_formula("N5", overall_formula("$N$1"), data_grey)
-
-workbook.close()
-print("✅ Exported result.xlsx — place 1s in M (Team1 wins) or N (Team2 wins); tallies update by team.")
+    # -------- Parse entries once (supports both old & new JSON shapes) --------
+    skipped = []
+    matches, placed = read_schedule(final_schedule, skipped=skipped)
+    by_position = {where: m for m, where in zip(matches, placed)}
+    sheets = sheet_rows(final_schedule, by_position, split, slot_minutes)
+
+    # -------- Build title + team headers --------
+    all_teams = collect_team_labels(matches)
+    title = " vs ".join(all_teams) if all_teams else "Match Schedule"
+
+    # Pad to 3 team headers if needed
+    while len(all_teams) < 3:
+        all_teams.append(f"Team {len(all_teams)+1}")
+
+    events = sorted({m.event for m in matches})
+    max_rank = max((m.rank for m in matches), default=0)
+    layout = tally_layout(all_teams, events, max_rank)
+
+    # -------- Excel setup --------
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+    fmt = add_formats(workbook)
+    if split is not None:
+        write_totals_sheet(workbook, fmt, title, [name for name, _ in sheets], layout)
+    for name, rows in sheets:
+        write_schedule_sheet(workbook, fmt, name, title, all_teams, rows, matches.players.names, layout)
+    workbook.close()
+
+    print(f"✅ Exported {output} — place 1s in M (Team1 wins) or N (Team2 wins); tallies update by team.")
+    if skipped:
+        print(f"❌ Skipped {len(skipped)} unreadable schedule entr{'y' if len(skipped) == 1 else 'ies'}:")
+        for time_key, court, reason in skipped:
+            print(f"   {time_key} court {court}: {reason}")
+    return skipped
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a match schedule to the scripted results workbook.")
+    parser.add_argument("schedule", nargs="?", default="match_schedule.json", help="schedule JSON")
+    parser.add_argument("--out", default="result.xlsx", help="output workbook")
+    parser.add_argument("--split", choices=("court", "session"), help="one sheet per court or per session")
+    parser.add_argument("--slot-minutes", type=int,
+                        help="session split: starts this close are one session (default: the shortest gap)")
+    args = parser.parse_args(argv)
+
+    # -------- Load the JSON schedule --------
+    with open(args.schedule, "r", encoding="utf-8") as f:
+        final_schedule = json.load(f)
+
+    export_schedule(final_schedule, output=args.out, split=args.split, slot_minutes=args.slot_minutes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from script_loader import load_script
+
+scheduler = load_script("meet-scheduler.py")
+
+# Rank depth per event for one team, taken from the sample tri-meet rosters
+DEFAULT_DEPTH = {"MD": 13, "MS": 11, "XD": 9, "WS": 7, "WD": 7}
+# Which player pools each event draws from, per rank
+EVENT_POOLS = {"MS": ("M",), "MD": ("M", "M"), "WS": ("W",), "WD": ("W", "W"), "XD": ("M", "W")}
+
+def generate_meet(teams=3, depth_scale=1.0, doubles_overlap=0.5, seed=0):
+    """
+    Synthetic rosters in the save.json shape:
+      {team: {event: {"Rank N": {"Player Name": [...]}}}}
+    depth_scale multiplies DEFAULT_DEPTH. doubles_overlap is the chance that a slot is
+    filled by a player the team already entered in another event (instead of a new one),
+    so higher values give denser conflict graphs. Same arguments -> same rosters.
+    """
+    rng = random.Random(seed)
+    meet = {}
+    for t in range(teams):
+        team = f"T{t + 1:02d}"
+        meet[team] = {e: {} for e in scheduler.EVENTS}
+        pools = {"M": [], "W": []}
+        for event in scheduler.EVENTS:
+            in_event = set()
+            for rank in range(1, max(1, round(DEFAULT_DEPTH[event] * depth_scale)) + 1):
+                names = []
+                for pool in EVENT_POOLS[event]:
+                    reuse = [p for p in pools[pool] if p not in in_event]
+                    if reuse and rng.random() < doubles_overlap:
+                        name = rng.choice(reuse)
+                    else:
+                        name = f"{team} {pool}{len(pools[pool]) + 1}"
+                        pools[pool].append(name)
+                    in_event.add(name)
+                    names.append(name)
+                meet[team][event][f"Rank {rank}"] = {"Player Name": names}
+    return meet
+
+def _measure(fn, repeat):
+    """Best wall time over `repeat` runs, then peak traced memory of one extra run."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {"seconds": round(best, 6), "peak_kb": round(peak / 1024, 1)}
+
+def bench_pipeline(meet, courts, slot_minutes=15, windows=(("10:15","12:00"), ("13:00","19:00")),
+                   repeat=3, excel=True):
+    """Time each pipeline stage on one meet; returns {stage: {"seconds", "peak_kb"}}."""
+    teams = list(meet)
+    stages = {}
+    slot_times = scheduler.build_slot_times(slot_minutes=slot_minutes, windows=windows)
+    max_slots = len(slot_times)
+
+    matches, stages["build_matches"] = _measure(
+        lambda: scheduler.build_matches(meet, teams), repeat)
+    _, stages["conflict_sets"] = _measure(lambda: scheduler.conflict_sets(matches), repeat)
+    _, stages["conflict_masks"] = _measure(lambda: scheduler.conflict_masks(matches), repeat)
+    result, stages["schedule_matches"] = _measure(
+        lambda: scheduler.schedule_matches(matches, courts=courts, max_slots=max_slots), repeat)
+    _, stages["schedule_matches[sets]"] = _measure(
+        lambda: scheduler.schedule_matches(matches, courts=courts, max_slots=max_slots,
+                                           engine="sets"), repeat)
+    _, slot_matches, unscheduled = result
+    schedule_json, stages["schedule_to_json"] = _measure(
+        lambda: scheduler.schedule_to_json(matches, slot_matches, slot_times), repeat)
+
+    try:
+        checker = load_script("conflict-checker.py")
+    except ImportError as e:
+        checker = None
+        print(f"Skipping conflict checker: {e}", file=sys.stderr)
+    if checker:
+        _, stages["conflict_checker"] = _measure(lambda: (
+            checker.check_conflicts(schedule_json),
+            checker.check_back_to_back(schedule_json),
+            checker.player_summary(schedule_json),
+        ), repeat)
+
+    if excel:
+        with tempfile.TemporaryDirectory() as tmp:
+            if checker:
+                _, stages["conflict_report_xlsx"] = _measure(
+                    lambda: checker.write_report(schedule_json, output=f"{tmp}/report.xlsx"), 1)
+            try:
+                import XLSX_Parser
+                _, stages["result_xlsx"] = _measure(
+                    lambda: XLSX_Parser.export_schedule(schedule_json, output=f"{tmp}/result.xlsx"), 1)
+            except ImportError as e:
+                print(f"Skipping result.xlsx export: {e}", file=sys.stderr)
+
+    counts = {
+        "matches": len(matches),
+        "players": len(matches.players),
+        "slots": max_slots,
+        "unscheduled": len(unscheduled),
+    }
+    return counts, stages
+
+def compare(results, baseline_path, threshold=0.25):
+    """Print per-stage ratios against a previous results file; returns the regressed stages."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {json.dumps(r["config"], sort_keys=True): r for r in json.load(f)["runs"]}
+    regressions = []
+    for run in results["runs"]:
+        old = baseline.get(json.dumps(run["config"], sort_keys=True))
+        if not old:
+            continue
+        for stage, now in run["stages"].items():
+            before = old["stages"].get(stage)
+            if not before or not before["seconds"]:
+                continue
+            ratio = now["seconds"] / before["seconds"]
+            flag = ""
+            # ignore sub-millisecond jitter on the tiny stages
+            if ratio > 1 + threshold and now["seconds"] - before["seconds"] > 0.001:
+                flag = "  <-- slower"
+                regressions.append((run["config"], stage, ratio))
+            print(f"  teams={run['config']['teams']:<3} {stage:<24} x{ratio:5.2f}{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scheduling pipeline on synthetic rosters.")
+    parser.add_argument("--teams", default="3,6,12", help="comma-separated team counts")
+    parser.add_argument("--depth-scale", type=float, default=1.0, help="multiply the default rank depth")
+    parser.add_argument("--overlap", type=float, default=0.5, help="chance a slot reuses an entered player")
+    parser.add_argument("--courts", type=int, help="courts (default: 2 per team)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage (best is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-excel", action="store_true", help="skip the XLSX export stages")
+    parser.add_argument("--out", default="benchmark_results.json", help="results file")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    results = {"python": platform.python_version(), "machine": platform.machine(), "runs": []}
+    for n in (int(x) for x in args.teams.split(",")):
+        config = {"teams": n, "depth_scale": args.depth_scale, "overlap": args.overlap,
+                  "courts": args.courts or 2 * n, "seed": args.seed}
+        meet = generate_meet(n, args.depth_scale, args.overlap, args.seed)
+        counts, stages = bench_pipeline(meet, config["courts"], repeat=args.repeat,
+                                        excel=not args.no_excel)
+        results["runs"].append({"config": config, "counts": counts, "stages": stages})
+        print(f"--- {n} teams: {counts['matches']} matches, {counts['players']} players, "
+              f"{counts['unscheduled']} unscheduled ---")
+        for stage, m in stages.items():
+            print(f"  {stage:<24} {m['seconds'] * 1000:10.2f} ms {m['peak_kb']:10.1f} KiB peak")
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=3)
+    print(f"✅ Results saved to {args.out}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} stage(s) slower than {args.compare} by more than "
+                  f"{args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,111 +1,199 @@
+import argparse
+import csv
 import json
-import pandas as pd
 from collections import defaultdict
 from pathlib import Path
 
-def flatten_players(entry):
-    """Extract all player names from a match entry"""
-    players = []
-    for side in entry[1:]:
-        if isinstance(side, list) and len(side) == 2 and isinstance(side[1], list):
-            players.extend(side[1])
-    return [p.strip() for p in players if p.strip()]
+from match_model import _smallest_gap, key_minutes, read_schedule
 
-def check_conflicts(schedule):
+class ScheduleIndex:
+    """
+    Everything the reports need, built in one pass over the schedule:
+      time_keys     : slot keys in chronological (schedule) order
+      starts        : each key's start in minutes (match_model.key_minutes), or None
+      step          : slot length in minutes: starts at most this far apart are back-to-back
+      player_slots  : player ID -> [(slot index, match code), ...] in slot order
+      players       : match_model.PlayerTable for display names
+      skipped       : unreadable entries as (time_key, court key, reason); not checked
+    slot_minutes defaults to the smallest gap between keys, which fits fixed-slot
+    schedules; for timed schedules (irregular start times) pass the longest match length.
+    """
+    __slots__ = ("time_keys", "starts", "step", "player_slots", "players", "skipped")
+
+    def __init__(self, schedule, slot_minutes=None):
+        self.time_keys = list(schedule)
+        slot_of = {key: i for i, key in enumerate(self.time_keys)}
+        self.skipped = []
+        matches, placed = read_schedule(schedule, skipped=self.skipped)
+        self.players = matches.players
+        self.player_slots = [[] for _ in range(len(self.players))]
+        for m, (key, _court) in zip(matches, placed):
+            entry = (slot_of[key], m.code)
+            for p in m.pids:
+                self.player_slots[p].append(entry)
+
+        self.starts = key_minutes(self.time_keys)
+        self.step = slot_minutes or (_smallest_gap(self.starts) if self.starts else 1)
+
+    def back_to_back(self, a, b):
+        """True if slot b (later in the schedule than a) starts within one slot length of a."""
+        if self.starts is None:
+            return b == a + 1   # unreadable keys: "next key in the schedule"
+        return self.starts[b] - self.starts[a] <= self.step
+
+def build_index(schedule, slot_minutes=None):
+    return ScheduleIndex(schedule, slot_minutes)
+
+def check_conflicts(schedule, index=None):
     """Find conflicts (same player playing multiple matches in same slot)"""
-    conflicts = {}
-    for timeslot, courts in schedule.items():
-        player_to_matches = defaultdict(list)
-        for court, match in courts.items():
-            match_id = match[0]
-            players = flatten_players(match)
-            for p in players:
-                player_to_matches[p].append(match_id)
-        # Conflicts = players appearing >1 time
-        conflicts[timeslot] = {p: m for p, m in player_to_matches.items() if len(m) > 1}
-    return {t: c for t, c in conflicts.items() if c}
-
-def check_back_to_back(schedule):
+    index = index or build_index(schedule)
+    by_slot = defaultdict(dict)
+    for p, slots in enumerate(index.player_slots):
+        for i in range(1, len(slots)):
+            s = slots[i][0]
+            if s == slots[i - 1][0]:
+                by_slot[s].setdefault(p, [slots[i - 1][1]]).append(slots[i][1])
+    # Conflicts = players appearing >1 time, reported in schedule order
+    return {
+        index.time_keys[s]: {index.players.display(p): codes for p, codes in by_slot[s].items()}
+        for s in sorted(by_slot)
+    }
+
+def check_back_to_back(schedule, index=None):
     """Find players who have matches in consecutive timeslots"""
-    back_to_back = defaultdict(list)
-    all_times = sorted(schedule.keys(), key=lambda t: (
-        int(t.split(':')[0]) * 60 + int(t.split(':')[1])
-    ))
-    prev_slot_players = set()
-
-    for t in all_times:
-        current_players = set()
-        for match in schedule[t].values():
-            current_players.update(flatten_players(match))
-        # Find intersection
-        overlap = current_players & prev_slot_players
-        for p in overlap:
-            back_to_back[p].append((prev_slot, t))
-        prev_slot_players = current_players
-        prev_slot = t
-
-    return dict(back_to_back)
-
-def player_summary(schedule):
+    index = index or build_index(schedule)
+    keys = index.time_keys
+    back_to_back = {}
+    for p, slots in enumerate(index.player_slots):
+        distinct = sorted({s for s, _code in slots})
+        pairs = [(keys[a], keys[b]) for a, b in zip(distinct, distinct[1:]) if index.back_to_back(a, b)]
+        if pairs:
+            back_to_back[index.players.display(p)] = pairs
+    return back_to_back
+
+def player_summary(schedule, index=None):
     """Return match counts and first/last appearance for each player"""
-    summary = defaultdict(lambda: {"matches": 0, "slots": []})
-    for t, matches in schedule.items():
-        for m in matches.values():
-            for p in flatten_players(m):
-                summary[p]["matches"] += 1
-                summary[p]["slots"].append(t)
-    for p, info in summary.items():
-        info["slots"].sort(key=lambda x: int(x.split(':')[0]) * 60 + int(x.split(':')[1]))
-        info["first"] = info["slots"][0]
-        info["last"] = info["slots"][-1]
+    index = index or build_index(schedule)
+    keys = index.time_keys
+    summary = {}
+    for p, slots in enumerate(index.player_slots):
+        if not slots:
+            continue
+        ordered = [keys[s] for s, _code in slots]
+        summary[index.players.display(p)] = {
+            "matches": len(slots),
+            "slots": ordered,
+            "first": ordered[0],
+            "last": ordered[-1],
+        }
     return summary
 
+# -------- Report rows (shared by the XLSX, CSV and JSON-lines writers) --------
+def report_sheets(conflicts, back_to_back, summary):
+    """
+    Yield (sheet name, header, rows) for the three report tables. rows is a generator,
+    so writers stream it straight to disk. Empty tables get a one-line message instead.
+    """
+    if conflicts:
+        yield "Conflicts", ("Time", "Player", "Matches"), (
+            (t, p, ", ".join(m)) for t, data in conflicts.items() for p, m in data.items()
+        )
+    else:
+        yield "Conflicts", ("Message",), iter([("No conflicts found",)])
+
+    if back_to_back:
+        yield "BackToBack", ("Player", "Consecutive Slots"), (
+            (p, " → ".join(a + " - " + b for a, b in slots)) for p, slots in back_to_back.items()
+        )
+    else:
+        yield "BackToBack", ("Message",), iter([("No back-to-back matches found",)])
+
+    ranked = sorted(summary.items(), key=lambda item: item[1]["matches"], reverse=True)
+    yield "Summary", ("Player", "Total Matches", "First Slot", "Last Slot"), (
+        (p, v["matches"], v["first"], v["last"]) for p, v in ranked
+    )
+
 def save_to_excel(conflicts, back_to_back, summary, output="conflict_report.xlsx"):
-    with pd.ExcelWriter(output) as writer:
-        # Conflicts
-        if conflicts:
-            df_conflicts = pd.DataFrame([
-                {"Time": t, "Player": p, "Matches": ", ".join(m)}
-                for t, data in conflicts.items() for p, m in data.items()
-            ])
-            df_conflicts.to_excel(writer, index=False, sheet_name="Conflicts")
-        else:
-            pd.DataFrame([{"Message": "No conflicts found"}]).to_excel(writer, index=False, sheet_name="Conflicts")
-
-        # Back-to-back
-        if back_to_back:
-            df_b2b = pd.DataFrame([
-                {"Player": p, "Consecutive Slots": " → ".join([a + " - " + b for a, b in slots])}
-                for p, slots in back_to_back.items()
-            ])
-            df_b2b.to_excel(writer, index=False, sheet_name="BackToBack")
-        else:
-            pd.DataFrame([{"Message": "No back-to-back matches found"}]).to_excel(writer, index=False, sheet_name="BackToBack")
-
-        # Summary
-        df_summary = pd.DataFrame([
-            {"Player": p, "Total Matches": v["matches"], "First Slot": v["first"], "Last Slot": v["last"]}
-            for p, v in summary.items()
-        ])
-        df_summary.sort_values(by="Total Matches", ascending=False).to_excel(writer, index=False, sheet_name="Summary")
+    import xlsxwriter  # only needed for the XLSX report
+
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+    header_format = workbook.add_format({"bold": 1, "border": 1, "align": "center"})
+    for name, header, rows in report_sheets(conflicts, back_to_back, summary):
+        worksheet = workbook.add_worksheet(name)
+        worksheet.write_row(0, 0, header, header_format)
+        for r, row in enumerate(rows, start=1):
+            worksheet.write_row(r, 0, row)
+    workbook.close()
+
+    print(f"✅ Conflict report saved to {output}")
+
+def save_to_csv(conflicts, back_to_back, summary, output_dir="."):
+    """One CSV per table: Conflicts.csv, BackToBack.csv, Summary.csv."""
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    for name, header, rows in report_sheets(conflicts, back_to_back, summary):
+        with open(Path(output_dir) / f"{name}.csv", "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+    print(f"✅ Conflict report CSVs saved to {output_dir}")
 
+def save_to_jsonl(conflicts, back_to_back, summary, output="conflict_report.jsonl"):
+    """One JSON object per row, tagged with its table: {"sheet": "Summary", "Player": ..., ...}."""
+    with open(output, "w", encoding="utf-8") as f:
+        for name, header, rows in report_sheets(conflicts, back_to_back, summary):
+            for row in rows:
+                f.write(json.dumps({"sheet": name, **dict(zip(header, row))}, ensure_ascii=False))
+                f.write("\n")
     print(f"✅ Conflict report saved to {output}")
 
-def main():
+def write_report(schedule, output="conflict_report.xlsx", csv_dir=None, jsonl=None, slot_minutes=None):
+    """
+    Run all checks on a schedule object and save the report; returns the conflicts found.
+    output=None skips the XLSX; csv_dir / jsonl add the plain-text formats. Entries that
+    can't be read are left out of the checks and printed.
+    slot_minutes: see ScheduleIndex (needed for timed schedules).
+    """
+    index = build_index(schedule, slot_minutes)
+    conflicts = check_conflicts(schedule, index)
+    back_to_back = check_back_to_back(schedule, index)
+    summary = player_summary(schedule, index)
+
+    if output:
+        save_to_excel(conflicts, back_to_back, summary, output=output)
+    if csv_dir:
+        save_to_csv(conflicts, back_to_back, summary, output_dir=csv_dir)
+    if jsonl:
+        save_to_jsonl(conflicts, back_to_back, summary, output=jsonl)
+    if index.skipped:
+        print(f"❌ Skipped {len(index.skipped)} unreadable schedule entr{'y' if len(index.skipped) == 1 else 'ies'} "
+              f"(not checked):")
+        for time_key, court, reason in index.skipped:
+            print(f"   {time_key} court {court}: {reason}")
+    return conflicts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check a match schedule for conflicts.")
+    parser.add_argument("schedule", nargs="?", default="match_schedule.json")
+    parser.add_argument("--out", default="conflict_report.xlsx", help="XLSX report path")
+    parser.add_argument("--no-xlsx", action="store_true", help="skip the XLSX report")
+    parser.add_argument("--csv", metavar="DIR", help="also write one CSV per table to DIR")
+    parser.add_argument("--jsonl", metavar="FILE", help="also write all rows as JSON lines")
+    parser.add_argument("--slot-minutes", type=int,
+                        help="starts this close count as back-to-back (default: the shortest gap "
+                             "between slots; give the longest match length for timed schedules)")
+    args = parser.parse_args(argv)
+
     # Load schedule JSON
-    path = Path("match_schedule.json")
+    path = Path(args.schedule)
     if not path.exists():
-        print("❌ Missing match_schedule.json file.")
+        print(f"❌ Missing {args.schedule} file.")
         return
 
     with open(path, "r", encoding="utf-8") as f:
         schedule = json.load(f)
 
-    conflicts = check_conflicts(schedule)
-    back_to_back = check_back_to_back(schedule)
-    summary = player_summary(schedule)
-
-    save_to_excel(conflicts, back_to_back, summary)
+    write_report(schedule, output=None if args.no_xlsx else args.out,
+                 csv_dir=args.csv, jsonl=args.jsonl, slot_minutes=args.slot_minutes)
 
 if __name__ == "__main__":
     main()
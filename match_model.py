@@ -0,0 +1,225 @@
+A_TEAM_RANKS = 3    # ranks 1-3 are a team's A team
+AVAILABILITY = "Availability"    # optional save.json team key: {player name: [["10:15", "12:00"], ...]}
+
+def player_name(name):
+    """A roster name as it is matched everywhere (rosters, availability, schedules, the db)."""
+    return name.strip()
+
+class PlayerTable:
+    """
+    Interned players: every (team, name) gets one small integer ID, in first-seen order.
+    Names are normalized with player_name().
+    """
+    __slots__ = ("names", "teams", "_ids", "_ambiguous")
+
+    def __init__(self):
+        self.names = []
+        self.teams = []
+        self._ids = {}
+        self._ambiguous = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, team, name):
+        name = player_name(name)
+        key = (team, name)
+        pid = self._ids.get(key)
+        if pid is None:
+            pid = self._ids[key] = len(self.names)
+            self.names.append(name)
+            self.teams.append(team)
+            self._ambiguous = None
+        return pid
+
+    def label(self, pid):
+        """'UCD:Neil Patel' style key."""
+        return f"{self.teams[pid]}:{self.names[pid]}"
+
+    def display(self, pid):
+        """Plain name for reports, or the team-prefixed label if two teams share the name."""
+        if self._ambiguous is None:
+            seen, self._ambiguous = {}, set()
+            for team, name in zip(self.teams, self.names):
+                if seen.setdefault(name, team) != team:
+                    self._ambiguous.add(name)
+        name = self.names[pid]
+        return self.label(pid) if name in self._ambiguous else name
+
+class Match:
+    """One match: event code, integer rank, (team1, team2) and a tuple of player IDs per side."""
+    __slots__ = ("event", "rank", "teams", "sides")
+
+    def __init__(self, event, rank, teams, sides):
+        self.event = event
+        self.rank = rank
+        self.teams = teams
+        self.sides = sides
+
+    @property
+    def code(self):
+        return f"{self.event}{self.rank}"   # e.g., "MD3"
+
+    @property
+    def pids(self):
+        return self.sides[0] + self.sides[1]
+
+    def __repr__(self):
+        return f"Match({self.code}, {self.teams[0]} vs {self.teams[1]}, {self.sides})"
+
+class MatchList(list):
+    """A list of Match records plus the PlayerTable their player IDs point into."""
+
+    def __init__(self, matches=(), players=None):
+        super().__init__(matches)
+        self.players = PlayerTable() if players is None else players
+
+def split_code(code):
+    """'MD3' -> ('MD', 3); a code without a rank number gets rank 0."""
+    event = code.rstrip("0123456789")
+    rank = code[len(event):]
+    return event, int(rank) if rank else 0
+
+def match_entry(match, players):
+    """Schedule JSON entry: ["MS4", ["UCD:", ["Neil Patel"]], ["UCSC:", ["Eric Wang"]]]."""
+    t1, t2 = match.teams
+    names = players.names
+    return [
+        match.code,
+        [f"{t1}:", [names[p] for p in match.sides[0]]],
+        [f"{t2}:", [names[p] for p in match.sides[1]]],
+    ]
+
+def parse_entry(entry):
+    """
+    Accepts either:
+      ["MS4", ["UCD:", ["Neil"]], ["UCSC:", ["Eric"]]]
+    or:
+      ["MS4", ["Neil"], ["Eric"]]
+    Returns: (event_code, left_label, left_players, right_label, right_players)
+    """
+    event_code = entry[0]
+    # New shape with team label layer
+    if len(entry) >= 3 and isinstance(entry[1], list) and len(entry[1]) == 2 and isinstance(entry[1][1], list):
+        left_label = entry[1][0].rstrip(":").strip() if entry[1][0] else ""
+        left_players = [p.strip() for p in entry[1][1]]
+        right_label = entry[2][0].rstrip(":").strip() if entry[2][0] else ""
+        right_players = [p.strip() for p in entry[2][1]]
+    else:
+        # Old shape without team labels
+        left_label = ""
+        right_label = ""
+        left_players = [p.strip() for p in entry[1]]
+        right_players = [p.strip() for p in entry[2]]
+    return event_code, left_label, left_players, right_label, right_players
+
+def entry_to_match(entry, players):
+    """Intern one schedule JSON entry (either shape) into a Match."""
+    code, t1, p1, t2, p2 = parse_entry(entry)
+    event, rank = split_code(code)
+    return Match(event, rank, (t1, t2), (
+        tuple(players.intern(t1, name) for name in p1 if name),
+        tuple(players.intern(t2, name) for name in p2 if name),
+    ))
+
+def read_schedule(schedule_json, players=None, skipped=None):
+    """
+    Parse a match_schedule.json object once.
+    Returns:
+      matches : MatchList in schedule order
+      placed  : per-match (time_key, court key) as found in the JSON
+    Malformed entries raise ValueError, or are appended to `skipped` as
+    (time_key, court key, reason) when a list is given.
+    """
+    matches = MatchList(players=players)
+    placed = []
+    for time_key, courts in schedule_json.items():
+        for court, entry in courts.items():
+            try:
+                match = entry_to_match(entry, matches.players)
+            except (IndexError, TypeError, AttributeError, ValueError) as e:
+                if skipped is None:
+                    raise ValueError(f"Bad schedule entry at {time_key} court {court}: {entry!r}") from e
+                skipped.append((time_key, court, f"{type(e).__name__}: {e}"))
+                continue
+            matches.append(match)
+            placed.append((time_key, court))
+    return matches, placed
+
+def matches_to_json(matches):
+    """Plain JSON list of entries (for caches); matches_from_json reverses it."""
+    return [match_entry(m, matches.players) for m in matches]
+
+def matches_from_json(entries):
+    matches = MatchList()
+    matches.extend(entry_to_match(entry, matches.players) for entry in entries)
+    return matches
+
+def slot_timeline(time_keys):
+    """
+    Real chronology of the schedule's slot keys, in schedule (insertion) order.
+    Keys are "HH:MM", optionally after a day label ("Sat 10:15"). The 12-hour keys
+    written by meet-scheduler.py ("11:45", "12:00", "01:00") are unwrapped, so 01:00
+    after 12:45 is 13:00, and a day whose first key is before 07:00 starts in the
+    afternoon. Returns a list of (day, minutes), or None if a key can't be read.
+    """
+    timeline = []
+    prev_day, prev, offset = None, None, 0
+    for key in time_keys:
+        day, _, hhmm = key.strip().rpartition(" ")
+        try:
+            h, m = hhmm.split(":")
+            minutes = int(h) * 60 + int(m)
+        except ValueError:
+            return None
+        if day != prev_day:
+            prev, offset = None, 0
+            if minutes < 7 * 60:
+                offset = 12 * 60    # "01:00" opening a day is 1 pm, not 1 am
+        while prev is not None and minutes + offset < prev:
+            offset += 12 * 60
+        prev, prev_day = minutes + offset, day
+        timeline.append((day, prev))
+    return timeline
+
+def key_minutes(time_keys):
+    """
+    Start of each slot key in minutes from midnight of the first day (see slot_timeline);
+    each new day label starts a day later. None if a key can't be read.
+    """
+    timeline = slot_timeline(time_keys)
+    if timeline is None:
+        return None
+    days = {}
+    return [days.setdefault(day, len(days)) * 24 * 60 + m for day, m in timeline]
+
+def _smallest_gap(minutes):
+    """Shortest gap between consecutive starts on the same day (1 if there is none)."""
+    return min((b - a for a, b in zip(minutes, minutes[1:]) if 0 < b - a < 24 * 60), default=1)
+
+def key_positions(time_keys):
+    """
+    Slot start positions counted in slot lengths from the first key, like meet-scheduler's
+    slot_positions but read from the schedule's time keys, so the break between windows
+    counts as rest. The slot length is the smallest gap between keys. None if a key
+    can't be read.
+    """
+    minutes = key_minutes(time_keys)
+    if minutes is None:
+        return None
+    step = _smallest_gap(minutes)
+    return [(m - minutes[0]) // step for m in minutes]
+
+def slot_adjacency(time_keys, slot_minutes=None):
+    """
+    adjacent[i] is True if slot i+1 starts within one slot length of slot i (no break,
+    same day). slot_minutes is that length; the default, the smallest gap between keys,
+    fits fixed-slot schedules. Timed schedules (irregular start times) should pass the
+    longest match length.
+    """
+    minutes = key_minutes(time_keys)
+    if minutes is None:
+        # unreadable keys: fall back to "next key in the schedule"
+        return [True] * max(0, len(time_keys) - 1)
+    step = slot_minutes or _smallest_gap(minutes)
+    return [0 <= b - a <= step for a, b in zip(minutes, minutes[1:])]
@@ -1,51 +1,112 @@
+import argparse
+import heapq
 import json
+import os
+import random
+import time
+from bisect import bisect_left, insort
 from collections import defaultdict
+from contextlib import contextmanager, nullcontext
 from datetime import datetime, timedelta
+from itertools import combinations
+
+import meet_store
+import pipeline_cache
+from script_loader import process_pool
+from match_model import (AVAILABILITY, Match, MatchList, _smallest_gap, key_minutes, key_positions,
+                         match_entry, matches_from_json, matches_to_json, player_name, read_schedule)
 
 # Prioritize WD so it doesn't get squeezed out, then WS, MD, XD, MS
 EVENTS = ["WD", "WS", "MD", "XD", "MS"]
 
-def build_matches(meet, teams):
-    """Return list of match dicts for tri-meet A-B, A-C, B-C at matching ranks."""
-    def team_rank_players(team, event, rank_key):
-        return meet[team][event].get(rank_key, {}).get("Player Name")
+class ScheduleStats:
+    """
+    Opt-in instrumentation for one make_schedule run: wall time per stage (seconds)
+    and placement counters. Pass an instance as stats=...; with stats=None nothing is
+    measured and the hot loops run uninstrumented.
+    """
+    __slots__ = ("stages", "counters")
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = defaultdict(int)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def as_dict(self):
+        return {
+            "stages": {name: round(sec, 6) for name, sec in self.stages.items()},
+            "total_seconds": round(sum(self.stages.values()), 6),
+            "counters": dict(self.counters),
+        }
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=3)
+
+def _stage(stats, name):
+    """stats.stage(name), or a no-op context when stats are off."""
+    return nullcontext() if stats is None else stats.stage(name)
+
+def _rank_sort_key(rank):
+    try:
+        return int(rank.split()[-1])
+    except Exception:
+        return 10**9
+
+def round_robin_pairings(teams):
+    """All team pairs in roster order: A-B, A-C, B-C for a tri-meet, and so on for N teams."""
+    return list(combinations(teams, 2))
+
+def iter_matches(meet, teams, pairings=None, players=None):
+    """
+    Lazily yield Match records for every pairing at matching ranks, event by event.
+    pairings defaults to round_robin_pairings(teams). Players are interned into
+    `players` (a match_model.PlayerTable) once per team/event/rank, and the resulting
+    ID tuples are shared by every match that uses them.
+    """
+    if players is None:
+        players = MatchList().players
+    if pairings is None:
+        pairings = round_robin_pairings(teams)
+    pairings = [tuple(pair) for pair in pairings]
+    in_play = sorted({t for pair in pairings for t in pair}, key=list(teams).index)
 
-    pairings = [(teams[0], teams[1]), (teams[0], teams[2]), (teams[1], teams[2])]
-    matches = []
     for event in EVENTS:
-        # collect all ranks that appear for this event across the three teams
+        # collect all ranks that appear for this event across the teams in play
         all_ranks = set()
-        for t in teams:
+        for t in in_play:
             all_ranks |= set(meet[t][event].keys())
-        # for each rank, create the two-school matches that exist
-        def rank_key_fn(r):
-            try:
-                return int(r.split()[-1])
-            except Exception:
-                return 10**9
-        for rank in sorted(all_ranks, key=rank_key_fn):
+        for rank in sorted(all_ranks, key=_rank_sort_key):
+            rnum = _rank_number(rank)
+            keyed = {}
+            for t in in_play:
+                names = meet[t][event].get(rank, {}).get("Player Name")
+                if names:
+                    keyed[t] = tuple(players.intern(t, name) for name in names)
+            # for each rank, create the two-school matches that exist
             for t1, t2 in pairings:
-                p1 = team_rank_players(t1, event, rank)
-                p2 = team_rank_players(t2, event, rank)
-                if p1 and p2:
-                    matches.append({
-                        "event": event,
-                        "rank": rank,  # e.g., "Rank 3"
-                        "teams": (t1, t2),
-                        "players": {
-                            t1: [f"{t1}:{name}" for name in p1],
-                            t2: [f"{t2}:{name}" for name in p2],
-                        }
-                    })
+                if t1 in keyed and t2 in keyed:
+                    yield Match(event, rnum, (t1, t2), (keyed[t1], keyed[t2]))
+
+def build_matches(meet, teams, pairings=None):
+    """Return a MatchList for every pairing (default: all team pairs) at matching ranks."""
+    matches = MatchList()
+    matches.extend(iter_matches(meet, teams, pairings, matches.players))
     return matches
 
 def conflict_sets(matches):
     """Build conflict sets: two matches conflict if they share any player."""
     player_to_matches = defaultdict(list)
     for i, m in enumerate(matches):
-        for players in m["players"].values():
-            for p in players:
-                player_to_matches[p].append(i)
+        for p in m.pids:
+            player_to_matches[p].append(i)
 
     conflicts = [set() for _ in matches]
     for lst in player_to_matches.values():
@@ -72,21 +133,289 @@ def build_slot_times(slot_minutes=15, windows=None):
             t += timedelta(minutes=slot_minutes)
     return slots
 
-def schedule_matches(matches, courts=6, max_slots=None):
+def player_count(matches):
+    """Size of the player ID range used by these matches (IDs are dense from 0)."""
+    return max((p for m in matches for p in m.pids), default=-1) + 1
+
+def conflict_masks(matches):
     """
-    Greedy graph coloring with per-slot capacity and a fixed number of slots.
+    Bitset conflict engine.
     Returns:
-      match_slot       : list of slot indices for each match (or -1 if unscheduled)
-      slot_matches     : list (len=max_slots) of lists of match indices scheduled in that slot
-      unscheduled_list : list of match indices that couldn't be placed
+      player_masks : per-match int with bit p set for every player ID p in the match
+      degrees      : per-match number of other matches sharing a player
+                     (same value as len(conflict_sets(matches)[i]))
+    Two matches conflict iff player_masks[i] & player_masks[j] is non-zero.
+    """
+    player_masks = []
+    matches_of = [0] * player_count(matches)  # player id -> bitmask of match indices
+    for i, m in enumerate(matches):
+        mask = 0
+        for pid in m.pids:
+            mask |= 1 << pid
+            matches_of[pid] |= 1 << i
+        player_masks.append(mask)
+
+    degrees = []
+    for mask in player_masks:
+        union = 0
+        while mask:
+            low = mask & -mask
+            union |= matches_of[low.bit_length() - 1]
+            mask ^= low
+        degrees.append(bin(union).count("1") - 1)
+    return player_masks, degrees
+
+def slot_positions(slot_times):
+    """
+    Slot start times counted in slot lengths from the first slot, so the gap between
+    windows counts as rest: with 15-min slots, 11:45 -> 13:00 is 5 positions apart, not 1.
+    """
+    if not slot_times:
+        return []
+    first, first_end = slot_times[0]
+    length = first_end - first
+    return [(start - first) // length for start, _end in slot_times]
+
+def rest_rule(matches, min_rest_slots=0, slot_pos=None):
+    """
+    Picklable minimum-rest constraint for the placement loops, or None when there is none.
+    A player's matches must be more than min_rest_slots positions apart
+    (1 forbids back-to-back slots, 2 also leaves a free slot in between, ...).
+    """
+    if min_rest_slots <= 0:
+        return None
+    match_pids = [m.pids for m in matches]
+    return match_pids, player_count(matches), slot_pos, min_rest_slots
+
+class RestIndex:
+    """Sorted slot positions per player ID, so a rest check is a bisect per player."""
+    __slots__ = ("match_pids", "slot_pos", "min_rest", "player_slots")
+
+    def __init__(self, rule):
+        self.match_pids, n_players, slot_pos, self.min_rest = rule
+        self.slot_pos = slot_pos
+        self.player_slots = [[] for _ in range(n_players)]
+
+    def _pos(self, s):
+        return s if self.slot_pos is None else self.slot_pos[s]
+
+    def ok(self, mid, s):
+        pos = self._pos(s)
+        lo, hi = pos - self.min_rest, pos + self.min_rest
+        for pid in self.match_pids[mid]:
+            taken = self.player_slots[pid]
+            i = bisect_left(taken, lo)
+            if i < len(taken) and taken[i] <= hi:
+                return False
+        return True
+
+    def add(self, mid, s):
+        pos = self._pos(s)
+        for pid in self.match_pids[mid]:
+            insort(self.player_slots[pid], pos)
+
+    def remove(self, mid, s):
+        pos = self._pos(s)
+        for pid in self.match_pids[mid]:
+            taken = self.player_slots[pid]
+            del taken[bisect_left(taken, pos)]
+
+# ------------------- player availability -------------------
+def _minutes(clock):
+    """'13:05' -> 785 (minutes after midnight)."""
+    t = datetime.strptime(clock, "%H:%M")
+    return t.hour * 60 + t.minute
+
+def _clock(minutes):
+    """Minutes after midnight -> datetime on the same base day build_slot_times uses."""
+    return datetime.strptime("00:00", "%H:%M") + timedelta(minutes=minutes)
+
+def player_windows(meet, teams, players):
+    """
+    Per-player availability from each team's optional AVAILABILITY entry in the rosters,
+    {"Player Name": [["10:15", "12:00"], ["13:00", "15:30"]], ...}.
+    Returns ({player ID: [(start, end) minutes, ...]}, unknown) for the players in
+    `players` (a PlayerTable); anyone without an entry is available all day. unknown
+    lists "TEAM:name" entries that match no player in these matches (usually a typo).
+    """
+    ids = {(team, name): pid for pid, (team, name) in enumerate(zip(players.teams, players.names))}
+    windows, unknown = {}, []
+    for t in teams:
+        for name, spans in meet[t].get(AVAILABILITY, {}).items():
+            pid = ids.get((t, player_name(name)))
+            if pid is None:
+                unknown.append(f"{t}:{name}")
+                continue
+            intervals = sorted((_minutes(a), _minutes(b)) for a, b in spans)
+            for a, b in intervals:
+                if b <= a:
+                    raise ValueError(f"{t}:{name} is available from {_clock(a):%H:%M} to {_clock(b):%H:%M}.")
+            windows[pid] = intervals
+    return windows, unknown
+
+def availability_masks(windows_by_pid, slot_times):
+    """Player ID -> bitmask of the slots (bit s = slot s) that lie inside one of their windows."""
+    spans = [(start.hour * 60 + start.minute, end.hour * 60 + end.minute) for start, end in slot_times]
+    allowed = {}
+    for pid, intervals in windows_by_pid.items():
+        mask = 0
+        for s, (a, b) in enumerate(spans):
+            if any(lo <= a and b <= hi for lo, hi in intervals):
+                mask |= 1 << s
+        allowed[pid] = mask
+    return allowed
+
+def blocked_slot_masks(allowed, max_slots):
+    """
+    availability_masks turned around: per slot, a bitmask of the players NOT available
+    then (None when nobody has a window). The placement loops start each slot's occupancy
+    mask from it, so the usual conflict AND also rejects an unavailable player.
+    """
+    if not allowed:
+        return None
+    blocked = [0] * max_slots
+    for pid, mask in allowed.items():
+        bit = 1 << pid
+        for s in range(max_slots):
+            if not mask >> s & 1:
+                blocked[s] |= bit
+    return blocked
+
+def availability_problems(matches, allowed, max_slots, min_rest_slots=0, slot_pos=None):
+    """
+    Availability that can't be met, found before any solver runs: matches whose players
+    are never all available in the same slot, and players with more matches than fit in
+    their available slots (with min_rest_slots of rest between them).
     """
+    players = matches.players if isinstance(matches, MatchList) else None
+    label = players.label if players else str
+    everywhere = (1 << max_slots) - 1
+    problems = []
+    per_player = defaultdict(int)
+    for m in matches:
+        mask = everywhere
+        for p in m.pids:
+            if p in allowed:
+                mask &= allowed[p]
+                per_player[p] += 1
+        if not mask:
+            who = [label(p) for p in m.pids if p in allowed]
+            problems.append(f"{m.code} {m.teams[0]} vs {m.teams[1]}: no slot where {' and '.join(who)} "
+                            f"{'is' if len(who) == 1 else 'are all'} available")
+    for p, mask in allowed.items():
+        slots = [s for s in range(max_slots) if mask >> s & 1]
+        fit = len(slots)
+        if min_rest_slots > 0:
+            fit = _rest_capacity([s if slot_pos is None else slot_pos[s] for s in slots], min_rest_slots)
+        if per_player[p] > fit:
+            problems.append(f"{label(p)} plays {per_player[p]} matches but only {fit} fit "
+                            f"in their available slots")
+    return problems
+
+# ------------------- lower bounds / pre-check -------------------
+def _clique_bound(matches):
+    """
+    Greedy clique in the conflict graph (matches sharing a player): all of them need
+    different slots. Each player's matches seed one clique, which is then grown with
+    matches that conflict with every member - e.g. a doubles pair's matches plus the
+    partner's singles. Returns (size, match indices).
+    """
+    matches_of = [0] * player_count(matches)
+    for i, m in enumerate(matches):
+        for p in m.pids:
+            matches_of[p] |= 1 << i
+    neighbours = []
+    for m in matches:
+        union = 0
+        for p in m.pids:
+            union |= matches_of[p]
+        neighbours.append(union)
+    degree = [n.bit_count() for n in neighbours]
+
+    best = 0
+    for seed in matches_of:
+        if not seed:
+            continue
+        clique = seed
+        cand = -1
+        bits = seed
+        while bits:
+            low = bits & -bits
+            cand &= neighbours[low.bit_length() - 1]
+            bits ^= low
+        cand &= ~clique
+        while cand:
+            pick, bits = -1, cand
+            while bits:
+                low = bits & -bits
+                i = low.bit_length() - 1
+                if pick < 0 or degree[i] > degree[pick]:
+                    pick = i
+                bits ^= low
+            clique |= 1 << pick
+            cand &= neighbours[pick] & ~clique
+        if clique.bit_count() > best.bit_count():
+            best = clique
+    members = [i for i in range(len(matches)) if best >> i & 1]
+    return len(members), members
+
+def _rest_capacity(slot_pos, min_rest_slots):
+    """Most matches one player can fit in these slots when they must be > min_rest_slots apart."""
+    count, last = 0, None
+    for pos in slot_pos:
+        if last is None or pos - last > min_rest_slots:
+            count, last = count + 1, pos
+    return count
+
+def schedule_bounds(matches, courts, max_slots=None, min_rest_slots=0, slot_pos=None):
+    """
+    Cheap lower bounds on the slots a schedule needs, checked before any solver runs:
+      capacity : ceil(matches / courts)
+      player   : most matches any one player has (they all need different slots)
+      clique   : a larger set of pairwise-conflicting matches (see _clique_bound)
+    Returns a dict with "slots" (the best bound), the parts above, and "problems":
+    reasons the matches can't all fit in max_slots (empty when they might).
+    """
+    n = len(matches)
+    players = matches.players if isinstance(matches, MatchList) else None
+    per_player = [0] * player_count(matches)
+    for m in matches:
+        for p in m.pids:
+            per_player[p] += 1
+    busiest = max(range(len(per_player)), key=per_player.__getitem__, default=None)
+    clique, members = _clique_bound(matches)
+    bounds = {
+        "capacity": -(-n // courts) if n else 0,
+        "player": per_player[busiest] if busiest is not None else 0,
+        "busiest": (players.label(busiest) if players else busiest) if busiest is not None else None,
+        "clique": clique,
+        "clique_matches": members,
+    }
+    bounds["slots"] = max(bounds["capacity"], bounds["player"], clique)
+
+    problems = []
+    if max_slots is not None and bounds["slots"] > max_slots:
+        if bounds["capacity"] > max_slots:
+            why = f"{n} matches on {courts} courts"
+        elif clique > bounds["player"]:
+            why = f"{clique} matches share players pairwise ({', '.join(matches[i].code for i in members)})"
+        else:
+            why = f"{bounds['busiest']} plays {bounds['player']} matches"
+        problems.append(f"needs at least {bounds['slots']} slots ({why}), only {max_slots} available")
+    if max_slots is not None and min_rest_slots > 0 and busiest is not None:
+        fit = _rest_capacity(slot_pos if slot_pos is not None else range(max_slots), min_rest_slots)
+        if bounds["player"] > fit:
+            problems.append(f"{bounds['busiest']} plays {bounds['player']} matches but only {fit} "
+                            f"fit with {min_rest_slots} slot(s) of rest")
+    bounds["problems"] = problems
+    return bounds
+
+def _schedule_matches_sets(matches, courts, max_slots):
+    """Original set-of-sets path, kept so results can be compared against the bitset engine."""
     conflicts = conflict_sets(matches)
     # order by degree (most constrained first)
     order = sorted(range(len(matches)), key=lambda i: len(conflicts[i]), reverse=True)
 
-    if max_slots is None:
-        raise ValueError("max_slots must be provided (use build_slot_times to define windows).")
-
     slot_matches = [[] for _ in range(max_slots)]
     match_slot = [-1] * len(matches)
     unscheduled = []
@@ -109,6 +438,615 @@ def schedule_matches(matches, courts=6, max_slots=None):
 
     return match_slot, slot_matches, unscheduled
 
+def _greedy_place(order, player_masks, courts, max_slots, rest=None, counters=None, blocked=None):
+    """
+    Place matches in the given order into the first slot with a free court and no
+    shared player. Each slot keeps an occupancy bitmask of the players already in it,
+    so a conflict check is a single AND. `rest` is an optional rest_rule(...).
+    `blocked` (blocked_slot_masks) seeds those masks with the players unavailable in
+    each slot, so the same AND also enforces availability.
+    `counters` (ScheduleStats.counters) also counts probes and rejections; only the
+    rejection branches count, and the rest is derived afterwards.
+    """
+    counting = counters is not None
+    slot_matches = [[] for _ in range(max_slots)]
+    slot_masks = list(blocked) if blocked else [0] * max_slots
+    match_slot = [-1] * len(player_masks)
+    unscheduled = []
+    rest_index = RestIndex(rest) if rest else None
+    full = clashes = rested = 0
+
+    for mid in order:
+        mask = player_masks[mid]
+        for s in range(max_slots):
+            if len(slot_matches[s]) >= courts:
+                if counting:
+                    full += 1
+                continue
+            if slot_masks[s] & mask:
+                if counting:
+                    clashes += 1
+                continue
+            if rest_index and not rest_index.ok(mid, s):
+                if counting:
+                    rested += 1
+                continue
+            slot_matches[s].append(mid)
+            slot_masks[s] |= mask
+            match_slot[mid] = s
+            if rest_index:
+                rest_index.add(mid, s)
+            break
+        else:
+            unscheduled.append(mid)
+
+    if counting:
+        # every probe ends in exactly one rejection or the placement
+        placed = len(order) - len(unscheduled)
+        counters["slots_probed"] += full + clashes + rested + placed
+        counters["capacity_rejections"] += full
+        counters["conflict_checks"] += clashes + rested + placed
+        counters["conflict_rejections"] += clashes
+        if rest_index:
+            counters["rest_checks"] += rested + placed
+            counters["rest_rejections"] += rested
+    return match_slot, slot_matches, unscheduled
+
+def schedule_matches(matches, courts=6, max_slots=None, engine="bitset",
+                     min_rest_slots=0, slot_pos=None, stats=None, blocked=None):
+    """
+    Greedy graph coloring with per-slot capacity and a fixed number of slots.
+    engine: "bitset" (default) checks conflicts with per-slot player bitmasks;
+            "sets" uses the original conflict_sets path. Both give the same schedule.
+    min_rest_slots: keep each player's matches more than this many slots apart,
+            measured on slot_pos (see slot_positions) when given.
+    blocked: per-slot bitmask of unavailable players (blocked_slot_masks), or None.
+    stats: optional ScheduleStats; fills the conflict_build / schedule_matches stages
+            and the placement counters.
+    Returns:
+      match_slot       : list of slot indices for each match (or -1 if unscheduled)
+      slot_matches     : list (len=max_slots) of lists of match indices scheduled in that slot
+      unscheduled_list : list of match indices that couldn't be placed
+    """
+    if max_slots is None:
+        raise ValueError("max_slots must be provided (use build_slot_times to define windows).")
+
+    if engine == "sets":
+        if min_rest_slots > 0 or blocked:
+            raise ValueError("min_rest_slots and availability are only supported by the 'bitset' engine.")
+        with _stage(stats, "schedule_matches"):
+            return _schedule_matches_sets(matches, courts, max_slots)
+    if engine != "bitset":
+        raise ValueError(f"Unknown engine {engine!r} (expected 'bitset' or 'sets').")
+
+    with _stage(stats, "conflict_build"):
+        player_masks, degrees = conflict_masks(matches)
+        rest = rest_rule(matches, min_rest_slots, slot_pos)
+    with _stage(stats, "schedule_matches"):
+        # order by degree (most constrained first)
+        order = sorted(range(len(matches)), key=lambda i: degrees[i], reverse=True)
+        return _greedy_place(order, player_masks, courts, max_slots, rest,
+                             None if stats is None else stats.counters, blocked)
+
+def _schedule_cost(slot_matches, unscheduled):
+    """Lower is better: (unscheduled count, last used slot, matches in that last slot)."""
+    last = len(slot_matches) - 1
+    while last >= 0 and not slot_matches[last]:
+        last -= 1
+    return (len(unscheduled), last, len(slot_matches[last]) if last >= 0 else 0)
+
+def improve_schedule(matches, match_slot, slot_matches, unscheduled, courts=6,
+                     time_budget=2.0, seed=None, tabu_tenure=7, player_masks=None, rest=None,
+                     lower_bound=None, blocked=None):
+    """
+    Anytime local search seeded with a greedy schedule.
+    Each step picks an unscheduled match (or, once everything fits, a match from the
+    last used slot) and moves it to an earlier slot, either directly or by kicking out
+    the one match blocking it there. The kicked match is re-placed first-fit, or left
+    unscheduled, and stays tabu for a few steps so the search doesn't undo its own move.
+    `rest` is an optional rest_rule(...) and `blocked` optional blocked_slot_masks(...);
+    every move must respect both.
+    lower_bound: slots any schedule needs (schedule_bounds); the search stops as soon as
+    everything fits in that many, since nothing can be better.
+    Returns the best (match_slot, slot_matches, unscheduled) seen before the budget ran out.
+    """
+    if player_masks is None:
+        player_masks, _ = conflict_masks(matches)
+    max_slots = len(slot_matches)
+    rng = random.Random(seed)
+
+    # working copies; the inputs are left untouched
+    match_slot = list(match_slot)
+    slot_matches = [list(mids) for mids in slot_matches]
+    unscheduled = list(unscheduled)
+    slot_masks = rest_index = None
+
+    def rebuild():
+        nonlocal slot_masks, rest_index
+        slot_masks = list(blocked) if blocked else [0] * max_slots
+        rest_index = RestIndex(rest) if rest else None
+        for s, mids in enumerate(slot_matches):
+            for m in mids:
+                slot_masks[s] |= player_masks[m]
+                if rest_index:
+                    rest_index.add(m, s)
+
+    def fits_rest(mid, s, without=-1):
+        # rest check for mid at s, ignoring the match `without` (about to be kicked from s)
+        if not rest_index:
+            return True
+        if without >= 0:
+            rest_index.remove(without, s)
+        ok = rest_index.ok(mid, s)
+        if without >= 0:
+            rest_index.add(without, s)
+        return ok
+
+    rebuild()
+
+    def snapshot():
+        return list(match_slot), [list(mids) for mids in slot_matches], list(unscheduled)
+
+    def first_fit(mid, skip):
+        mask = player_masks[mid]
+        for s in range(max_slots):
+            if s == skip or len(slot_matches[s]) >= courts or slot_masks[s] & mask:
+                continue
+            if not fits_rest(mid, s):
+                continue
+            slot_matches[s].append(mid)
+            slot_masks[s] |= mask
+            match_slot[mid] = s
+            if rest_index:
+                rest_index.add(mid, s)
+            return True
+        return False
+
+    best = snapshot()
+    best_cost = cost = _schedule_cost(slot_matches, unscheduled)
+    tabu = {}
+    it = last_improve = 0
+    restart_after = 50 + 5 * len(matches)
+    deadline = time.perf_counter() + time_budget
+
+    while time.perf_counter() < deadline:
+        if lower_bound and not best_cost[0] and best_cost[1] + 1 <= lower_bound:
+            break  # proven optimal
+        it += 1
+        if unscheduled:
+            mid = rng.choice(unscheduled)
+        elif cost[1] > 0:
+            mid = rng.choice(slot_matches[cost[1]])
+        else:
+            break  # everything fits in the first slot; nothing left to improve
+
+        cur = match_slot[mid]
+        limit = cur if cur >= 0 else max_slots
+        mask = player_masks[mid]
+        if rest_index and cur >= 0:
+            rest_index.remove(mid, cur)  # don't let mid's current slot block its own move
+
+        target, kicked, kicks = -1, -1, []
+        for s in range(limit):
+            if blocked and blocked[s] & mask:
+                continue
+            members = slot_matches[s]
+            blockers = [o for o in members if player_masks[o] & mask]
+            if not blockers:
+                if not fits_rest(mid, s):
+                    continue
+                if len(members) < courts:
+                    target = s
+                    break
+                blockers = members  # full slot: any match could make room
+            elif len(blockers) > 1 or not fits_rest(mid, s, blockers[0]):
+                continue
+            kicks.extend((s, b) for b in blockers if tabu.get(b, 0) <= it)
+
+        if target < 0 and not kicks:
+            if rest_index and cur >= 0:
+                rest_index.add(mid, cur)
+            continue
+        if target < 0:
+            target, kicked = rng.choice(kicks)
+            slot_matches[target].remove(kicked)
+            slot_masks[target] ^= player_masks[kicked]
+            match_slot[kicked] = -1
+            if rest_index:
+                rest_index.remove(kicked, target)
+            tabu[kicked] = it + tabu_tenure
+
+        # move mid into the target slot
+        if cur >= 0:
+            slot_matches[cur].remove(mid)
+            slot_masks[cur] ^= mask
+        else:
+            unscheduled.remove(mid)
+        slot_matches[target].append(mid)
+        slot_masks[target] |= mask
+        match_slot[mid] = target
+        if rest_index:
+            rest_index.add(mid, target)
+
+        if kicked >= 0 and not first_fit(kicked, target):
+            unscheduled.append(kicked)
+
+        cost = _schedule_cost(slot_matches, unscheduled)
+        if cost < best_cost:
+            best, best_cost, last_improve = snapshot(), cost, it
+        elif it - last_improve > restart_after:
+            # drifted too long without progress: restart from the best schedule
+            match_slot = list(best[0])
+            slot_matches = [list(mids) for mids in best[1]]
+            unscheduled = list(best[2])
+            rebuild()
+            cost, last_improve = best_cost, it
+
+    return best
+
+def _randomized_greedy(seed, player_masks, degrees, courts, max_slots, rest=None, blocked=None):
+    """
+    One greedy pass ordered by degree with ties broken by a seeded shuffle.
+    seed 0 keeps the plain degree order; multi_start_schedule always runs it, so
+    multi-start never does worse than greedy.
+    """
+    if seed == 0:
+        order = sorted(range(len(degrees)), key=lambda i: degrees[i], reverse=True)
+    else:
+        rng = random.Random(seed)
+        keys = [rng.random() for _ in degrees]
+        order = sorted(range(len(degrees)), key=lambda i: (-degrees[i], keys[i]))
+    match_slot, slot_matches, unscheduled = _greedy_place(
+        order, player_masks, courts, max_slots, rest, blocked=blocked
+    )
+    cost = _schedule_cost(slot_matches, unscheduled)[:2]
+    return cost, seed, (match_slot, slot_matches, unscheduled)
+
+# Shared per-worker state for multi_start_schedule, set once by the pool initializer
+_MULTI_START = None
+
+def _init_multi_start(*args):
+    global _MULTI_START
+    _MULTI_START = args
+
+def _multi_start_run(seed):
+    return _randomized_greedy(seed, *_MULTI_START)
+
+def multi_start_schedule(matches, courts=6, max_slots=None, starts=32, seed=0, workers=None,
+                         min_rest_slots=0, slot_pos=None, stats=None, lower_bound=None,
+                         blocked=None):
+    """
+    Run `starts` randomized-tie-break greedy passes on a process pool and keep the best by
+    unscheduled count, then by last used slot, then by seed. The first pass is always
+    seed 0 (the plain greedy order), the rest use seeds seed, seed+1, ...
+    The conflict masks are built once and handed to each worker at pool start-up.
+    workers=1 (or a single CPU) runs everything in this process. Same seeds -> same result.
+    lower_bound: once a start fits everything in that many slots no later seed can win,
+    so the remaining starts are skipped (the result is the same).
+    """
+    if max_slots is None:
+        raise ValueError("max_slots must be provided (use build_slot_times to define windows).")
+
+    with _stage(stats, "conflict_build"):
+        player_masks, degrees = conflict_masks(matches)
+        rest = rest_rule(matches, min_rest_slots, slot_pos)
+    starts = max(1, starts)
+    seeds = [0] + [s for s in range(seed, seed + starts) if s != 0][:starts - 1]
+    args = (player_masks, degrees, courts, max_slots, rest, blocked)
+
+    def optimal(result):
+        return lower_bound and not result[0][0] and result[0][1] + 1 <= lower_bound
+
+    results = []
+    with _stage(stats, "schedule_matches"):
+        workers = min(workers or os.cpu_count() or 1, len(seeds))
+        if workers == 1:
+            for s in seeds:
+                results.append(_randomized_greedy(s, *args))
+                if optimal(results[-1]):
+                    break
+        else:
+            with process_pool(__name__, workers, _init_multi_start, args) as pool:
+                futures = [pool.submit(_multi_start_run, s) for s in seeds]
+                for fut in futures:
+                    results.append(fut.result())
+                    if optimal(results[-1]):
+                        for rest_fut in futures:
+                            rest_fut.cancel()
+                        break
+    if stats is not None:
+        stats.counters["starts"] += len(results)
+
+    _cost, _seed, best = min(results, key=lambda r: (r[0], r[1]))
+    return best
+
+# ------------------- component decomposition -------------------
+def conflict_components(matches):
+    """
+    Connected components of the player-conflict graph (matches linked by a shared player)
+    as lists of match indices, largest first. Matches in different components never
+    conflict, so each component can be scheduled on its own.
+    """
+    parent = list(range(player_count(matches)))
+
+    def find(p):
+        while parent[p] != p:
+            parent[p] = parent[parent[p]]
+            p = parent[p]
+        return p
+
+    for m in matches:
+        root = find(m.pids[0]) if m.pids else None
+        for p in m.pids[1:]:
+            parent[find(p)] = root
+    groups = defaultdict(list)
+    for i, m in enumerate(matches):
+        groups[find(m.pids[0]) if m.pids else -1 - i].append(i)
+    return sorted(groups.values(), key=lambda mids: (-len(mids), mids[0]))
+
+def _pack_components(components, k):
+    """Largest-first packing of components into k groups of similar match counts."""
+    groups = [[] for _ in range(k)]
+    for mids in components:
+        min(groups, key=len).extend(mids)
+    return [sorted(group) for group in groups]
+
+def _court_budgets(sizes, courts):
+    """Split `courts` over groups in proportion to their match counts, at least one each."""
+    extra = courts - len(sizes)
+    total = sum(sizes) or 1
+    raw = [extra * size / total for size in sizes]
+    budgets = [1 + int(r) for r in raw]
+    by_remainder = sorted(range(len(sizes)), key=lambda i: (int(raw[i]) - raw[i], i))
+    for i in by_remainder[:courts - sum(budgets)]:
+        budgets[i] += 1
+    return budgets
+
+def _component_run(task):
+    order, player_masks, courts, max_slots, rest, blocked = task
+    match_slot, _slot_matches, unscheduled = _greedy_place(
+        order, player_masks, courts, max_slots, rest, blocked=blocked)
+    return match_slot, unscheduled
+
+def _merge_groups(groups, results, player_masks, degrees, courts, max_slots, rest=None, blocked=None):
+    """
+    Combine the groups' own placements into one schedule. Groups share no player and each
+    stayed within its court budget, so every placement is kept as it is. Only courts a
+    group left idle are revisited: matches move into an earlier slot with a free court,
+    then the matches no group could fit are placed first-fit in whatever is still free.
+    Returns (match_slot, slot_matches, unscheduled, moved_earlier).
+    """
+    match_slot = [-1] * len(player_masks)
+    slot_matches = [[] for _ in range(max_slots)]
+    slot_masks = list(blocked) if blocked else [0] * max_slots
+    rest_index = RestIndex(rest) if rest else None
+    leftover = []
+    for group, (group_slot, group_unscheduled) in zip(groups, results):
+        for i, s in enumerate(group_slot):
+            if s >= 0:
+                mid = group[i]
+                slot_matches[s].append(mid)
+                slot_masks[s] |= player_masks[mid]
+                match_slot[mid] = s
+                if rest_index:
+                    rest_index.add(mid, s)
+        leftover.extend(group[i] for i in group_unscheduled)
+
+    open_slots = [s for s in range(max_slots) if len(slot_matches[s]) < courts]
+
+    def fits(mid, s):
+        return not slot_masks[s] & player_masks[mid] and (not rest_index or rest_index.ok(mid, s))
+
+    def take(mid, s):
+        slot_matches[s].append(mid)
+        slot_masks[s] |= player_masks[mid]
+        match_slot[mid] = s
+        if rest_index:
+            rest_index.add(mid, s)
+        if len(slot_matches[s]) >= courts:
+            open_slots.remove(s)
+
+    moved = 0
+    placed = sorted((mid for mid, s in enumerate(match_slot) if s >= 0),
+                    key=lambda mid: (match_slot[mid], -degrees[mid], mid))
+    for mid in placed:
+        old = match_slot[mid]
+        if not open_slots or open_slots[0] >= old:
+            continue
+        if rest_index:
+            rest_index.remove(mid, old)
+        for s in open_slots:
+            if s >= old:
+                break
+            if fits(mid, s):
+                if len(slot_matches[old]) == courts:
+                    insort(open_slots, old)
+                slot_matches[old].remove(mid)
+                slot_masks[old] &= ~player_masks[mid]
+                take(mid, s)
+                moved += 1
+                break
+        else:
+            if rest_index:
+                rest_index.add(mid, old)
+
+    unscheduled = []
+    for mid in sorted(leftover, key=lambda mid: degrees[mid], reverse=True):
+        for s in open_slots:
+            if fits(mid, s):
+                take(mid, s)
+                break
+        else:
+            unscheduled.append(mid)
+    return match_slot, slot_matches, unscheduled, moved
+
+def component_schedule(matches, courts=6, max_slots=None, workers=None, min_rest_slots=0,
+                       slot_pos=None, stats=None, blocked=None):
+    """
+    Schedule the connected components of the conflict graph (see conflict_components)
+    separately and merge them. Components are packed into at most `courts` groups of
+    similar size; each group gets a share of the courts in proportion to its match count
+    and is placed greedily in its own worker process (workers=1 runs them here). The merge
+    keeps those placements and only shares the courts a group left free (see
+    _merge_groups). The result doesn't depend on workers.
+    Returns the same (match_slot, slot_matches, unscheduled) as schedule_matches.
+    """
+    if max_slots is None:
+        raise ValueError("max_slots must be provided (use build_slot_times to define windows).")
+
+    with _stage(stats, "conflict_build"):
+        player_masks, degrees = conflict_masks(matches)
+        components = conflict_components(matches)
+        groups = _pack_components(components, max(1, min(courts, len(components))))
+        tasks = []
+        for group, budget in zip(groups, _court_budgets([len(g) for g in groups], courts)):
+            # most constrained first, as in schedule_matches
+            order = sorted(range(len(group)), key=lambda i: degrees[group[i]], reverse=True)
+            tasks.append((order, [player_masks[mid] for mid in group], budget, max_slots,
+                          rest_rule([matches[mid] for mid in group], min_rest_slots, slot_pos),
+                          blocked))
+
+    with _stage(stats, "schedule_matches"):
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        if workers == 1:
+            results = [_component_run(task) for task in tasks]
+        else:
+            with process_pool(__name__, workers) as pool:
+                results = list(pool.map(_component_run, tasks))
+
+    with _stage(stats, "merge"):
+        match_slot, slot_matches, unscheduled, moved = _merge_groups(
+            groups, results, player_masks, degrees, courts, max_slots,
+            rest_rule(matches, min_rest_slots, slot_pos), blocked)
+
+    if stats is not None:
+        stats.counters["components"] += len(components)
+        stats.counters["component_groups"] += len(groups)
+        stats.counters["merge_moved_earlier"] += moved
+    return match_slot, slot_matches, unscheduled
+
+# ------------------- timed (event-driven) allocation -------------------
+def match_durations(matches, durations, default):
+    """
+    Per-match minutes. durations is None (every match takes `default`), a list aligned
+    with matches, or a dict keyed by event ("MD") and/or match code ("MD1"); a code
+    overrides its event, and anything not listed takes `default`.
+    """
+    if durations is None:
+        return [default] * len(matches)
+    if isinstance(durations, dict):
+        return [durations.get(m.code, durations.get(m.event, default)) for m in matches]
+    if len(durations) != len(matches):
+        raise ValueError(f"Got {len(durations)} durations for {len(matches)} matches.")
+    return list(durations)
+
+def _available_from(intervals, t, duration):
+    """Earliest start >= t at which every interval list has room for `duration`, or None."""
+    moved = True
+    while moved:
+        moved = False
+        for spans in intervals:
+            start = next((max(t, lo) for lo, hi in spans if max(t, lo) + duration <= hi), None)
+            if start is None:
+                return None
+            if start > t:
+                t, moved = start, True
+    return t
+
+def timed_schedule(matches, courts, windows, durations, min_rest_minutes=0, stats=None,
+                   player_windows=None):
+    """
+    Event-driven court allocation with real start times instead of fixed slots.
+    A heap holds each court's next free time; when a court frees up it takes the most
+    constrained pending match whose players are all free (busy-until index, plus
+    min_rest_minutes) and that finishes inside the current window. If nothing fits, the
+    court waits until the next player or court frees up, or the next window opens.
+    durations: per-match minutes (see match_durations).
+    player_windows: optional {player ID: [(start, end) minutes, ...]} (see player_windows);
+            a match only starts when it ends inside a window of each of those players.
+    Returns:
+      match_start : per-match start in minutes after midnight (or -1 if unscheduled)
+      match_court : per-match court number (or 0)
+      unscheduled : match indices that didn't fit
+    """
+    spans = sorted((_minutes(a), _minutes(b)) for a, b in windows)
+    if not spans or courts <= 0:
+        return [-1] * len(matches), [0] * len(matches), list(range(len(matches)))
+
+    with _stage(stats, "conflict_build"):
+        _, degrees = conflict_masks(matches)
+        match_pids = [m.pids for m in matches]
+        player_windows = player_windows or {}
+        match_windows = [[player_windows[p] for p in pids if p in player_windows] for pids in match_pids]
+    with _stage(stats, "timed_schedule"):
+        # most constrained first, longer matches first among equals
+        pending = sorted(range(len(matches)), key=lambda i: (degrees[i], durations[i]), reverse=True)
+        busy_until = [spans[0][0]] * player_count(matches)
+        free = [(spans[0][0], c) for c in range(1, courts + 1)]  # already a heap
+        match_start = [-1] * len(matches)
+        match_court = [0] * len(matches)
+        waits = 0
+
+        while free and pending:
+            t, court = heapq.heappop(free)
+            # move t into the window it falls in (or the next one); past the last, the court is done
+            span = next(((max(a, t), b) for a, b in spans if t < b), None)
+            if span is None:
+                continue
+            t, end = span
+
+            pick, wake = None, None
+            for k, mid in enumerate(pending):
+                ready = max((busy_until[p] for p in match_pids[mid]), default=t)
+                if match_windows[mid]:
+                    ready = _available_from(match_windows[mid], max(ready, t), durations[mid])
+                    if ready is None:
+                        continue
+                if ready > t:
+                    wake = ready if wake is None else min(wake, ready)
+                elif t + durations[mid] <= end:
+                    pick = k
+                    break
+            if pick is None:
+                waits += 1
+                later = [x for x in (wake, free[0][0] if free else None) if x is not None and x > t]
+                heapq.heappush(free, (min(later + [end]), court))
+                continue
+
+            mid = pending.pop(pick)
+            finish = t + durations[mid]
+            match_start[mid], match_court[mid] = t, court
+            for p in match_pids[mid]:
+                busy_until[p] = finish + min_rest_minutes
+            heapq.heappush(free, (finish, court))
+
+    if stats is not None:
+        stats.counters["placed"] += len(matches) - len(pending)
+        stats.counters["unscheduled"] += len(pending)
+        stats.counters["court_waits"] += waits
+    return match_start, match_court, pending
+
+def timed_slots(match_start, match_court, durations):
+    """
+    Turn timed_schedule's start times into the slot shape the rest of the pipeline uses:
+    one "slot" per distinct start time, so schedule_to_json writes real start times as
+    its time keys. Returns (match_slot, slot_matches, slot_times, courts_by_slot).
+    """
+    starts = sorted({t for t in match_start if t >= 0})
+    slot_of = {t: s for s, t in enumerate(starts)}
+    match_slot = [slot_of.get(t, -1) for t in match_start]
+    slot_matches = [[] for _ in starts]
+    courts_by_slot = {s: [] for s in range(len(starts))}
+    for mid, s in enumerate(match_slot):
+        if s >= 0:
+            slot_matches[s].append(mid)
+            courts_by_slot[s].append((match_court[mid], mid))
+    slot_times = []
+    for s, t in enumerate(starts):
+        courts_by_slot[s].sort()
+        slot_times.append((_clock(t), _clock(t + max(durations[mid] for mid in slot_matches[s]))))
+    return match_slot, slot_matches, slot_times, courts_by_slot
+
 def assign_courts(slot_matches):
     """Within each slot, assign courts 1..N (as integers)."""
     result = {}
@@ -131,68 +1069,326 @@ def _fmt_time_key_12h(dt_obj):
     h = dt_obj.hour % 12 or 12
     return f"{h:02d}:{dt_obj.strftime('%M')}"
 
-def schedule_to_json(matches, slot_matches, slot_times):
+def schedule_to_json(matches, slot_matches, slot_times, courts_by_slot=None):
     """
     Build JSON in the requested format with an extra team label layer:
       "6": ["MS4", ["UCD:", ["Neil Patel"]], ["UCSC:", ["Eric Wang"]]]
+    courts_by_slot defaults to assign_courts(slot_matches).
     """
     # Pre-init all time keys (including empty ones)
     out = { _fmt_time_key_12h(start): {} for (start, _end) in slot_times }
 
-    courts_by_slot = assign_courts(slot_matches)
+    if courts_by_slot is None:
+        courts_by_slot = assign_courts(slot_matches)
 
     for s, (slot_start, _slot_end) in enumerate(slot_times):
         time_key = _fmt_time_key_12h(slot_start)
         for court_num, mid in courts_by_slot.get(s, []):
-            m = matches[mid]
-            ev = m["event"]                      # "MD", "MS", ...
-            rnum = _rank_number(m["rank"])       # int
-            code = f"{ev}{rnum}"                 # e.g., "MD3"
+            # Courts must be string keys: "1", "2", ...
+            out[time_key][str(court_num)] = match_entry(matches[mid], matches.players)
 
-            t1, t2 = m["teams"]                  # team codes like "UCD", "UCSC"
-            # Strip "TEAM:" prefixes and trim whitespace on names
-            p1 = [name.split(":", 1)[1].strip() for name in m["players"][t1]]
-            p2 = [name.split(":", 1)[1].strip() for name in m["players"][t2]]
+    return out
 
-            # Build the nested structure with team labels
-            left  = [f"{t1}:", p1]
-            right = [f"{t2}:", p2]
+def schedule_from_json(schedule_json):
+    """
+    Read a match_schedule.json object back into Match records.
+    Returns:
+      matches   : MatchList (match_model), in schedule order
+      time_keys : slot keys in schedule order (slot index = position)
+      placed    : per-match (slot index, court number)
+    """
+    time_keys = list(schedule_json)
+    slot_of = {key: s for s, key in enumerate(time_keys)}
+    matches, where = read_schedule(schedule_json)
+    placed = [(slot_of[key], int(court)) for key, court in where]
+    return matches, time_keys, placed
 
-            # Courts must be string keys: "1", "2", ...
-            out[time_key][str(court_num)] = [code, left, right]
+def repair_schedule(schedule_json, now, courts=None, courts_down=(), delayed=(),
+                    min_rest_slots=0, meet=None):
+    """
+    In-meet repair of a match_schedule.json object.
+    Everything before `now` (slot index or time key) stays as it is. Only the affected
+    matches are re-placed first-fit from `now` on, around the matches already there:
+      courts_down : court numbers unavailable from `now` on; their matches move
+      delayed     : (time_key, court) of matches that must be played later than planned
+                    (after their original slot, and not before `now`)
+    courts defaults to the highest court number in the schedule.
+    min_rest_slots: as in make_schedule, measured on the time keys (see key_positions),
+            so the break between windows counts as rest.
+    meet: the rosters; their AVAILABILITY windows (see player_windows) keep moved matches
+            inside each player's window. Each slot runs until the next key's start
+            (the smallest gap between keys).
+    Returns:
+      schedule_json : the repaired schedule (same shape, same time keys)
+      moved         : list of (code, old_key, old_court, new_key, new_court)
+      unscheduled   : list of (code, old_key, old_court) that no longer fit
+    """
+    matches, time_keys, placed = schedule_from_json(schedule_json)
+    max_slots = len(time_keys)
+    now_slot = time_keys.index(now) if isinstance(now, str) else now
+    if courts is None:
+        courts = max((court for _s, court in placed), default=0)
+    down = {int(c) for c in courts_down}
+    open_courts = [c for c in range(1, courts + 1) if c not in down]
 
-    return out
+    delayed = {(key, int(court)) for key, court in delayed}
+    found = {(time_keys[s], court) for s, court in placed}
+    if delayed - found:
+        raise ValueError(f"Delayed matches not in schedule: {sorted(delayed - found)}")
 
-def make_schedule(meet_json_path, teams, courts=6, slot_minutes=15,
-                  windows=(("10:15","12:00"), ("13:00","19:00"))):
-    with open(meet_json_path, "r", encoding="utf-8") as f:
-        meet = json.load(f)
+    player_masks, degrees = conflict_masks(matches)
+    # rest is measured on real slot positions, as when scheduling: lunch counts as rest
+    rest = rest_rule(matches, min_rest_slots, key_positions(time_keys))
+    rest_index = RestIndex(rest) if rest else None
+
+    blocked = None
+    if meet is not None:
+        in_schedule = set(matches.players.teams)
+        player_avail, _unknown = player_windows(meet, [t for t in meet if t in in_schedule], matches.players)
+        if player_avail:
+            starts = key_minutes(time_keys)
+            if starts is None:
+                raise ValueError("Can't read the schedule's time keys to apply availability.")
+            step = _smallest_gap(starts)
+            slot_times = [(_clock(m), _clock(m + step)) for m in starts]
+            blocked = blocked_slot_masks(availability_masks(player_avail, slot_times), max_slots)
+
+    slot_masks = list(blocked) if blocked else [0] * max_slots
+    used_courts = [set() for _ in range(max_slots)]
+    affected = []
+    for mid, (s, court) in enumerate(placed):
+        if (time_keys[s], court) in delayed or (s >= now_slot and court in down):
+            affected.append(mid)
+            continue
+        slot_masks[s] |= player_masks[mid]
+        used_courts[s].add(court)
+        if rest_index:
+            rest_index.add(mid, s)
+
+    # keep the original running order, most constrained first within a slot
+    affected.sort(key=lambda mid: (placed[mid][0], -degrees[mid]))
+    new_place = list(placed)
+    moved, unscheduled = [], []
+    for mid in affected:
+        old_s, old_court = placed[mid]
+        earliest = max(now_slot, old_s + 1 if (time_keys[old_s], old_court) in delayed else old_s)
+        mask = player_masks[mid]
+        for s in range(earliest, max_slots):
+            if slot_masks[s] & mask or (rest_index and not rest_index.ok(mid, s)):
+                continue
+            court = next((c for c in open_courts if c not in used_courts[s]), None)
+            if court is None:
+                continue
+            slot_masks[s] |= mask
+            used_courts[s].add(court)
+            if rest_index:
+                rest_index.add(mid, s)
+            new_place[mid] = (s, court)
+            moved.append((matches[mid].code, time_keys[old_s], old_court, time_keys[s], court))
+            break
+        else:
+            new_place[mid] = None
+            unscheduled.append((matches[mid].code, time_keys[old_s], old_court))
+
+    out = {key: {} for key in time_keys}
+    for mid in sorted(range(len(matches)), key=lambda i: new_place[i] or (max_slots, 0)):
+        if new_place[mid] is not None:
+            s, court = new_place[mid]
+            out[time_keys[s]][str(court)] = match_entry(matches[mid], matches.players)
+
+    return out, moved, unscheduled
+
+def load_meet(source, teams):
+    """
+    Rosters for `teams` from a save.json path, a meet_store SQLite file (.db / .sqlite)
+    or an already-loaded dict, with every event key present for each team. An existing
+    database is only read; a missing file or a team without roster rows raises.
+    """
+    if isinstance(source, dict):
+        # copy the team level, since missing events are filled in below
+        meet = {t: dict(events) for t, events in source.items()}
+    elif str(source).endswith((".db", ".sqlite")):
+        # meet_store database: read just these teams' rosters
+        conn = meet_store.connect(source, readonly=True)
+        try:
+            meet = meet_store.load_rosters(conn, teams)
+        finally:
+            conn.close()
+        missing = [t for t in teams if not set(meet[t]) - {AVAILABILITY}]
+        if missing:
+            raise ValueError(f"No roster for {', '.join(missing)} in {source}.")
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            meet = json.load(f)
 
     # ensure all event keys exist for all teams
     for t in teams:
         for e in EVENTS:
             meet[t].setdefault(e, {})
+    return meet
 
-    # Build all matches (now includes WD) with priority ordering
-    matches = build_matches(meet, teams)
-
+def _make_slotted(matches, courts, slot_minutes, windows, engine, solver, time_budget, seed,
+                  starts, workers, min_rest_slots, stats, player_avail):
+    """make_schedule's fixed-slot solvers (greedy / anytime / multistart / components)."""
     # Build custom slot times for the day
     slot_times = build_slot_times(slot_minutes=slot_minutes, windows=windows)
     max_slots = len(slot_times)
+    slot_pos = slot_positions(slot_times)
+
+    # Cheap lower bounds first: hopeless settings are reported before any solver runs
+    with _stage(stats, "precheck"):
+        bounds = schedule_bounds(matches, courts, max_slots, min_rest_slots, slot_pos)
+        allowed = availability_masks(player_avail, slot_times)
+        bounds["problems"] += availability_problems(matches, allowed, max_slots, min_rest_slots, slot_pos)
+        blocked = blocked_slot_masks(allowed, max_slots)
 
     # Schedule with fixed windows and courts
-    match_slot, slot_matches, unscheduled = schedule_matches(
-        matches, courts=courts, max_slots=max_slots
-    )
+    if solver == "multistart":
+        match_slot, slot_matches, unscheduled = multi_start_schedule(
+            matches, courts=courts, max_slots=max_slots, starts=starts,
+            seed=seed or 0, workers=workers, min_rest_slots=min_rest_slots, slot_pos=slot_pos,
+            stats=stats, lower_bound=bounds["slots"], blocked=blocked,
+        )
+    elif solver == "components":
+        match_slot, slot_matches, unscheduled = component_schedule(
+            matches, courts=courts, max_slots=max_slots, workers=workers,
+            min_rest_slots=min_rest_slots, slot_pos=slot_pos, stats=stats, blocked=blocked,
+        )
+    else:
+        match_slot, slot_matches, unscheduled = schedule_matches(
+            matches, courts=courts, max_slots=max_slots, engine=engine,
+            min_rest_slots=min_rest_slots, slot_pos=slot_pos, stats=stats, blocked=blocked,
+        )
+    if solver == "anytime":
+        with _stage(stats, "improve_schedule"):
+            match_slot, slot_matches, unscheduled = improve_schedule(
+                matches, match_slot, slot_matches, unscheduled, courts=courts,
+                time_budget=time_budget, seed=seed,
+                rest=rest_rule(matches, min_rest_slots, slot_pos), lower_bound=bounds["slots"],
+                blocked=blocked,
+            )
+
+    with _stage(stats, "assign_courts"):
+        courts_by_slot = assign_courts(slot_matches)
+    return match_slot, slot_matches, slot_times, courts_by_slot, unscheduled, bounds
+
+def _make_timed(matches, courts, slot_minutes, windows, durations, min_rest_slots, stats, player_avail):
+    """make_schedule's "timed" solver; bounds only carries the minute-based pre-check problems."""
+    durations = match_durations(matches, durations, slot_minutes)
+    spans = [_minutes(b) - _minutes(a) for a, b in windows]
+    problems = []
+    too_long = sum(1 for d in durations if d > max(spans, default=0))
+    if too_long:
+        problems.append(f"{too_long} matches are longer than every window ({max(spans, default=0)} min)")
+    if sum(durations) > courts * sum(spans):
+        problems.append(f"matches need {sum(durations)} court-minutes, "
+                        f"{courts} courts x {sum(spans)} min hold {courts * sum(spans)}")
+    day = [(_minutes(a), _minutes(b)) for a, b in windows]
+    for mid, m in enumerate(matches):
+        own = [player_avail[p] for p in m.pids if p in player_avail]
+        if own and _available_from([day] + own, 0, durations[mid]) is None:
+            who = " and ".join(matches.players.label(p) for p in m.pids if p in player_avail)
+            problems.append(f"{m.code} {m.teams[0]} vs {m.teams[1]}: no {durations[mid]} min "
+                            f"stretch where {who} {'is' if len(own) == 1 else 'are all'} available")
+    bounds = {"slots": None, "problems": problems}
 
-    # Build JSON object in requested structure
-    schedule_json = schedule_to_json(matches, slot_matches, slot_times)
+    match_start, match_court, unscheduled = timed_schedule(
+        matches, courts, windows, durations, min_rest_slots * slot_minutes, stats, player_avail)
+    match_slot, slot_matches, slot_times, courts_by_slot = timed_slots(match_start, match_court, durations)
+    return match_slot, slot_matches, slot_times, courts_by_slot, unscheduled, bounds
+
+def make_schedule(meet_json_path, teams, courts=6, slot_minutes=15,
+                  windows=(("10:15","12:00"), ("13:00","19:00")), engine="bitset",
+                  solver="greedy", time_budget=2.0, seed=None, starts=32, workers=None,
+                  min_rest_slots=0, pairings=None, stats=None, cache_dir=None, durations=None):
+    """
+    meet_json_path: save.json-style rosters, a meet_store SQLite file (.db / .sqlite),
+            or an already-loaded rosters dict (e.g. straight from xlsx-json's ingest).
+    solver: "greedy" runs a single schedule_matches pass;
+            "anytime" seeds with that pass and then runs improve_schedule for up to
+            time_budget seconds to place leftovers and finish earlier;
+            "multistart" runs `starts` randomized greedy passes on `workers` processes
+            (see multi_start_schedule) and keeps the best;
+            "components" schedules independent groups of players (no shared player
+            between them) in parallel worker processes and merges them (see
+            component_schedule);
+            "timed" drops the fixed slots and packs courts event by event with real
+            start times (see timed_schedule); each match takes its `durations` minutes.
+    min_rest_slots: every solver keeps each player's matches more than this many slots
+            apart (1 = no back-to-back); the break between windows counts as rest.
+            The "timed" solver asks for min_rest_slots * slot_minutes between matches.
+    durations: minutes per event and/or match code, e.g. {"MS": 35, "MD": 25}, or a
+            per-match list (see match_durations); unlisted matches take slot_minutes.
+            Only the "timed" solver uses them.
+    pairings: team pairs to play; defaults to every pair of `teams` (round robin).
+    stats: optional ScheduleStats to fill with per-stage wall times and placement
+            counters (ScheduleStats.dump writes them as JSON); off by default.
+    cache_dir: reuse the result of an identical earlier run, keyed by the rosters' content
+            hash (a JSON file's bytes; what a database or dict holds) and these
+            parameters (see pipeline_cache). Not used by the
+            "anytime" solver, whose result depends on how far it gets in time_budget.
+    Rosters may list per-player availability (see player_windows); every solver keeps
+    those players inside it, and windows that can't be met are reported by the pre-check.
+    """
+    if solver not in ("greedy", "anytime", "multistart", "components", "timed"):
+        raise ValueError(
+            f"Unknown solver {solver!r} "
+            f"(expected 'greedy', 'anytime', 'multistart', 'components' or 'timed')."
+        )
+
+    if solver == "anytime":
+        cache_dir = None  # its result depends on how far the search got within time_budget
+    meet = None
+    if cache_dir:
+        with _stage(stats, "cache_load"):
+            if isinstance(meet_json_path, dict) or str(meet_json_path).endswith((".db", ".sqlite")):
+                # key on the rosters themselves: a database's latest commits can sit in its
+                # -wal file while the main file is unchanged
+                meet = load_meet(meet_json_path, teams)
+                meet_key = pipeline_cache.params_digest(meet)
+            else:
+                meet_key = pipeline_cache.file_digest(meet_json_path)
+            cache_key = pipeline_cache.params_digest({
+                "meet": meet_key,
+                "teams": list(teams), "courts": courts, "slot_minutes": slot_minutes,
+                "windows": windows, "engine": engine, "solver": solver,
+                "time_budget": time_budget, "seed": seed, "starts": starts,
+                "min_rest_slots": min_rest_slots, "pairings": pairings,
+                "durations": durations if solver == "timed" else None, "format": 4,
+            })
+            hit = pipeline_cache.get(cache_dir, "schedule", cache_key)
+        if hit is not None:
+            return (matches_from_json(hit["matches"]), hit["match_slot"], hit["slot_matches"],
+                    hit["schedule_json"], hit["summary"], hit["warning"])
+
+    with _stage(stats, "json_load"):
+        if meet is None:
+            meet = load_meet(meet_json_path, teams)
+
+    # Build all matches (now includes WD) with priority ordering
+    with _stage(stats, "build_matches"):
+        matches = build_matches(meet, teams, pairings)
+        player_avail, unknown = player_windows(meet, teams, matches.players)
+
+    if solver == "timed":
+        match_slot, slot_matches, slot_times, courts_by_slot, unscheduled, bounds = _make_timed(
+            matches, courts, slot_minutes, windows, durations, min_rest_slots, stats, player_avail)
+    else:
+        match_slot, slot_matches, slot_times, courts_by_slot, unscheduled, bounds = _make_slotted(
+            matches, courts, slot_minutes, windows, engine, solver, time_budget, seed, starts,
+            workers, min_rest_slots, stats, player_avail)
+
+    with _stage(stats, "schedule_to_json"):
+        schedule_json = schedule_to_json(matches, slot_matches, slot_times, courts_by_slot)
 
     # Prepare a simple summary
+    used = [end for (_start, end), mids in zip(slot_times, slot_matches) if mids]
     summary = {
         "total_matches": len(matches),
         "scheduled_matches": len(matches) - len(unscheduled),
         "unscheduled_matches": len(unscheduled),
+        "min_slots": bounds["slots"],
+        "finish": max(used).strftime("%H:%M") if used else None,
     }
 
     # If anything didn't fit, list a short warning + the first few unscheduled
@@ -201,28 +1397,100 @@ def make_schedule(meet_json_path, teams, courts=6, slot_minutes=15,
         preview = []
         for mid in unscheduled[:10]:
             m = matches[mid]
-            preview.append(f"{m['event']} {m['rank']} — {m['teams'][0]} vs {m['teams'][1]}")
+            preview.append(f"{m.event} Rank {m.rank} — {m.teams[0]} vs {m.teams[1]}")
         warning = (
             f"WARNING: {len(unscheduled)} matches could not be scheduled within the windows. "
             f"Consider adding slots or reordering priorities.\n"
+            + "".join(f"  Pre-check: {problem}\n" for problem in bounds["problems"])
             + "\n".join(f"  - {line}" for line in preview)
         )
+    if unknown:
+        warning += (("\n" if warning else "") +
+                    f"WARNING: availability given for players not in any match: {', '.join(unknown)}")
+
+    if cache_dir:
+        pipeline_cache.put(cache_dir, "schedule", cache_key, {
+            "matches": matches_to_json(matches), "match_slot": match_slot, "slot_matches": slot_matches,
+            "schedule_json": schedule_json, "summary": summary, "warning": warning,
+        })
 
     return matches, match_slot, slot_matches, schedule_json, summary, warning
 
-# ------------------- example usage -------------------
-if __name__ == "__main__":
-    teams = ["UCSC", "UCD", "SJSU"]
+# ------------------- command line -------------------
+DEFAULT_TEAMS = ["UCSC", "UCD", "SJSU"]
+
+def parse_windows(text):
+    """'10:15-12:00,13:00-19:00' -> (("10:15", "12:00"), ("13:00", "19:00"))"""
+    return tuple(tuple(w.strip().split("-", 1)) for w in text.split(",") if w.strip())
+
+def parse_durations(text):
+    """'MS=35,WS=30,MD1=40' -> {"MS": 35, "WS": 30, "MD1": 40} (event or match code -> minutes)"""
+    durations = {}
+    for item in text.split(","):
+        if item.strip():
+            key, _, minutes = item.partition("=")
+            durations[key.strip()] = int(minutes)
+    return durations
+
+def add_schedule_args(parser):
+    parser.add_argument("--meet", default="save.json", help="rosters: save.json or a meet_store .db")
+    parser.add_argument("--teams", help=f"comma-separated teams (default: {','.join(DEFAULT_TEAMS)})")
+    parser.add_argument("--courts", type=int, default=6)
+    parser.add_argument("--slot-minutes", type=int, default=15)
+    parser.add_argument("--windows", type=parse_windows, default=(("10:15","12:00"), ("13:00","19:00")),
+                        help="e.g. 10:15-12:00,13:00-19:00")
+    parser.add_argument("--solver", choices=("greedy", "anytime", "multistart", "components", "timed"), default="greedy")
+    parser.add_argument("--durations", type=parse_durations,
+                        help="minutes per event/match code for --solver timed, e.g. MS=35,MD=25 "
+                             "(default: --slot-minutes)")
+    parser.add_argument("--min-rest", type=int, default=0, help="min_rest_slots (1 = no back-to-back)")
+    parser.add_argument("--time-budget", type=float, default=2.0, help="seconds of local search for --solver anytime")
+    parser.add_argument("--seed", type=int, help="random seed for --solver anytime / multistart")
+    parser.add_argument("--starts", type=int, default=32, help="randomized greedy runs for --solver multistart")
+    parser.add_argument("--workers", type=int,
+                        help="worker processes for --solver multistart / components (default: CPU count)")
+    parser.add_argument("--out", default="match_schedule.json", help="schedule JSON to write")
+    parser.add_argument("--stats", action="store_true", help="also write <out>.stats.json")
+    parser.add_argument("--cache", action="store_true", help=f"reuse identical runs from {pipeline_cache.DEFAULT_DIR}/")
+
+def report_slot_minutes(solver="greedy", slot_minutes=15, durations=None):
+    """
+    slot_minutes for the conflict checker and the session split of a schedule made with
+    these make_schedule options: None (the gap between fixed slots) unless timed, where
+    matches start at irregular times and back-to-back means within the longest match.
+    """
+    if solver != "timed":
+        return None
+    lengths = durations.values() if isinstance(durations, dict) else durations or ()
+    return max([slot_minutes, *lengths])
+
+def schedule_from_args(args, meet=None):
+    """Run make_schedule for parsed add_schedule_args options, write args.out, return the schedule JSON.
+    meet: rosters dict already in memory (skips reading args.meet); its teams are the default."""
+    if args.teams:
+        teams = [t.strip() for t in args.teams.split(",")]
+    else:
+        teams = list(meet) if meet is not None else DEFAULT_TEAMS
+    stats = ScheduleStats() if args.stats else None
     _, _, _, schedule_json, summary, warning = make_schedule(
-        "save.json",
+        meet if meet is not None else args.meet,
         teams,
-        courts=6,
-        slot_minutes=15,
-        windows=(("10:15","12:00"), ("13:00","19:00"))  # 10:15–12, 13–19 in 15-min slots
+        courts=args.courts,
+        slot_minutes=args.slot_minutes,
+        windows=args.windows,  # default: 10:15–12, 13–19 in 15-min slots
+        solver=args.solver,
+        min_rest_slots=args.min_rest,
+        durations=args.durations,
+        time_budget=args.time_budget,
+        seed=args.seed,
+        starts=args.starts,
+        workers=args.workers,
+        stats=stats,
+        cache_dir=pipeline_cache.DEFAULT_DIR if args.cache else None,
     )
 
     # Write the JSON schedule out in the requested format
-    with open("match_schedule.json", "w", encoding="utf-8") as f:
+    with open(args.out, "w", encoding="utf-8") as f:
         json.dump(schedule_json, f, indent=3, ensure_ascii=False)
 
     print("--- Summary ---")
@@ -231,4 +1499,140 @@ if __name__ == "__main__":
         print(warning)
     else:
         print("All matches scheduled within the given windows.")
-    print("Saved JSON schedule to match_schedule.json")
+    print(f"Saved JSON schedule to {args.out}")
+    if stats is not None:
+        stats_path = os.path.splitext(args.out)[0] + ".stats.json"
+        stats.dump(stats_path)
+        print(f"Saved scheduler stats to {stats_path}")
+    return schedule_json
+
+# ------------------- parameter sweep -------------------
+_SWEEP = None
+
+def _init_sweep(*args):
+    global _SWEEP
+    _SWEEP = args
+
+def _sweep_run(config):
+    courts, slot_minutes, windows, min_rest_slots = config
+    player_masks, order, match_pids, n_players, conflict_bound, busiest, player_avail = _SWEEP
+    slot_times = build_slot_times(slot_minutes=slot_minutes, windows=windows)
+    slot_pos = slot_positions(slot_times)
+    row = {
+        "courts": courts, "slot_minutes": slot_minutes,
+        "windows": [list(w) for w in windows], "slots": len(slot_times),
+        "min_slots": max(-(-len(order) // courts), conflict_bound),
+        "scheduled": None, "unscheduled": None, "ends": None, "fits": False,
+    }
+    # hopeless by the pre-check bounds: skip the solver
+    if row["min_slots"] > len(slot_times):
+        return row
+    if min_rest_slots > 0 and busiest > _rest_capacity(slot_pos, min_rest_slots):
+        return row
+
+    rest = None
+    if min_rest_slots > 0:
+        rest = (match_pids, n_players, slot_pos, min_rest_slots)
+    blocked = blocked_slot_masks(availability_masks(player_avail, slot_times), len(slot_times))
+    _, slot_matches, unscheduled = _greedy_place(order, player_masks, courts, len(slot_times), rest,
+                                                 blocked=blocked)
+    used = [s for s, mids in enumerate(slot_matches) if mids]
+    row.update(scheduled=len(order) - len(unscheduled), unscheduled=len(unscheduled),
+               ends=slot_times[used[-1]][1].strftime("%H:%M") if used else None,
+               fits=not unscheduled)
+    return row
+
+def sweep_schedules(meet_json_path, teams, courts=(4, 5, 6, 7, 8), slot_minutes=(15, 20),
+                    windows=((("10:15","12:00"), ("13:00","19:00")),), min_rest_slots=0,
+                    pairings=None, workers=None):
+    """
+    Greedy-schedule every combination of courts x slot_minutes x windows (a list of
+    window tuples) and return one row per configuration, in that order. The matches,
+    conflict masks and placement order are built once and shared with each worker at
+    pool start-up; each row is the same schedule make_schedule's default solver gives.
+    Configurations that schedule_bounds already rules out are not solved: their row has
+    min_slots > slots (or too little room for rest) and None for the counts.
+    """
+    meet = load_meet(meet_json_path, teams)
+    matches = build_matches(meet, teams, pairings)
+    player_masks, degrees = conflict_masks(matches)
+    order = sorted(range(len(matches)), key=lambda i: degrees[i], reverse=True)
+    bounds = schedule_bounds(matches, 1)
+    shared = (player_masks, order, [m.pids for m in matches], player_count(matches),
+              max(bounds["player"], bounds["clique"]), bounds["player"],
+              player_windows(meet, teams, matches.players)[0])
+    configs = [(c, sm, tuple(tuple(w) for w in win), min_rest_slots)
+               for win in windows for sm in slot_minutes for c in courts]
+
+    workers = min(workers or os.cpu_count() or 1, len(configs))
+    if workers == 1:
+        _init_sweep(*shared)
+        return [_sweep_run(config) for config in configs]
+    with process_pool(__name__, workers, _init_sweep, shared) as pool:
+        return list(pool.map(_sweep_run, configs))
+
+def smallest_fits(rows):
+    """Per (slot_minutes, windows): the row with the fewest courts that schedules everything."""
+    best = {}
+    for row in rows:
+        key = (row["slot_minutes"], json.dumps(row["windows"]))
+        if row["fits"] and (key not in best or row["courts"] < best[key]["courts"]):
+            best[key] = row
+    return list(best.values())
+
+def format_sweep(rows):
+    """Plain-text sweep table; the fewest-courts fit for each slot length/window set is marked."""
+    marked = {id(r) for r in smallest_fits(rows)}
+    header = ("Courts", "Slot min", "Windows", "Slots", "Min slots", "Scheduled", "Unscheduled", "Ends", "")
+    table = [header] + [
+        (str(r["courts"]), str(r["slot_minutes"]), ",".join("-".join(w) for w in r["windows"]),
+         str(r["slots"]), str(r["min_slots"]), "-" if r["scheduled"] is None else str(r["scheduled"]),
+         "-" if r["unscheduled"] is None else str(r["unscheduled"]), r["ends"] or "-",
+         "<- fewest courts" if id(r) in marked else "")
+        for r in rows
+    ]
+    widths = [max(len(line[i]) for line in table) for i in range(len(header))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(line, widths)).rstrip() for line in table]
+    lines.insert(1, "  ".join("-" * w for w in widths[:-1]))
+    return "\n".join(lines)
+
+def _int_list(text):
+    """'4-8' or '4,5,6' -> [4, 5, 6, ...]"""
+    values = []
+    for part in text.split(","):
+        lo, _, hi = part.partition("-")
+        values.extend(range(int(lo), int(hi or lo) + 1))
+    return values
+
+def sweep_main(argv=None):
+    parser = argparse.ArgumentParser(description="Find the fewest courts / longest slots that fit a meet.")
+    parser.add_argument("--meet", default="save.json", help="rosters: save.json or a meet_store .db")
+    parser.add_argument("--teams", help=f"comma-separated teams (default: {','.join(DEFAULT_TEAMS)})")
+    parser.add_argument("--courts", type=_int_list, default=[4, 5, 6, 7, 8], help="e.g. 4-8 or 4,6,8")
+    parser.add_argument("--slot-minutes", type=_int_list, default=[15, 20], help="e.g. 15,20")
+    parser.add_argument("--windows", type=parse_windows, action="append",
+                        help="one window set per flag, e.g. 10:15-12:00,13:00-19:00 (repeatable)")
+    parser.add_argument("--min-rest", type=int, default=0, help="min_rest_slots (1 = no back-to-back)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--json", metavar="FILE", help="also save the rows as JSON")
+    args = parser.parse_args(argv)
+
+    teams = [t.strip() for t in args.teams.split(",")] if args.teams else DEFAULT_TEAMS
+    rows = sweep_schedules(args.meet, teams, args.courts, args.slot_minutes,
+                           args.windows or [(("10:15","12:00"), ("13:00","19:00"))],
+                           min_rest_slots=args.min_rest, workers=args.workers)
+    print(format_sweep(rows))
+    if not smallest_fits(rows):
+        print("❌ No configuration schedules every match.")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=3)
+        print(f"✅ Sweep saved to {args.json}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule a tri-meet (or N-team meet) from save.json.")
+    add_schedule_args(parser)
+    schedule_from_args(parser.parse_args(argv))
+
+if __name__ == "__main__":
+    main()
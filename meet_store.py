@@ -0,0 +1,331 @@
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+
+from match_model import AVAILABILITY, player_name, read_schedule
+
+DEFAULT_DB = "trimeet.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS teams (
+    id   INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS players (
+    id      INTEGER PRIMARY KEY,
+    team_id INTEGER NOT NULL REFERENCES teams(id) ON DELETE CASCADE,
+    name    TEXT NOT NULL,
+    UNIQUE (team_id, name)
+);
+-- roster lines, in save.json order: team / event / "Rank N" / position -> player
+CREATE TABLE IF NOT EXISTS roster (
+    team_id   INTEGER NOT NULL REFERENCES teams(id) ON DELETE CASCADE,
+    event     TEXT NOT NULL,
+    rank      TEXT NOT NULL,
+    position  INTEGER NOT NULL,
+    player_id INTEGER NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+    PRIMARY KEY (team_id, event, rank, position)
+);
+-- optional per-player availability windows ("HH:MM" clock times), in save.json order
+CREATE TABLE IF NOT EXISTS availability (
+    team_id   INTEGER NOT NULL REFERENCES teams(id) ON DELETE CASCADE,
+    player_id INTEGER NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+    position  INTEGER NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time   TEXT NOT NULL,
+    PRIMARY KEY (player_id, position)
+);
+CREATE TABLE IF NOT EXISTS meets (
+    id   INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+-- every slot of a meet's schedule, including empty ones
+CREATE TABLE IF NOT EXISTS slots (
+    meet_id  INTEGER NOT NULL REFERENCES meets(id) ON DELETE CASCADE,
+    slot     INTEGER NOT NULL,
+    time_key TEXT NOT NULL,
+    PRIMARY KEY (meet_id, slot)
+);
+CREATE TABLE IF NOT EXISTS matches (
+    id       INTEGER PRIMARY KEY,
+    meet_id  INTEGER NOT NULL REFERENCES meets(id) ON DELETE CASCADE,
+    event    TEXT NOT NULL,
+    rank     INTEGER NOT NULL,
+    team1_id INTEGER NOT NULL REFERENCES teams(id),
+    team2_id INTEGER NOT NULL REFERENCES teams(id),
+    slot     INTEGER,
+    court    TEXT
+);
+CREATE INDEX IF NOT EXISTS matches_court ON matches (meet_id, court, slot);
+CREATE INDEX IF NOT EXISTS matches_slot ON matches (meet_id, slot);
+CREATE TABLE IF NOT EXISTS match_players (
+    match_id  INTEGER NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
+    side      INTEGER NOT NULL,
+    position  INTEGER NOT NULL,
+    player_id INTEGER NOT NULL REFERENCES players(id),
+    PRIMARY KEY (match_id, side, position)
+);
+CREATE INDEX IF NOT EXISTS match_players_player ON match_players (player_id);
+CREATE TABLE IF NOT EXISTS results (
+    match_id INTEGER PRIMARY KEY REFERENCES matches(id) ON DELETE CASCADE,
+    winner   INTEGER CHECK (winner IN (1, 2)),
+    score    TEXT NOT NULL DEFAULT ''
+);
+"""
+
+def connect(path=DEFAULT_DB, readonly=False):
+    """
+    Open (creating if needed) a meet database. readonly=True opens an existing one for
+    reading only, so a mistyped path raises FileNotFoundError instead of creating it.
+    """
+    if readonly:
+        if not Path(path).is_file():
+            raise FileNotFoundError(f"No meet database {path}")
+        conn = sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def _team_id(conn, name):
+    conn.execute("INSERT OR IGNORE INTO teams (name) VALUES (?)", (name,))
+    return conn.execute("SELECT id FROM teams WHERE name = ?", (name,)).fetchone()[0]
+
+def _player_id(conn, team_id, name):
+    name = player_name(name)
+    conn.execute("INSERT OR IGNORE INTO players (team_id, name) VALUES (?, ?)", (team_id, name))
+    return conn.execute("SELECT id FROM players WHERE team_id = ? AND name = ?",
+                        (team_id, name)).fetchone()[0]
+
+# ------------------- rosters (save.json) -------------------
+def save_rosters(conn, meet):
+    """
+    Store rosters in the save.json shape {team: {event: {"Rank N": {"Player Name": [...]}}}},
+    plus each team's optional AVAILABILITY windows {name: [[start, end], ...]}.
+    Only the teams in `meet` are replaced; every other team stays as it was.
+    """
+    with conn:
+        for team, events in meet.items():
+            team_id = _team_id(conn, team)
+            conn.execute("DELETE FROM roster WHERE team_id = ?", (team_id,))
+            conn.execute("DELETE FROM availability WHERE team_id = ?", (team_id,))
+            windows = {}    # "Neil Patel" and "Neil Patel " are one player
+            for name, spans in events.get(AVAILABILITY, {}).items():
+                windows.setdefault(_player_id(conn, team_id, name), []).extend(spans)
+            conn.executemany(
+                "INSERT INTO availability (team_id, player_id, position, start_time, end_time) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(team_id, player_id, position, start, end)
+                 for player_id, spans in windows.items()
+                 for position, (start, end) in enumerate(spans)])
+            rows = []
+            for event, ranks in events.items():
+                if event == AVAILABILITY:
+                    continue
+                for rank, entry in ranks.items():
+                    for position, name in enumerate(entry.get("Player Name", [])):
+                        rows.append((team_id, event, rank, position, _player_id(conn, team_id, name)))
+            conn.executemany(
+                "INSERT INTO roster (team_id, event, rank, position, player_id) VALUES (?, ?, ?, ?, ?)",
+                rows)
+
+def load_rosters(conn, teams=None):
+    """Rosters in the save.json shape, for `teams` (default: all), in the order they were saved."""
+    sql = ("SELECT t.name, r.event, r.rank, p.name FROM roster r "
+           "JOIN teams t ON t.id = r.team_id JOIN players p ON p.id = r.player_id")
+    args = ()
+    if teams is not None:
+        teams = list(teams)
+        sql += f" WHERE t.name IN ({','.join('?' * len(teams))})"
+        args = teams
+    meet = {team: {} for team in teams or ()}
+    for team, event, rank, name in conn.execute(sql + " ORDER BY r.rowid", args):
+        meet.setdefault(team, {}).setdefault(event, {}).setdefault(rank, {"Player Name": []})
+        meet[team][event][rank]["Player Name"].append(name)
+
+    sql = ("SELECT t.name, a.start_time, a.end_time, p.name FROM availability a "
+           "JOIN teams t ON t.id = a.team_id JOIN players p ON p.id = a.player_id")
+    if teams is not None:
+        sql += f" WHERE t.name IN ({','.join('?' * len(teams))})"
+    for team, start, end, name in conn.execute(sql + " ORDER BY a.rowid", args):
+        spans = meet.setdefault(team, {}).setdefault(AVAILABILITY, {}).setdefault(name, [])
+        spans.append([start, end])
+    return meet
+
+# ------------------- schedules (match_schedule.json) -------------------
+def _meet_id(conn, meet_name):
+    row = conn.execute("SELECT id FROM meets WHERE name = ?", (meet_name,)).fetchone()
+    if row is None:
+        raise KeyError(f"No meet named {meet_name!r}")
+    return row[0]
+
+def save_schedule(conn, meet_name, schedule_json):
+    """Store (or replace) a meet's schedule; its old matches and results are removed. Returns the meet id."""
+    matches, placed = read_schedule(schedule_json)
+    names = matches.players.names
+    slot_of = {key: s for s, key in enumerate(schedule_json)}
+    with conn:
+        conn.execute("DELETE FROM meets WHERE name = ?", (meet_name,))
+        meet_id = conn.execute("INSERT INTO meets (name) VALUES (?)", (meet_name,)).lastrowid
+        conn.executemany("INSERT INTO slots (meet_id, slot, time_key) VALUES (?, ?, ?)",
+                         [(meet_id, s, key) for key, s in slot_of.items()])
+        team_ids = {}
+        player_ids = {}
+        for m, (key, court) in zip(matches, placed):
+            for t in m.teams:
+                if t not in team_ids:
+                    team_ids[t] = _team_id(conn, t)
+            t1, t2 = (team_ids[t] for t in m.teams)
+            match_id = conn.execute(
+                "INSERT INTO matches (meet_id, event, rank, team1_id, team2_id, slot, court) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (meet_id, m.event, m.rank, t1, t2, slot_of[key], str(court))).lastrowid
+            rows = []
+            for side, (team_id, pids) in enumerate(zip((t1, t2), m.sides), start=1):
+                for position, p in enumerate(pids):
+                    if p not in player_ids:
+                        player_ids[p] = _player_id(conn, team_id, names[p])
+                    rows.append((match_id, side, position, player_ids[p]))
+            conn.executemany(
+                "INSERT INTO match_players (match_id, side, position, player_id) VALUES (?, ?, ?, ?)",
+                rows)
+    return meet_id
+
+def load_schedule(conn, meet_name):
+    """A meet's schedule back in the match_schedule.json shape (same slot and court order)."""
+    meet_id = _meet_id(conn, meet_name)
+    time_keys = dict(conn.execute("SELECT slot, time_key FROM slots WHERE meet_id = ? ORDER BY slot",
+                                  (meet_id,)))
+    out = {key: {} for key in time_keys.values()}
+    sides = {}
+    for match_id, side, name in conn.execute(
+            "SELECT mp.match_id, mp.side, p.name FROM match_players mp "
+            "JOIN matches m ON m.id = mp.match_id JOIN players p ON p.id = mp.player_id "
+            "WHERE m.meet_id = ? ORDER BY mp.match_id, mp.side, mp.position", (meet_id,)):
+        sides.setdefault(match_id, ([], []))[side - 1].append(name)
+    for match_id, event, rank, t1, t2, slot, court in conn.execute(
+            "SELECT m.id, m.event, m.rank, a.name, b.name, m.slot, m.court FROM matches m "
+            "JOIN teams a ON a.id = m.team1_id JOIN teams b ON b.id = m.team2_id "
+            "WHERE m.meet_id = ? ORDER BY m.id", (meet_id,)):
+        left, right = sides.get(match_id, ([], []))
+        out[time_keys[slot]][court] = [f"{event}{rank}", [f"{t1}:", left], [f"{t2}:", right]]
+    return out
+
+# ------------------- results and queries -------------------
+def record_result(conn, match_id, winner=None, score=""):
+    """Set one match's result (winner 1 = left team, 2 = right team, None = undecided)."""
+    with conn:
+        conn.execute("INSERT INTO results (match_id, winner, score) VALUES (?, ?, ?) "
+                     "ON CONFLICT (match_id) DO UPDATE SET winner = excluded.winner, score = excluded.score",
+                     (match_id, winner, score))
+
+_MATCH_ROWS = (
+    "SELECT mt.name, s.time_key, m.court, m.event || m.rank, a.name, b.name, m.id, r.winner, r.score "
+    "FROM matches m JOIN meets mt ON mt.id = m.meet_id "
+    "JOIN teams a ON a.id = m.team1_id JOIN teams b ON b.id = m.team2_id "
+    "LEFT JOIN slots s ON s.meet_id = m.meet_id AND s.slot = m.slot "
+    "LEFT JOIN results r ON r.match_id = m.id "
+)
+MATCH_COLUMNS = ("meet", "time", "court", "event", "team1", "team2", "match_id", "winner", "score")
+
+def player_matches(conn, player, team=None, meet=None):
+    """Every match a player is in (all meets unless `meet` is given), as MATCH_COLUMNS tuples."""
+    sql = (_MATCH_ROWS + "WHERE m.id IN (SELECT mp.match_id FROM match_players mp "
+           "JOIN players p ON p.id = mp.player_id JOIN teams t ON t.id = p.team_id WHERE p.name = ?")
+    args = [player_name(player)]
+    if team:
+        sql += " AND t.name = ?"
+        args.append(team)
+    sql += ")"
+    if meet:
+        sql += " AND mt.name = ?"
+        args.append(meet)
+    return conn.execute(sql + " ORDER BY mt.id, m.slot", args).fetchall()
+
+def court_matches(conn, meet, court):
+    """Everything on one court of a meet, in slot order, as MATCH_COLUMNS tuples."""
+    return conn.execute(_MATCH_ROWS + "WHERE m.meet_id = ? AND m.court = ? ORDER BY m.slot",
+                        (_meet_id(conn, meet), str(court))).fetchall()
+
+def team_records(conn, meet=None):
+    """{team: [wins, losses]} over recorded results (one meet, or the whole archive)."""
+    sql = ("SELECT t.name, "
+           "SUM((r.winner = 1 AND m.team1_id = t.id) OR (r.winner = 2 AND m.team2_id = t.id)), "
+           "SUM((r.winner = 2 AND m.team1_id = t.id) OR (r.winner = 1 AND m.team2_id = t.id)) "
+           "FROM results r JOIN matches m ON m.id = r.match_id "
+           "JOIN teams t ON t.id IN (m.team1_id, m.team2_id) "
+           "JOIN meets mt ON mt.id = m.meet_id WHERE r.winner IS NOT NULL")
+    args = ()
+    if meet:
+        sql += " AND mt.name = ?"
+        args = (meet,)
+    return {team: [w, l] for team, w, l in conn.execute(sql + " GROUP BY t.id ORDER BY t.name", args)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SQLite store for rosters, schedules and results.")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"database file (default: {DEFAULT_DB})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("import-rosters", help="load a save.json")
+    p.add_argument("json", nargs="?", default="save.json")
+    p = sub.add_parser("export-rosters", help="write rosters as save.json")
+    p.add_argument("--teams", help="comma-separated teams (default: all)")
+    p.add_argument("--out", default="save.json")
+    p = sub.add_parser("import-schedule", help="load a match_schedule.json as a named meet")
+    p.add_argument("meet")
+    p.add_argument("json", nargs="?", default="match_schedule.json")
+    p = sub.add_parser("export-schedule", help="write a meet as match_schedule.json")
+    p.add_argument("meet")
+    p.add_argument("--out", default="match_schedule.json")
+    p = sub.add_parser("player", help="all matches for a player")
+    p.add_argument("name")
+    p.add_argument("--team")
+    p.add_argument("--meet")
+    p = sub.add_parser("court", help="everything on one court")
+    p.add_argument("meet")
+    p.add_argument("court")
+    args = parser.parse_args(argv)
+
+    try:
+        conn = connect(args.db, readonly=not args.command.startswith("import-"))
+    except FileNotFoundError as e:
+        print(f"❌ {e.args[0]}")
+        return
+    if args.command == "import-rosters":
+        with open(args.json, "r", encoding="utf-8") as f:
+            save_rosters(conn, json.load(f))
+        print(f"✅ Rosters from {args.json} saved to {args.db}")
+    elif args.command == "export-rosters":
+        teams = args.teams.split(",") if args.teams else None
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(load_rosters(conn, teams), f, indent=3)
+        print(f"✅ Rosters saved to {args.out}")
+    elif args.command == "import-schedule":
+        with open(args.json, "r", encoding="utf-8") as f:
+            save_schedule(conn, args.meet, json.load(f))
+        print(f"✅ Schedule {args.json} saved to {args.db} as {args.meet!r}")
+    elif args.command == "export-schedule":
+        try:
+            schedule = load_schedule(conn, args.meet)
+        except KeyError as e:
+            print(f"❌ {e.args[0]}")
+            return
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(schedule, f, indent=3, ensure_ascii=False)
+        print(f"✅ Schedule saved to {args.out}")
+    else:
+        try:
+            rows = (player_matches(conn, args.name, args.team, args.meet) if args.command == "player"
+                    else court_matches(conn, args.meet, args.court))
+        except KeyError as e:
+            print(f"❌ {e.args[0]}")
+            return
+        for row in rows:
+            print("  ".join("" if v is None else str(v) for v in row[:6]))
+    conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+DEFAULT_DIR = ".trimeet_cache"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+def file_digest(path):
+    """sha256 of a file's bytes (rosters, save.json)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def params_digest(params):
+    """sha256 of a JSON-able parameter dict; tuples and lists hash the same."""
+    blob = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+def _entry(cache_dir, kind, key):
+    return Path(cache_dir) / f"{kind}-{key}.json"
+
+def get(cache_dir, kind, key):
+    """Cached JSON value, or None. A hit refreshes the entry's age for eviction."""
+    path = _entry(cache_dir, kind, key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            value = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return value
+
+def put(cache_dir, kind, key, value, max_bytes=DEFAULT_MAX_BYTES):
+    """Store a JSON value (atomically), then evict the oldest entries above max_bytes."""
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, _entry(cache_dir, kind, key))
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    evict(cache_dir, max_bytes)
+
+def evict(cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+    """Delete least recently used entries until the cache fits in max_bytes."""
+    entries = []
+    for path in Path(cache_dir).glob("*.json"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+            total -= size
+        except OSError:
+            pass
+
+def clear(cache_dir=DEFAULT_DIR):
+    for path in Path(cache_dir).glob("*.json"):
+        path.unlink()
@@ -0,0 +1,207 @@
+import argparse
+import json
+from pathlib import Path
+
+from match_model import A_TEAM_RANKS, Match, PlayerTable, read_schedule, split_code
+
+FIRST_DATA_ROW = 7          # Excel row of the first match in result.xlsx
+# 0-based columns read from each match row
+COL_TIME, COL_COURT, COL_EVENT, COL_T1, COL_P1, COL_T2, COL_P2, COL_FLAG1, COL_FLAG2 = (
+    0, 1, 3, 4, 5, 7, 8, 12, 13)
+
+def new_records():
+    """
+    Win/loss tallies, every value a [wins, losses] pair:
+      teams[team], a_team[team], events[team][event], players["TEAM:name"]
+    plus match counts and the problems found while reading.
+    """
+    return {"teams": {}, "a_team": {}, "events": {}, "players": {},
+            "matches": 0, "decided": 0, "problems": []}
+
+def _bump(table, key, won):
+    wl = table.get(key)
+    if wl is None:
+        wl = table[key] = [0, 0]
+    wl[0 if won else 1] += 1
+
+def _flag(value):
+    """A winner flag counts if the cell holds 1 (typed as a number, text or TRUE)."""
+    if value is None or value == "":
+        return False
+    try:
+        return float(value) == 1
+    except (TypeError, ValueError):
+        return False
+
+def add_result(records, match, players, winner):
+    """Record one decided match; winner is 0 (left side) or 1 (right side)."""
+    records["decided"] += 1
+    for side in (0, 1):
+        won = side == winner
+        team = match.teams[side]
+        _bump(records["teams"], team, won)
+        if match.rank <= A_TEAM_RANKS:
+            _bump(records["a_team"], team, won)
+        _bump(records["events"].setdefault(team, {}), match.event, won)
+        for p in match.sides[side]:
+            _bump(records["players"], players.label(p), won)
+
+def _row_match(row, players):
+    """Rebuild a Match from the sheet cells (used when there's no schedule to map back to)."""
+    event, rank = split_code(str(row[COL_EVENT]).strip())
+    t1, t2 = (str(row[c] or "").strip() for c in (COL_T1, COL_T2))
+    p1, p2 = (str(row[c] or "").split(" + ") for c in (COL_P1, COL_P2))
+    return Match(event, rank, (t1, t2), (
+        tuple(players.intern(t1, name.strip()) for name in p1 if name.strip()),
+        tuple(players.intern(t2, name.strip()) for name in p2 if name.strip()),
+    ))
+
+def _court_key(court):
+    return (0, int(court), "") if str(court).isdigit() else (1, 0, str(court))
+
+def read_results(result_path, schedule=None, records=None):
+    """
+    Stream the match rows of a result.xlsx (openpyxl read-only, one pass) and tally them.
+    With the schedule JSON, each row is mapped back to its match by (time, court), so
+    players are the scheduled ones; a row that doesn't match its scheduled event code is
+    reported and read from the sheet instead. Per-court/per-session sheets are all read;
+    the Totals sheet is skipped. Returns the (updated) records.
+    Older exports write a slot's time only on its first row, and not at all for a slot
+    with one court: a row whose court number doesn't follow the row above starts a new
+    slot, and an unlabelled one takes the schedule's next time key.
+    """
+    from openpyxl import load_workbook  # only needed for reading results
+
+    records = new_records() if records is None else records
+    if schedule is not None:
+        matches, placed = read_schedule(schedule, skipped=[])
+        players = matches.players
+        by_position = {(key, str(court)): m for m, (key, court) in zip(matches, placed)}
+        keys = list(schedule)
+        next_key = dict(zip(keys, keys[1:]))
+    else:
+        players, by_position, next_key = PlayerTable(), {}, {}
+
+    workbook = load_workbook(result_path, read_only=True, data_only=True)
+    try:
+        for worksheet in workbook.worksheets:
+            if worksheet.title == "Totals":
+                continue
+            time_key = last_court = None
+            for r, row in enumerate(worksheet.iter_rows(min_row=FIRST_DATA_ROW, max_col=COL_FLAG2 + 1,
+                                                        values_only=True), start=FIRST_DATA_ROW):
+                if len(row) <= COL_FLAG2:
+                    row = row + (None,) * (COL_FLAG2 + 1 - len(row))
+                court = row[COL_COURT]
+                if row[COL_TIME]:
+                    time_key, last_court = row[COL_TIME], None
+                elif court is not None and last_court is not None and _court_key(court) <= _court_key(last_court):
+                    time_key = next_key.get(str(time_key))   # an older export's unlabelled slot
+                if court is not None:
+                    last_court = court
+                if not row[COL_EVENT]:
+                    continue
+                where = f"{worksheet.title}!{r}"
+                m = by_position.get((str(time_key), str(row[COL_COURT])))
+                if m is None or m.code != str(row[COL_EVENT]).strip():
+                    if by_position:
+                        records["problems"].append(
+                            f"{where}: {row[COL_EVENT]} at {time_key} court {row[COL_COURT]} "
+                            f"is not in the schedule")
+                    m = _row_match(row, players)
+                records["matches"] += 1
+                for team in m.teams:
+                    records["teams"].setdefault(team, [0, 0])
+
+                left, right = _flag(row[COL_FLAG1]), _flag(row[COL_FLAG2])
+                if left and right:
+                    records["problems"].append(f"{where}: {m.code} has both winner flags set")
+                elif left or right:
+                    add_result(records, m, players, 0 if left else 1)
+    finally:
+        workbook.close()
+    return records
+
+def find_results(folder):
+    """[(result workbook, its match_schedule.json or None), ...] anywhere under folder."""
+    pairs = []
+    for path in sorted(Path(folder).rglob("*.xlsx")):
+        if path.name.startswith("~$") or not path.stem.startswith("result"):
+            continue
+        schedule = path.with_name("match_schedule.json")
+        pairs.append((path, schedule if schedule.exists() else None))
+    return pairs
+
+def season_standings(folder):
+    """Sum the records of every result*.xlsx under folder (e.g. a season-batch.py output)."""
+    records = new_records()
+    pairs = find_results(folder)
+    for path, schedule_path in pairs:
+        schedule = None
+        if schedule_path:
+            with open(schedule_path, "r", encoding="utf-8") as f:
+                schedule = json.load(f)
+        before = len(records["problems"])
+        read_results(path, schedule, records)
+        records["problems"][before:] = [f"{path}: {p}" for p in records["problems"][before:]]
+    records["meets"] = len(pairs)
+    return records
+
+def format_records(records, top_players=10):
+    """Plain-text standings: team, A-team and per-event records, then the top players."""
+    def wl(pair):
+        return f"{pair[0]}-{pair[1]}"
+
+    ranked = sorted(records["teams"], key=lambda t: (-records["teams"][t][0], t))
+    events = sorted({e for per in records["events"].values() for e in per})
+    header = ["Team", "Overall", "A-Team"] + events
+    table = [header] + [
+        [t, wl(records["teams"][t]), wl(records["a_team"].get(t, [0, 0]))]
+        + [wl(records["events"].get(t, {}).get(e, [0, 0])) for e in events]
+        for t in ranked
+    ]
+    widths = [max(len(line[i]) for line in table) for i in range(len(header))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(line, widths)) for line in table]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+
+    lines.append("")
+    lines.append(f"{records['decided']} of {records['matches']} matches decided")
+    best = sorted(records["players"].items(), key=lambda item: (-item[1][0], item[1][1], item[0]))
+    for player, pair in best[:top_players]:
+        lines.append(f"  {player:<30} {wl(pair)}")
+    for problem in records["problems"]:
+        lines.append(f"❌ {problem}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tally match results from result.xlsx workbooks.")
+    parser.add_argument("results", nargs="?", default="result.xlsx",
+                        help="a result.xlsx, or a folder of them for season standings")
+    parser.add_argument("--schedule", help="schedule JSON for a single workbook "
+                                           "(default: match_schedule.json next to it)")
+    parser.add_argument("--json", metavar="FILE", help="also save the records as JSON")
+    parser.add_argument("--top", type=int, default=10, help="players to list")
+    args = parser.parse_args(argv)
+
+    path = Path(args.results)
+    if not path.exists():
+        print(f"❌ Missing {args.results}.")
+        return
+    if path.is_dir():
+        records = season_standings(path)
+    else:
+        schedule_path = Path(args.schedule) if args.schedule else path.with_name("match_schedule.json")
+        schedule = None
+        if schedule_path.exists():
+            with open(schedule_path, "r", encoding="utf-8") as f:
+                schedule = json.load(f)
+        records = read_results(path, schedule)
+
+    print(format_records(records, args.top))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=3, ensure_ascii=False)
+        print(f"✅ Records saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
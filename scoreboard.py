@@ -0,0 +1,308 @@
+import argparse
+import asyncio
+import json
+from datetime import datetime
+from pathlib import Path
+
+from match_model import A_TEAM_RANKS, read_schedule, slot_timeline
+
+MAX_BODY = 64 * 1024
+CLIENT_QUEUE = 64           # pending pushes per display before it's dropped as stalled
+
+class Scoreboard:
+    """
+    In-memory meet state, loaded once from a schedule JSON object.
+    Results are keyed by match index; each update moves the old result's counts out of
+    the tallies and the new one's in, so an update costs O(1) however big the meet is.
+    """
+
+    def __init__(self, schedule):
+        self.matches, self.placed = read_schedule(schedule, skipped=[])
+        self.players = self.matches.players
+        self.time_keys = list(schedule)
+        self.at = {where: i for i, where in enumerate(self.placed)}
+        self.by_slot = {key: [] for key in self.time_keys}
+        for i, (key, _court) in enumerate(self.placed):
+            self.by_slot[key].append(i)
+        timeline = slot_timeline(self.time_keys)
+        self.starts = [minutes for _day, minutes in timeline] if timeline else None
+
+        self.results = {}       # match index -> {"winner": 1 | 2 | None, "score": str}
+        teams = sorted({t for m in self.matches for t in m.teams if t})
+        self.overall = dict.fromkeys(teams, 0)
+        self.a_team = dict.fromkeys(teams, 0)
+        self.events = {t: {} for t in teams}
+        self.version = 0
+
+    def _count(self, i, winner, step):
+        if winner not in (1, 2):
+            return
+        m = self.matches[i]
+        team = m.teams[winner - 1]
+        self.overall[team] = self.overall.get(team, 0) + step
+        if m.rank <= A_TEAM_RANKS:
+            self.a_team[team] = self.a_team.get(team, 0) + step
+        per_event = self.events.setdefault(team, {})
+        per_event[m.event] = per_event.get(m.event, 0) + step
+
+    def record(self, i, winner=None, score=""):
+        """Set (or clear, with winner None) one match's result. Returns the change to push."""
+        if winner not in (None, 1, 2):
+            raise ValueError("winner must be 1 (left), 2 (right) or null")
+        old = self.results.get(i)
+        if old:
+            self._count(i, old["winner"], -1)
+        self.results[i] = {"winner": winner, "score": score}
+        self._count(i, winner, +1)
+        self.version += 1
+        return {"version": self.version, "match": self.match_json(i), "tallies": self.tallies()}
+
+    def find(self, time_key=None, court=None, match=None):
+        """Match index from an explicit index or a (time, court) position."""
+        if match is not None:
+            if not 0 <= int(match) < len(self.matches):
+                raise KeyError(f"no match {match}")
+            return int(match)
+        i = self.at.get((str(time_key), str(court)))
+        if i is None:
+            raise KeyError(f"no match at {time_key} court {court}")
+        return i
+
+    def current_slot(self, now=None):
+        """
+        Index of the slot being played now (the last one that has started), by the wall
+        clock. The 12-hour keys are read as match_model.slot_timeline unwraps them.
+        """
+        if not self.starts:
+            return 0
+        now = now or datetime.now()
+        minutes = now.hour * 60 + now.minute
+        current = 0
+        for k, start in enumerate(self.starts):
+            if start <= minutes:
+                current = k
+        return current
+
+    def match_json(self, i):
+        m = self.matches[i]
+        time_key, court = self.placed[i]
+        names = self.players.names
+        result = self.results.get(i, {"winner": None, "score": ""})
+        return {"match": i, "time": time_key, "court": court, "event": m.code,
+                "teams": list(m.teams),
+                "players": [[names[p] for p in side] for side in m.sides], **result}
+
+    def tallies(self):
+        return {"overall": self.overall, "a_team": self.a_team, "events": self.events}
+
+    def slot_json(self, k):
+        if not 0 <= k < len(self.time_keys):
+            return None
+        key = self.time_keys[k]
+        return {"slot": k, "time": key, "courts": [self.match_json(i) for i in self.by_slot[key]]}
+
+    def now_json(self, now=None):
+        k = self.current_slot(now)
+        return {"version": self.version, "current": self.slot_json(k),
+                "next": self.slot_json(k + 1), "tallies": self.tallies()}
+
+    def state_json(self):
+        return {"version": self.version, "tallies": self.tallies(),
+                "slots": [self.slot_json(k) for k in range(len(self.time_keys))]}
+
+class ScoreboardServer:
+    """
+    Minimal HTTP/1.1 on asyncio streams (stdlib only, works offline on a LAN):
+      GET  /         display page (live via /events)
+      GET  /now      current and next slot with court assignments, plus tallies
+      GET  /state    the whole meet
+      GET  /events   Server-Sent Events: "state" and "now" on connect, then one "update"
+                     per recorded result (the change plus the current and next slot)
+      POST /result   {"time": "10:15", "court": "1" | "match": 12, "winner": 1|2|null, "score": "21-15 21-18"}
+    Results can be appended to a JSON-lines log and are replayed from it on start.
+    """
+
+    def __init__(self, board, log_path=None):
+        self.board = board
+        self.log_path = Path(log_path) if log_path else None
+        self.clients = set()
+        self._state_cache = (None, b"")
+        if self.log_path and self.log_path.exists():
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        board.record(entry["match"], entry["winner"], entry.get("score", ""))
+
+    def state_bytes(self):
+        # the full state is only re-serialized after a change
+        version, body = self._state_cache
+        if version != self.board.version:
+            body = json.dumps(self.board.state_json(), ensure_ascii=False).encode("utf-8")
+            self._state_cache = (self.board.version, body)
+        return body
+
+    def broadcast(self, change):
+        data = f"event: update\ndata: {json.dumps(change, ensure_ascii=False)}\n\n".encode("utf-8")
+        for queue in list(self.clients):
+            try:
+                queue.put_nowait(data)
+            except asyncio.QueueFull:
+                self.clients.discard(queue)   # stalled display; it reconnects and resyncs
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                return
+            lines = head.decode("latin-1").split("\r\n")
+            method, target, _ = (lines[0].split(" ") + ["", ""])[:3]
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            path = target.split("?", 1)[0]
+
+            if method == "GET" and path == "/events":
+                await self.stream(writer)
+            elif method == "GET" and path == "/":
+                await self.respond(writer, 200, PAGE.encode("utf-8"), "text/html; charset=utf-8")
+            elif method == "GET" and path == "/now":
+                await self.respond_json(writer, 200, self.board.now_json())
+            elif method == "GET" and path == "/state":
+                await self.respond(writer, 200, self.state_bytes())
+            elif method == "POST" and path == "/result":
+                length = headers.get("content-length", "")
+                if not length.isdigit():
+                    await self.respond_json(writer, 400, {"error": "missing or invalid Content-Length"})
+                    return
+                length = int(length)
+                if length > MAX_BODY:
+                    await self.respond_json(writer, 413, {"error": "body too large"})
+                    return
+                body = await reader.readexactly(length)
+                await self.post_result(writer, body)
+            else:
+                await self.respond_json(writer, 404, {"error": f"no route {method} {path}"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def post_result(self, writer, body):
+        try:
+            data = json.loads(body or b"{}")
+            i = self.board.find(data.get("time"), data.get("court"), data.get("match"))
+            winner = data.get("winner")
+            winner = int(winner) if winner not in (None, "") else None
+            score = str(data.get("score", ""))
+            change = {**self.board.record(i, winner, score), **self.board.now_json()}
+        except (ValueError, TypeError, KeyError) as e:
+            await self.respond_json(writer, 400, {"error": str(e.args[0]) if e.args else repr(e)})
+            return
+        if self.log_path:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"match": i, "winner": winner, "score": score}) + "\n")
+        self.broadcast(change)
+        await self.respond_json(writer, 200, change)
+
+    async def stream(self, writer):
+        queue = asyncio.Queue(CLIENT_QUEUE)
+        self.clients.add(queue)
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\n")
+        # a new display starts from the full state, then follows the updates
+        writer.write(b"event: state\ndata: " + self.state_bytes() + b"\n\n")
+        now = json.dumps(self.board.now_json(), ensure_ascii=False).encode("utf-8")
+        writer.write(b"event: now\ndata: " + now + b"\n\n")
+        try:
+            await writer.drain()
+            while queue in self.clients:
+                try:
+                    data = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    data = b": keep-alive\n\n"
+                writer.write(data)
+                await writer.drain()
+        finally:
+            self.clients.discard(queue)
+
+    async def respond_json(self, writer, status, obj):
+        await self.respond(writer, status, json.dumps(obj, ensure_ascii=False).encode("utf-8"))
+
+    async def respond(self, writer, status, body, content_type="application/json"):
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large"}[status]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+        writer.write(body)
+        await writer.drain()
+
+async def serve(schedule, host="0.0.0.0", port=8080, log_path=None):
+    server = ScoreboardServer(Scoreboard(schedule), log_path)
+    listener = await asyncio.start_server(server.handle, host, port)
+    print(f"✅ Scoreboard running on http://{host}:{port}/ ({len(server.board.matches)} matches)")
+    async with listener:
+        await listener.serve_forever()
+
+PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Scoreboard</title>
+<style>
+body { font-family: raleway, sans-serif; background: #222; color: #fff; margin: 1em; }
+h1 { background: #8B5259; padding: .3em; text-align: center; }
+table { border-collapse: collapse; width: 100%; margin-bottom: 1em; }
+th { background: #355B85; } td, th { border: 1px solid #789FCC; padding: .3em; text-align: center; }
+.won { background: #79242F; font-weight: bold; }
+</style></head>
+<body><h1 id="title">Scoreboard</h1><div id="tallies"></div><div id="slot"></div>
+<script>
+let state = null, now = null;
+function esc(s) { return String(s).replace(/[&<>]/g, c => ({"&": "&amp;", "<": "&lt;", ">": "&gt;"})[c]); }
+function render() {
+  if (!state || !now) return;
+  const t = state.tallies, teams = Object.keys(t.overall);
+  document.getElementById("title").textContent = teams.join(" vs ") || "Scoreboard";
+  document.getElementById("tallies").innerHTML = "<table><tr><th></th>" +
+    teams.map(x => "<th>" + esc(x) + "</th>").join("") + "</tr><tr><td>Overall</td>" +
+    teams.map(x => "<td>" + t.overall[x] + "</td>").join("") + "</tr><tr><td>A-Team</td>" +
+    teams.map(x => "<td>" + t.a_team[x] + "</td>").join("") + "</tr></table>";
+  const rows = s => s ? s.courts.map(m => "<tr><td>" + esc(m.time) + "</td><td>" + esc(m.court) +
+    "</td><td>" + esc(m.event) + "</td><td class='" + (m.winner === 1 ? "won" : "") + "'>" +
+    esc(m.players[0].join(" + ")) + "</td><td class='" + (m.winner === 2 ? "won" : "") + "'>" +
+    esc(m.players[1].join(" + ")) + "</td><td>" + esc(m.score) + "</td></tr>").join("") : "";
+  document.getElementById("slot").innerHTML = "<table><tr><th>Time</th><th>Court</th><th>Event</th>" +
+    "<th>Team 1</th><th>Team 2</th><th>Score</th></tr>" + rows(now.current) + rows(now.next) + "</table>";
+}
+const events = new EventSource("/events");
+events.addEventListener("state", e => { state = JSON.parse(e.data); render(); });
+events.addEventListener("now", e => { now = JSON.parse(e.data); render(); });
+// each update carries the current and next slot, so a push needs no extra request
+events.addEventListener("update", e => { now = JSON.parse(e.data); state.tallies = now.tallies; render(); });
+// the clock moves on between results: pick up the new current slot once a minute
+setInterval(() => state && fetch("/now").then(r => r.json()).then(n => { now = n; render(); }), 60000);
+</script></body></html>
+"""
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a live scoreboard for a match schedule on the local network.")
+    parser.add_argument("schedule", nargs="?", default="match_schedule.json")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--log", default="scoreboard_results.jsonl",
+                        help="append results here and replay them on restart ('' to disable)")
+    args = parser.parse_args(argv)
+
+    path = Path(args.schedule)
+    if not path.exists():
+        print(f"❌ Missing {args.schedule} file.")
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        schedule = json.load(f)
+
+    try:
+        asyncio.run(serve(schedule, args.host, args.port, args.log or None))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
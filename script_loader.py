@@ -0,0 +1,59 @@
+import importlib
+import importlib.util
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+_HERE = Path(__file__).resolve().parent
+
+_SCRIPTS = {}   # module name -> script filename, for every module load_script() has loaded
+
+# Start method for process_pool's workers (a multiprocessing context); None uses the
+# platform default: fork on Linux, spawn on macOS and Windows
+mp_context = None
+
+def load_script(filename):
+    """
+    Import one of the pipeline scripts (e.g. "meet-scheduler.py") as a module.
+    Hyphenated filenames can't be imported normally; the module is registered as
+    meet_scheduler, conflict_checker, ... so it is loaded once. A spawned worker
+    process can't import it by that name on its own: run pools through process_pool.
+    """
+    name = Path(filename).stem.replace("-", "_")
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, _HERE / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    _SCRIPTS[name] = filename
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        del _SCRIPTS[name]
+        raise
+    return module
+
+def _start_worker(module_name, filename, initializer, initargs):
+    """process_pool's worker initializer: load the script, then run its own initializer."""
+    if module_name in sys.modules:       # always true for __main__ and under fork
+        module = sys.modules[module_name]
+    elif filename:
+        module = load_script(filename)
+    else:
+        module = importlib.import_module(module_name)
+    if initializer:
+        getattr(module, initializer)(*initargs)
+
+def process_pool(module_name, max_workers, initializer=None, initargs=()):
+    """
+    ProcessPoolExecutor for the functions of one module, normally the caller's __name__.
+    Tasks are pickled by module and function name, and a spawned worker starts without
+    the load_script modules, so each worker loads module_name first. initializer is a
+    function of that module, run in each worker with initargs.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=mp_context, initializer=_start_worker,
+        initargs=(module_name, _SCRIPTS.get(module_name),
+                  initializer.__name__ if initializer else None, initargs),
+    )
@@ -0,0 +1,140 @@
+import argparse
+import json
+import os
+import traceback
+from pathlib import Path
+
+from script_loader import load_script, process_pool
+
+scheduler = load_script("meet-scheduler.py")
+
+MANIFEST = "season.json"
+
+def load_manifest(meet_dir, manifest=None):
+    """
+    Per-meet parameters, e.g. season.json:
+      {
+        "defaults": {"courts": 6, "slot_minutes": 15, "windows": [["10:15","12:00"], ["13:00","19:00"]]},
+        "meets": {"week1.json": {"teams": ["UCSC", "UCD", "SJSU"], "courts": 5}}
+      }
+    Any make_schedule keyword can appear. Meets without "teams" play every team in their file.
+    """
+    path = Path(manifest) if manifest else Path(meet_dir) / MANIFEST
+    if not path.exists():
+        return {}, {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("defaults", {}), data.get("meets", {})
+
+def find_meets(meet_dir, manifest=None):
+    """Return [(meet_path, params), ...] for every meet JSON in the directory."""
+    defaults, per_meet = load_manifest(meet_dir, manifest)
+    skip = {MANIFEST, Path(manifest).name if manifest else MANIFEST}
+    jobs = []
+    for path in sorted(Path(meet_dir).glob("*.json")):
+        if path.name in skip:
+            continue
+        params = {**defaults, **per_meet.get(path.name, per_meet.get(path.stem, {}))}
+        if "windows" in params:
+            params["windows"] = tuple(tuple(w) for w in params["windows"])
+        jobs.append((path, params))
+    return jobs
+
+def run_meet(meet_path, params, out_dir, report=True, export=True):
+    """Schedule one meet and write its outputs to out_dir/<meet name>/. Returns a summary row."""
+    meet_path = Path(meet_path)
+    dest = Path(out_dir) / meet_path.stem
+    dest.mkdir(parents=True, exist_ok=True)
+    row = {"meet": meet_path.stem, "status": "ok", "total": 0, "scheduled": 0,
+           "unscheduled": 0, "conflicts": None, "error": ""}
+    try:
+        params = dict(params)
+        teams = params.pop("teams", None)
+        if teams is None:
+            with open(meet_path, "r", encoding="utf-8") as f:
+                teams = list(json.load(f))
+        _, _, _, schedule_json, summary, warning = scheduler.make_schedule(
+            str(meet_path), teams, **params
+        )
+        with open(dest / "match_schedule.json", "w", encoding="utf-8") as f:
+            json.dump(schedule_json, f, indent=3, ensure_ascii=False)
+        row.update(total=summary["total_matches"], scheduled=summary["scheduled_matches"],
+                   unscheduled=summary["unscheduled_matches"])
+        if warning:
+            row["status"] = "partial"
+
+        slot_minutes = scheduler.report_slot_minutes(
+            **{k: params[k] for k in ("solver", "slot_minutes", "durations") if k in params})
+        if report:
+            checker = load_script("conflict-checker.py")
+            row["conflicts"] = len(checker.write_report(
+                schedule_json, output=str(dest / "conflict_report.xlsx"), slot_minutes=slot_minutes
+            ))
+        if export:
+            import XLSX_Parser
+            XLSX_Parser.export_schedule(schedule_json, output=str(dest / "result.xlsx"),
+                                        slot_minutes=slot_minutes)
+    except Exception as e:
+        row["status"] = "error"
+        row["error"] = f"{type(e).__name__}: {e}"
+        with open(dest / "error.txt", "w", encoding="utf-8") as f:
+            f.write(traceback.format_exc())
+    return row
+
+def run_season(meet_dir, out_dir="season_output", manifest=None, workers=None,
+               report=True, export=True):
+    """Run every meet in meet_dir on a process pool; writes out_dir/summary.json and returns the rows."""
+    jobs = find_meets(meet_dir, manifest)
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    if not jobs:
+        return []
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        rows = [run_meet(path, params, out_dir, report, export) for path, params in jobs]
+    else:
+        with process_pool(__name__, workers) as pool:
+            futures = [pool.submit(run_meet, path, params, out_dir, report, export)
+                       for path, params in jobs]
+            rows = [fut.result() for fut in futures]
+
+    with open(Path(out_dir) / "summary.json", "w", encoding="utf-8") as f:
+        json.dump(rows, f, indent=3, ensure_ascii=False)
+    return rows
+
+def format_summary(rows):
+    """Plain-text table of scheduled / unscheduled counts per meet."""
+    header = ("Meet", "Status", "Total", "Scheduled", "Unscheduled", "Conflicts")
+    table = [header] + [
+        (r["meet"], r["status"], str(r["total"]), str(r["scheduled"]), str(r["unscheduled"]),
+         "-" if r["conflicts"] is None else str(r["conflicts"]))
+        for r in rows
+    ]
+    widths = [max(len(line[i]) for line in table) for i in range(len(header))]
+    lines = ["  ".join(cell.ljust(w) for cell, w in zip(line, widths)) for line in table]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    for r in rows:
+        if r["error"]:
+            lines.append(f"❌ {r['meet']}: {r['error']}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule a directory of meets in parallel.")
+    parser.add_argument("meet_dir", help="directory of meet JSON files (save.json format)")
+    parser.add_argument("--out", default="season_output", help="output directory (one folder per meet)")
+    parser.add_argument("--manifest", help=f"per-meet parameters (default: <meet_dir>/{MANIFEST})")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--no-report", action="store_true", help="skip the conflict report")
+    parser.add_argument("--no-xlsx", action="store_true", help="skip the result.xlsx export")
+    args = parser.parse_args(argv)
+
+    rows = run_season(args.meet_dir, args.out, args.manifest, args.workers,
+                      report=not args.no_report, export=not args.no_xlsx)
+    if not rows:
+        print(f"❌ No meet JSON files found in {args.meet_dir}")
+        return
+    print(format_summary(rows))
+    print(f"✅ Season outputs saved to {args.out}/")
+
+if __name__ == "__main__":
+    main()
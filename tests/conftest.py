@@ -0,0 +1,34 @@
+import multiprocessing
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import script_loader  # noqa: E402
+
+TEAMS = ["UCSC", "UCD", "SJSU"]
+
+@pytest.fixture(scope="session")
+def save_json():
+    """The sample tri-meet rosters shipped with the repo."""
+    return ROOT / "save.json"
+
+@pytest.fixture
+def spawn(monkeypatch):
+    """Run process_pool workers with the spawn start method (the macOS/Windows default)."""
+    monkeypatch.setattr(script_loader, "mp_context", multiprocessing.get_context("spawn"))
+
+@pytest.fixture
+def single_cpu(scheduler, monkeypatch):
+    """One CPU for meet-scheduler, whose process_pool then fails the test if it's used."""
+    def no_pool(*args, **kwargs):
+        raise AssertionError("started a process pool on one CPU")
+    monkeypatch.setattr(scheduler, "process_pool", no_pool)
+    monkeypatch.setattr(scheduler.os, "cpu_count", lambda: 1)
+
+@pytest.fixture(scope="session")
+def scheduler():
+    return script_loader.load_script("meet-scheduler.py")
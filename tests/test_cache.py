@@ -0,0 +1,34 @@
+import json
+
+import meet_store
+from conftest import TEAMS
+
+def test_db_cache_sees_commits_still_in_the_wal(tmp_path, scheduler, save_json):
+    db = str(tmp_path / "meet.db")
+    cache = tmp_path / "cache"
+    rosters = json.loads(save_json.read_text())
+    writer = meet_store.connect(db)
+    meet_store.save_rosters(writer, rosters)
+    first = scheduler.make_schedule(db, TEAMS, cache_dir=cache)[4]
+
+    # drop a rank while the writer stays open, so the commit isn't checkpointed into meet.db
+    del rosters["UCD"]["MS"]["Rank 1"]
+    meet_store.save_rosters(writer, {"UCD": rosters["UCD"]})
+    try:
+        second = scheduler.make_schedule(db, TEAMS, cache_dir=cache)[4]
+    finally:
+        writer.close()
+    assert second["total_matches"] == first["total_matches"] - 2
+
+def test_anytime_is_not_cached(tmp_path, scheduler, save_json):
+    cache = tmp_path / "cache"
+    scheduler.make_schedule(str(save_json), TEAMS, solver="anytime", time_budget=0.05, cache_dir=cache)
+    assert not cache.exists() or not any(cache.iterdir())
+
+def test_identical_runs_hit_the_cache(tmp_path, scheduler, save_json):
+    cache = tmp_path / "cache"
+    first = scheduler.make_schedule(str(save_json), TEAMS, cache_dir=cache)
+    stats = scheduler.ScheduleStats()
+    second = scheduler.make_schedule(str(save_json), TEAMS, cache_dir=cache, stats=stats)
+    assert second[3] == first[3]
+    assert "build_matches" not in stats.stages
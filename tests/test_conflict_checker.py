@@ -0,0 +1,41 @@
+import pytest
+
+from script_loader import load_script
+
+@pytest.fixture(scope="module")
+def checker():
+    return load_script("conflict-checker.py")
+
+def _entry(code, left, right):
+    return [code, ["UCD:", left], ["SJSU:", right]]
+
+def test_timed_back_to_back_uses_slot_length(checker):
+    # A timed schedule: starts at 10:15, 10:20 and 10:45 with 30-minute matches.
+    # Neil's 10:15 match still runs when his 10:45 match is due
+    schedule = {
+        "10:15": {"1": _entry("MS1", ["Neil Patel"], ["Amber Li"])},
+        "10:20": {"2": _entry("MS2", ["Eric Wang"], ["Shani Chiu"])},
+        "10:45": {"1": _entry("MS3", ["Neil Patel"], ["Minh Nguyen"])},
+    }
+    index = checker.build_index(schedule, slot_minutes=30)
+    assert list(checker.check_back_to_back(schedule, index).values()) == [[("10:15", "10:45")]]
+    # the smallest gap (5 minutes) is not the slot length here
+    assert checker.check_back_to_back(schedule) == {}
+
+def test_lunch_break_is_not_back_to_back(checker):
+    schedule = {
+        "11:30": {"1": _entry("MS1", ["Neil Patel"], ["Amber Li"])},
+        "11:45": {"1": _entry("MS2", ["Neil Patel"], ["Shani Chiu"])},
+        "01:00": {"1": _entry("MS3", ["Neil Patel"], ["Minh Nguyen"])},
+    }
+    assert list(checker.check_back_to_back(schedule).values()) == [[("11:30", "11:45")]]
+
+def test_unreadable_entries_are_reported(checker, capsys):
+    schedule = {
+        "10:15": {"1": _entry("MS1", ["Neil Patel"], ["Amber Li"]), "2": ["MS9"]},
+        "10:30": {"1": _entry("MS2", ["Neil Patel"], ["Shani Chiu"])},
+    }
+    index = checker.build_index(schedule)
+    assert [(key, court) for key, court, _reason in index.skipped] == [("10:15", "2")]
+    checker.write_report(schedule, output=None)
+    assert "Skipped 1 unreadable schedule entry" in capsys.readouterr().out
@@ -0,0 +1,107 @@
+import json
+import re
+
+import pytest
+from openpyxl import load_workbook
+
+import XLSX_Parser
+from conftest import ROOT
+from match_model import A_TEAM_RANKS, read_schedule
+
+@pytest.fixture(scope="module")
+def schedule():
+    with open(ROOT / "match_schedule.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+# ---- just enough of a spreadsheet engine for the formulas the export writes ----
+def _evaluate(workbook, ws, formula):
+    def cell(ref, sheet=ws):
+        return _compute(workbook, sheet, sheet[ref.replace("$", "")].value)
+
+    if formula.startswith("=COUNTIFS("):
+        args = formula[len("=COUNTIFS("):-1].split(",")
+        hits = None
+        for rng, crit in zip(args[::2], args[1::2]):
+            if crit.startswith('"'):
+                want = crit.strip('"')
+            elif crit[0] == "$":
+                want = cell(crit)
+            else:
+                want = int(crit)
+            column = [_compute(workbook, ws, c.value) for (c,) in ws[rng.replace("$", "")]]
+            match = [v == want for v in column]
+            hits = match if hits is None else [a and b for a, b in zip(hits, match)]
+        return sum(hits)
+    m = re.fullmatch(r'=IF\((\w+)=1,(\w+),IF\((\w+)=1,(\w+),""\)\)', formula)
+    if m:
+        flag1, left, flag2, right = m.groups()
+        return cell(left) if cell(flag1) == 1 else cell(right) if cell(flag2) == 1 else ""
+    if formula == "=0":
+        return 0
+    # Totals: ='Court 1'!$L$3+'Court 2'!$L$3+...
+    total = 0
+    for sheet, ref in re.findall(r"'([^']+)'!(\$\w+\$\d+)", formula):
+        total += cell(ref, workbook[sheet])
+    return total
+
+def _compute(workbook, ws, value):
+    return _evaluate(workbook, ws, value) if isinstance(value, str) and value.startswith("=") else value
+
+def _tallies(workbook, ws):
+    """{"ateam" | "overall" | event: {team: count}} as the sheet's formulas compute them."""
+    col = XLSX_Parser.TALLY_COL + 1
+    teams = []
+    while ws.cell(1, col + len(teams)).value:
+        teams.append(ws.cell(1, col + len(teams)).value)
+    out = {name: {t: _compute(workbook, ws, ws.cell(row, col + i).value) for i, t in enumerate(teams)}
+           for name, row in (("ateam", 3), ("overall", 5))}
+    label_col = next(c for c in range(1, 40) if ws.cell(1, c).value == "Event Tally")
+    row = 2
+    while ws.cell(row, label_col).value and ws.cell(row, label_col).value != "Rank Tally":
+        out[ws.cell(row, label_col).value] = {
+            t: _compute(workbook, ws, ws.cell(row, label_col + 1 + i).value) for i, t in enumerate(teams)}
+        row += 1
+    return out
+
+def _left_team_wins(workbook):
+    for ws in workbook.worksheets:
+        if ws.title != "Totals":
+            for row in range(XLSX_Parser.FIRST_DATA_ROW + 1, ws.max_row + 1):
+                if ws.cell(row, 4).value:
+                    ws.cell(row, 13).value = 1
+
+@pytest.mark.parametrize("split, sheets", [(None, ["Schedule"]),
+                                           ("session", ["Totals", "Session 1", "Session 2"]),
+                                           ("court", ["Totals"] + [f"Court {c}" for c in range(1, 7)])])
+def test_export_round_trip(tmp_path, schedule, split, sheets):
+    path = tmp_path / "result.xlsx"
+    assert XLSX_Parser.export_schedule(schedule, output=str(path), split=split) == []
+    workbook = load_workbook(path)
+    assert workbook.sheetnames == sheets
+
+    # COUNTIFS tallies (and the Totals sums over them) once team 1 wins every match
+    _left_team_wins(workbook)
+    matches, _placed = read_schedule(schedule)
+    expected = {"ateam": {}, "overall": {}}
+    for m in matches:
+        team = m.teams[0]
+        expected["overall"][team] = expected["overall"].get(team, 0) + 1
+        if m.rank <= A_TEAM_RANKS:
+            expected["ateam"][team] = expected["ateam"].get(team, 0) + 1
+        expected.setdefault(m.event, {})
+        expected[m.event][team] = expected[m.event].get(team, 0) + 1
+    got = _tallies(workbook, workbook.worksheets[0])
+    assert {k: {t: n for t, n in v.items() if n} for k, v in got.items()} == expected
+
+    # every match lands on exactly one sheet; helper columns O-Q describe its row
+    rows = [(ws.cell(r, 4).value, ws.cell(r, 15).value, ws.cell(r, 16).value, ws.cell(r, 17).value)
+            for ws in workbook.worksheets if ws.title != "Totals"
+            for r in range(XLSX_Parser.FIRST_DATA_ROW + 1, ws.max_row + 1) if ws.cell(r, 4).value]
+    assert sorted(code for code, *_ in rows) == sorted(m.code for m in matches)
+    assert all(code == f"{event}{rank}" and ateam == int(rank <= A_TEAM_RANKS) for code, event, rank, ateam in rows)
+
+def test_export_reports_skipped_entries(tmp_path, capsys):
+    schedule = {"10:15": {"1": ["MS1", ["UCD:", ["Neil Patel"]], ["SJSU:", ["Amber Li"]]], "2": ["MS9"]}}
+    skipped = XLSX_Parser.export_schedule(schedule, output=str(tmp_path / "result.xlsx"))
+    assert [(key, court) for key, court, _reason in skipped] == [("10:15", "2")]
+    assert "Skipped 1 unreadable schedule entry" in capsys.readouterr().out
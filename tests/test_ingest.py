@@ -0,0 +1,26 @@
+import json
+
+from conftest import ROOT
+from script_loader import load_script
+
+ROSTERS = [("UCSC", ROOT / "ucsc.xlsx"), ("UCD", ROOT / "ucd.xlsx"), ("SJSU", ROOT / "sjsu.xlsx")]
+
+def test_ingest_on_spawned_workers(tmp_path, spawn):
+    tool = load_script("xlsx-json.py")
+    pooled = tool.ingest(ROSTERS, output=str(tmp_path / "save.json"), workers=3)
+    here = tool.ingest(ROSTERS, output=None, workers=1)
+    assert pooled == here
+    assert json.loads((tmp_path / "save.json").read_text()) == here
+    assert list(here) == ["UCSC", "UCD", "SJSU"]
+
+def test_interactive_add_player_matches_ingest(monkeypatch, capsys):
+    tool = load_script("xlsx-json.py")
+    monkeypatch.setattr("builtins.input", lambda prompt="": str(ROOT / "ucd.xlsx"))
+    expected = tool.parse_roster(ROOT / "ucd.xlsx")
+    read = []
+    monkeypatch.setattr(tool, "parse_roster", lambda path: read.append(path) or expected)
+    meet = {"UCD": {}}
+    tool.addEvent(meet)
+    tool.addPlayer(meet["UCD"], "UCD")
+    assert read == [str(ROOT / "ucd.xlsx")] and meet["UCD"] == expected
+    assert "Added players for team UCD" in capsys.readouterr().out
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+import meet_store
+from conftest import TEAMS
+from match_model import AVAILABILITY, key_minutes, read_schedule
+
+def _with_availability(save_json, name):
+    rosters = json.loads(save_json.read_text())
+    rosters["UCD"][AVAILABILITY] = {name: [["13:00", "19:00"]]}
+    return rosters
+
+def test_availability_round_trip_normalizes_names(tmp_path, save_json):
+    conn = meet_store.connect(str(tmp_path / "meet.db"))
+    meet_store.save_rosters(conn, _with_availability(save_json, "Leyang Ding "))
+    loaded = meet_store.load_rosters(conn, ["UCD"])
+    conn.close()
+    assert loaded["UCD"][AVAILABILITY] == {"Leyang Ding": [["13:00", "19:00"]]}
+
+def test_availability_from_db_is_enforced(tmp_path, scheduler, save_json):
+    db = str(tmp_path / "meet.db")
+    conn = meet_store.connect(db)
+    meet_store.save_rosters(conn, _with_availability(save_json, "Leyang Ding "))
+    conn.close()
+    schedule_json = scheduler.make_schedule(db, TEAMS)[3]
+    starts = dict(zip(schedule_json, key_minutes(list(schedule_json))))
+    matches, placed = read_schedule(schedule_json)
+    played = [starts[key] for m, (key, _court) in zip(matches, placed)
+              if "Leyang Ding" in (matches.players.names[p] for p in m.pids)]
+    assert played and min(played) >= 13 * 60
+
+def test_mistyped_db_path_is_not_created(tmp_path, scheduler):
+    db = tmp_path / "meeet.db"
+    with pytest.raises(FileNotFoundError):
+        scheduler.make_schedule(str(db), TEAMS)
+    assert not db.exists()
+
+def test_team_without_rosters_in_db(tmp_path, scheduler, save_json):
+    db = str(tmp_path / "meet.db")
+    conn = meet_store.connect(db)
+    meet_store.save_rosters(conn, json.loads(save_json.read_text()))
+    conn.close()
+    with pytest.raises(ValueError, match="SCU"):
+        scheduler.make_schedule(db, TEAMS + ["SCU"])
@@ -0,0 +1,34 @@
+from openpyxl import Workbook
+
+from script_loader import load_script
+
+def _entry(code, left, right):
+    return [code, ["UCD:", [left]], ["SJSU:", [right]]]
+
+def test_legacy_export_without_single_court_times(tmp_path):
+    reader = load_script("results-reader.py")
+    schedule = {
+        "10:15": {"1": _entry("MS1", "Neil Patel", "Amber Li"), "2": _entry("MS2", "Eric Wang", "Shani Chiu")},
+        "10:30": {"1": _entry("MS3", "Minh Nguyen", "Rupashi Bahl")},
+        "10:45": {"1": _entry("MS4", "Livia Rice", "Sankhya Gunda")},
+    }
+    # older layout: the time sits on a slot's first row only (merged down), and a
+    # slot with a single court has none at all
+    wb = Workbook()
+    ws = wb.active
+    rows = [("10:15", 1, "MS1", "Neil Patel", "Amber Li", 1, None),
+            (None, 2, "MS2", "Eric Wang", "Shani Chiu", None, 1),
+            (None, 1, "MS3", "Minh Nguyen", "Rupashi Bahl", 1, None),
+            ("10:45", 1, "MS4", "Livia Rice", "Sankhya Gunda", None, 1)]
+    for r, (time, court, code, left, right, flag1, flag2) in enumerate(rows, start=reader.FIRST_DATA_ROW):
+        for col, value in ((1, time), (2, court), (4, code), (5, "UCD"), (6, left), (8, "SJSU"),
+                           (9, right), (13, flag1), (14, flag2)):
+            ws.cell(row=r, column=col, value=value)
+    ws.merge_cells(start_row=7, start_column=1, end_row=8, end_column=1)
+    path = tmp_path / "result.xlsx"
+    wb.save(path)
+
+    records = reader.read_results(path, schedule)
+    assert records["problems"] == []
+    assert records["matches"] == records["decided"] == 4
+    assert records["teams"] == {"UCD": [2, 2], "SJSU": [2, 2]}
@@ -0,0 +1,216 @@
+import json
+
+import pytest
+
+from conftest import TEAMS
+from match_model import AVAILABILITY, key_minutes, read_schedule
+
+@pytest.fixture(scope="module")
+def meet(scheduler, save_json):
+    return scheduler.build_matches(scheduler.load_meet(str(save_json), TEAMS), TEAMS)
+
+def _max_slots(scheduler):
+    return len(scheduler.build_slot_times(15, (("10:15", "12:00"), ("13:00", "19:00"))))
+
+def _assert_feasible(meet, slot_matches, courts):
+    """No slot over capacity and no player twice in one slot."""
+    for mids in slot_matches:
+        assert len(mids) <= courts
+        pids = [p for mid in mids for p in meet[mid].pids]
+        assert len(pids) == len(set(pids))
+
+# ------------------- pre-check -------------------
+# A, B and C pair up in three doubles: each plays twice, but the three matches all
+# share players pairwise, so they need three slots
+TRIANGLE = {
+    "T1": {"MD": {"Rank 1": {"Player Name": ["A", "B"]}, "Rank 2": {"Player Name": ["B", "C"]},
+                  "Rank 3": {"Player Name": ["A", "C"]}}},
+    "T2": {"MD": {f"Rank {r}": {"Player Name": [f"P{r}", f"Q{r}"]} for r in (1, 2, 3)}},
+}
+TWO_SLOTS = (("10:00", "10:30"),)
+
+def test_clique_bound_rejects_an_infeasible_meet(scheduler):
+    matches = scheduler.build_matches(scheduler.load_meet(TRIANGLE, ["T1", "T2"]), ["T1", "T2"])
+    bounds = scheduler.schedule_bounds(matches, courts=3, max_slots=2)
+    assert (bounds["capacity"], bounds["player"], bounds["clique"], bounds["slots"]) == (1, 2, 3, 3)
+    assert len(bounds["problems"]) == 1 and "share players pairwise" in bounds["problems"][0]
+
+def test_precheck_runs_before_the_solver(scheduler, monkeypatch):
+    stats = scheduler.ScheduleStats()
+    *_, summary, warning = scheduler.make_schedule(TRIANGLE, ["T1", "T2"], courts=3, slot_minutes=15,
+                                                   windows=TWO_SLOTS, stats=stats)
+    assert summary["min_slots"] == 3 and "Pre-check: needs at least 3 slots" in warning
+    stages = list(stats.stages)
+    assert stages.index("precheck") < stages.index("schedule_matches")
+
+    # the sweep skips the solver altogether for a configuration the bounds rule out
+    def no_solve(*args, **kwargs):
+        raise AssertionError("solved a configuration the pre-check rules out")
+    monkeypatch.setattr(scheduler, "_greedy_place", no_solve)
+    (row,) = scheduler.sweep_schedules(TRIANGLE, ["T1", "T2"], courts=(3,), slot_minutes=(15,),
+                                       windows=(TWO_SLOTS,), workers=1)
+    assert (row["min_slots"], row["slots"], row["scheduled"], row["fits"]) == (3, 2, None, False)
+
+# ------------------- multi-start -------------------
+def test_multi_start_same_result_on_spawned_workers(scheduler, meet, spawn):
+    kwargs = dict(courts=6, max_slots=_max_slots(scheduler), starts=4, seed=3, min_rest_slots=1)
+    here = scheduler.multi_start_schedule(meet, workers=1, **kwargs)
+    pooled = scheduler.multi_start_schedule(meet, workers=2, **kwargs)
+    assert pooled == here
+
+def test_multi_start_never_worse_than_greedy(scheduler, meet):
+    max_slots = _max_slots(scheduler)
+    _, greedy_slots, greedy_left = scheduler.schedule_matches(meet, courts=5, max_slots=max_slots)
+    _, slots, left = scheduler.multi_start_schedule(meet, courts=5, max_slots=max_slots,
+                                                    starts=3, seed=100, workers=1)
+    assert scheduler._schedule_cost(slots, left) <= scheduler._schedule_cost(greedy_slots, greedy_left)
+
+def test_multi_start_single_cpu_skips_the_pool(scheduler, meet, single_cpu):
+    scheduler.multi_start_schedule(meet, courts=6, max_slots=_max_slots(scheduler), starts=4)
+
+# ------------------- anytime -------------------
+def test_improve_schedule_keeps_constraints_and_never_costs_more(scheduler, meet):
+    courts, max_slots = 4, _max_slots(scheduler)
+    pid = meet[0].pids[0]
+    blocked = [1 << pid if s < 10 else 0 for s in range(max_slots)]   # one player arrives late
+    rest = scheduler.rest_rule(meet, 1)
+    player_masks, _ = scheduler.conflict_masks(meet)
+    seed_slot, seed_slots, seed_left = scheduler.schedule_matches(
+        meet, courts=courts, max_slots=max_slots, min_rest_slots=1, blocked=blocked)
+    assert seed_left, "the meet should be too crowded for greedy"
+    match_slot, slot_matches, left = scheduler.improve_schedule(
+        meet, seed_slot, seed_slots, seed_left, courts=courts, time_budget=0.3, seed=1,
+        player_masks=player_masks, rest=rest, blocked=blocked)
+
+    _assert_feasible(meet, slot_matches, courts)
+    assert sorted([mid for mids in slot_matches for mid in mids] + left) == list(range(len(meet)))
+    assert all(match_slot[mid] == s for s, mids in enumerate(slot_matches) for mid in mids)
+    assert all(match_slot[mid] >= 10 for mid, m in enumerate(meet) if pid in m.pids and mid not in left)
+    by_player = {}
+    for mid, s in enumerate(match_slot):
+        if s >= 0:
+            for p in meet[mid].pids:
+                by_player.setdefault(p, []).append(s)
+    assert all(b - a > 1 for slots in by_player.values() for a, b in zip(sorted(slots), sorted(slots)[1:]))
+    assert scheduler._schedule_cost(slot_matches, left) <= scheduler._schedule_cost(seed_slots, seed_left)
+
+# ------------------- components -------------------
+def test_components_same_result_on_spawned_workers(scheduler, meet, spawn):
+    kwargs = dict(courts=6, max_slots=_max_slots(scheduler), min_rest_slots=1)
+    assert (scheduler.component_schedule(meet, workers=2, **kwargs)
+            == scheduler.component_schedule(meet, workers=1, **kwargs))
+
+def test_components_single_cpu_skips_the_pool(scheduler, meet, single_cpu):
+    scheduler.component_schedule(meet, courts=6, max_slots=_max_slots(scheduler))
+
+@pytest.mark.parametrize("courts", [4, 5, 6])
+def test_components_keep_the_group_placements(scheduler, meet, monkeypatch, courts):
+    merged = []
+    merge = scheduler._merge_groups
+    def spy(groups, results, *args):
+        merged.append((groups, results))
+        return merge(groups, results, *args)
+    monkeypatch.setattr(scheduler, "_merge_groups", spy)
+    max_slots = _max_slots(scheduler)
+    match_slot, slot_matches, left = scheduler.component_schedule(meet, courts=courts, max_slots=max_slots,
+                                                                  workers=1)
+    _assert_feasible(meet, slot_matches, courts)
+    # every match stays in its group's slot or moves into an earlier idle court
+    (groups, results), = merged
+    assert len(groups) > 1
+    for group, (group_slot, _unscheduled) in zip(groups, results):
+        for i, s in enumerate(group_slot):
+            if s >= 0:
+                assert 0 <= match_slot[group[i]] <= s
+    _, greedy_slots, greedy_left = scheduler.schedule_matches(meet, courts=courts, max_slots=max_slots)
+    assert scheduler._schedule_cost(slot_matches, left) <= scheduler._schedule_cost(greedy_slots, greedy_left)
+
+# ------------------- timed -------------------
+def test_timed_schedule_keeps_courts_players_and_windows(scheduler, save_json):
+    rosters = json.loads(save_json.read_text())
+    rosters["UCD"][AVAILABILITY] = {"Leyang Ding": [["13:00", "16:00"]]}
+    durations = {"MS": 35, "WS": 30, "MD": 25}
+    windows = (("10:15", "12:00"), ("13:00", "19:00"))
+    schedule_json = scheduler.make_schedule(rosters, TEAMS, courts=8, solver="timed",
+                                            durations=durations, windows=windows)[3]
+    starts = dict(zip(schedule_json, key_minutes(list(schedule_json))))
+    matches, placed = read_schedule(schedule_json)
+    by_court, by_player = {}, {}
+    for m, (key, court) in zip(matches, placed):
+        start = starts[key]
+        span = (start, start + durations.get(m.event, 15))
+        assert any(lo <= span[0] and span[1] <= hi for lo, hi in ((615, 720), (780, 1140)))
+        by_court.setdefault(court, []).append(span)
+        for p in m.pids:
+            by_player.setdefault(matches.players.label(p), []).append(span)
+    for spans in [*by_court.values(), *by_player.values()]:
+        spans.sort()
+        assert all(a[1] <= b[0] for a, b in zip(spans, spans[1:]))
+    assert by_player["UCD:Leyang Ding"]
+    assert all(13 * 60 <= a and b <= 16 * 60 for a, b in by_player["UCD:Leyang Ding"])
+
+# ------------------- repair -------------------
+def test_repair_counts_the_lunch_break_as_rest(scheduler):
+    schedule = {
+        "11:45": {"1": ["MS1", ["UCD:", ["Ann"]], ["UCSC:", ["Bo"]]]},
+        "01:00": {"2": ["MS2", ["UCD:", ["Ann"]], ["SJSU:", ["Cy"]]]},
+        "01:15": {},
+    }
+    repaired, moved, unscheduled = scheduler.repair_schedule(
+        schedule, "01:00", courts=2, courts_down=[2], min_rest_slots=1)
+    # 11:45 -> 01:00 is an hour apart, not back-to-back: Ann's match just changes court
+    assert moved == [("MS2", "01:00", 2, "01:00", 1)]
+    assert unscheduled == []
+    assert list(repaired["01:00"]) == ["1"]
+
+def test_repair_keeps_rest_between_adjacent_slots(scheduler):
+    schedule = {
+        "01:00": {"1": ["MS1", ["UCD:", ["Ann"]], ["UCSC:", ["Bo"]]]},
+        "01:15": {"2": ["MS2", ["UCD:", ["Ann"]], ["SJSU:", ["Cy"]]]},
+        "01:30": {},
+    }
+    _, moved, _ = scheduler.repair_schedule(schedule, "01:15", courts=2, courts_down=[2], min_rest_slots=1)
+    assert moved == [("MS2", "01:15", 2, "01:30", 1)]
+
+def test_repair_keeps_moved_matches_in_availability(scheduler):
+    schedule = {
+        "01:00": {"2": ["MS2", ["UCD:", ["Ann"]], ["SJSU:", ["Cy"]]]},
+        "01:15": {},
+        "01:30": {},
+    }
+    _, moved, _ = scheduler.repair_schedule(schedule, "01:00", courts=2, courts_down=[2])
+    assert moved == [("MS2", "01:00", 2, "01:00", 1)]
+    meet = {"UCD": {AVAILABILITY: {"Ann": [["13:30", "19:00"]]}}, "SJSU": {}}
+    _, moved, _ = scheduler.repair_schedule(schedule, "01:00", courts=2, courts_down=[2], meet=meet)
+    assert moved == [("MS2", "01:00", 2, "01:30", 1)]
+
+# ------------------- instrumentation -------------------
+def test_counting_does_not_change_placements(scheduler, meet):
+    max_slots = _max_slots(scheduler)
+    stats = scheduler.ScheduleStats()
+    counted = scheduler.schedule_matches(meet, courts=4, max_slots=max_slots, min_rest_slots=1, stats=stats)
+    plain = scheduler.schedule_matches(meet, courts=4, max_slots=max_slots, min_rest_slots=1)
+    assert counted == plain
+    c = stats.counters
+    placed = len(meet) - len(plain[2])
+    assert c["slots_probed"] == c["capacity_rejections"] + c["conflict_checks"]
+    assert c["conflict_checks"] == c["conflict_rejections"] + c["rest_checks"]
+    assert c["rest_checks"] == c["rest_rejections"] + placed
+
+# ------------------- sweep -------------------
+def test_sweep_spawn_pool_matches_in_process(scheduler, save_json, spawn):
+    configs = dict(courts=(5, 6), slot_minutes=(15,))
+    pooled = scheduler.sweep_schedules(str(save_json), TEAMS, workers=2, **configs)
+    assert pooled == scheduler.sweep_schedules(str(save_json), TEAMS, workers=1, **configs)
+
+# ------------------- command line -------------------
+def test_solver_tuning_flags_reach_make_schedule(scheduler, tmp_path, monkeypatch):
+    seen = {}
+    def fake_make_schedule(source, teams, **kwargs):
+        seen.update(kwargs)
+        return None, None, None, {}, {}, ""
+    monkeypatch.setattr(scheduler, "make_schedule", fake_make_schedule)
+    scheduler.main(["--solver", "multistart", "--time-budget", "0.5", "--seed", "7", "--starts", "8",
+                    "--workers", "2", "--out", str(tmp_path / "out.json")])
+    assert (seen["solver"], seen["time_budget"], seen["seed"], seen["starts"], seen["workers"]) == (
+        "multistart", 0.5, 7, 8, 2)
@@ -0,0 +1,56 @@
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
+from script_loader import load_script
+
+@pytest.fixture(scope="module")
+def scoreboard():
+    return load_script("scoreboard.py")
+
+def _entry(code):
+    return [code, ["UCD:", ["Neil Patel"]], ["SJSU:", ["Amber Li"]]]
+
+def _at(hour, minute):
+    return datetime(2026, 10, 17, hour, minute)
+
+def test_current_slot_afternoon_meet(scoreboard):
+    board = scoreboard.Scoreboard({key: {"1": _entry(f"MS{i + 1}")}
+                                   for i, key in enumerate(["01:00", "01:15", "01:30"])})
+    assert board.current_slot(_at(13, 20)) == 1
+    assert board.current_slot(_at(12, 50)) == 0
+
+def test_current_slot_across_noon(scoreboard):
+    board = scoreboard.Scoreboard({key: {"1": _entry(f"MS{i + 1}")}
+                                   for i, key in enumerate(["11:45", "12:00", "01:00", "01:15"])})
+    assert board.current_slot(_at(12, 30)) == 1
+    assert board.current_slot(_at(13, 5)) == 2
+
+def _post(scoreboard, headers, body=b""):
+    """POST /result to a fresh server; returns (status, JSON body)."""
+    async def run():
+        server = scoreboard.ScoreboardServer(scoreboard.Scoreboard({"10:15": {"1": _entry("MS1")}}))
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"POST /result HTTP/1.1\r\n" + headers + b"\r\n" + body)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        head, _, payload = response.partition(b"\r\n\r\n")
+        return int(head.split(b" ")[1]), json.loads(payload)
+    return asyncio.run(run())
+
+@pytest.mark.parametrize("headers", [b"", b"Content-Length: abc\r\n", b"Content-Length: -5\r\n"])
+def test_bad_content_length(scoreboard, headers):
+    status, body = _post(scoreboard, headers)
+    assert status == 400 and "Content-Length" in body["error"]
+
+def test_result_carries_current_slot(scoreboard):
+    body = json.dumps({"match": 0, "winner": 1}).encode()
+    status, change = _post(scoreboard, b"Content-Length: %d\r\n" % len(body), body)
+    assert status == 200
+    assert change["match"]["winner"] == 1 and change["current"]["time"] == "10:15"
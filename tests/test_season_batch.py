@@ -0,0 +1,28 @@
+import shutil
+
+from script_loader import load_script
+
+def test_run_season_on_spawned_workers(tmp_path, save_json, spawn):
+    season = load_script("season-batch.py")
+    meets = tmp_path / "meets"
+    meets.mkdir()
+    for name in ("week1", "week2"):
+        shutil.copy(save_json, meets / f"{name}.json")
+
+    rows = season.run_season(meets, out_dir=tmp_path / "out", workers=2, report=False, export=False)
+
+    assert [r["meet"] for r in rows] == ["week1", "week2"]
+    assert all(r["status"] == "ok" and r["scheduled"] == r["total"] > 0 for r in rows), rows
+    assert (tmp_path / "out" / "week1" / "match_schedule.json").exists()
+
+def test_timed_meet_reports_with_its_match_length(tmp_path, save_json, monkeypatch):
+    season = load_script("season-batch.py")
+    checker = load_script("conflict-checker.py")
+    import XLSX_Parser
+    seen = []
+    monkeypatch.setattr(checker, "write_report", lambda schedule, **kw: seen.append(kw["slot_minutes"]) or {})
+    monkeypatch.setattr(XLSX_Parser, "export_schedule", lambda schedule, **kw: seen.append(kw["slot_minutes"]))
+    params = {"teams": ["UCSC", "UCD", "SJSU"], "courts": 8, "solver": "timed", "durations": {"MS": 35}}
+    row = season.run_meet(save_json, params, tmp_path)
+    assert row["status"] != "error", row
+    assert seen == [35, 35]
@@ -0,0 +1,79 @@
+import argparse
+import sys
+
+from script_loader import load_script
+
+# subcommand -> ("script.py[:function]", help); the function (default: main) takes argv.
+# Each script is imported only when its subcommand runs, so e.g. `trimeet check` never
+# loads openpyxl
+COMMANDS = {
+    "ingest": ("xlsx-json.py", "roster workbooks -> save.json (or --db)"),
+    "schedule": ("meet-scheduler.py", "save.json -> match_schedule.json"),
+    "sweep": ("meet-scheduler.py:sweep_main", "fewest courts / longest slots that fit a meet"),
+    "check": ("conflict-checker.py", "match_schedule.json -> conflict_report.xlsx"),
+    "export": ("XLSX_Parser.py", "match_schedule.json -> result.xlsx"),
+    "results": ("results-reader.py", "result.xlsx (or a folder) -> standings"),
+    "serve": ("scoreboard.py", "live scoreboard for match_schedule.json"),
+    "season": ("season-batch.py", "schedule a folder of meets in parallel"),
+    "store": ("meet_store.py", "SQLite import/export and queries"),
+    "bench": ("benchmark.py", "benchmark the pipeline"),
+}
+
+def run_all(argv=None):
+    """
+    ingest (if roster files are given) -> schedule -> check -> export in one process.
+    The rosters and the schedule are handed on in memory; the usual files are still
+    written for the other tools.
+    """
+    scheduler = load_script("meet-scheduler.py")
+    parser = argparse.ArgumentParser(prog="trimeet all",
+                                     description="Ingest, schedule, check and export in one process.")
+    parser.add_argument("rosters", nargs="*",
+                        help="roster .xlsx files (TEAM=path allowed); default: read --meet")
+    scheduler.add_schedule_args(parser)
+    parser.add_argument("--save", default="save.json", help="where ingest writes the rosters")
+    parser.add_argument("--report", default="conflict_report.xlsx", help="conflict report ('' to skip)")
+    parser.add_argument("--result", default="result.xlsx", help="results workbook ('' to skip)")
+    parser.add_argument("--split", choices=("court", "session"), help="results workbook sheets")
+    args = parser.parse_args(argv)
+
+    meet = None
+    if args.rosters:
+        roster_tool = load_script("xlsx-json.py")
+        rosters = roster_tool.roster_args(args.rosters)
+        meet = roster_tool.ingest(rosters, output=args.save)
+        print(f"✅ Rosters for {', '.join(meet)} saved to {args.save}")
+
+    schedule_json = scheduler.schedule_from_args(args, meet)
+    slot_minutes = scheduler.report_slot_minutes(args.solver, args.slot_minutes, args.durations)
+
+    if args.report:
+        checker = load_script("conflict-checker.py")
+        conflicts = checker.write_report(schedule_json, output=args.report, slot_minutes=slot_minutes)
+        print(f"{'❌' if conflicts else '✅'} {len(conflicts)} player conflicts")
+    if args.result:
+        exporter = load_script("XLSX_Parser.py")
+        exporter.export_schedule(schedule_json, output=args.result, split=args.split,
+                                 slot_minutes=slot_minutes)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help") or (argv[0] not in COMMANDS and argv[0] != "all"):
+        print("usage: trimeet <command> [options]   (trimeet <command> -h for its options)\n")
+        print(f"  {'all':<10} ingest (optional) + schedule + check + export in one process")
+        for name, (_script, text) in COMMANDS.items():
+            print(f"  {name:<10} {text}")
+        if argv and argv[0] not in ("-h", "--help"):
+            print(f"\n❌ Unknown command {argv[0]!r}")
+            sys.exit(2)
+        return
+
+    command, rest = argv[0], argv[1:]
+    if command == "all":
+        run_all(rest)
+    else:
+        script, _, function = COMMANDS[command][0].partition(":")
+        getattr(load_script(script), function or "main")(rest)
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,31 @@
+import argparse
 import json
+import os
+import sys
+from pathlib import Path
+
 import openpyxl
 
+import meet_store
+import pipeline_cache
+from match_model import AVAILABILITY
+from script_loader import process_pool
+
+EVENTS = ["MD", "MS", "XD", "WS", "WD"]
+
 # -> addEvent(Meet) :: add event categories to each team.
 def addEvent(Meet): 
     for team in Meet:
-        Meet[team]["MD"] = {}
-        Meet[team]["MS"] = {}
-        Meet[team]["XD"] = {}
-        Meet[team]["WS"] = {}
-        Meet[team]["WD"] = {}
-
-# -> addPlayer() :: load players from Excel and insert into Meet JSON structure.
-def addPlayer(team_dict, team_name):
-    file_name = input(f"Enter Excel filename for {team_name} (include .xlsx): ").strip()
-    try:
-        wb = openpyxl.load_workbook(file_name)
-        sh = wb.active
-    except Exception as e:
-        print(f"Error loading file: {e}")
-        return
-
-    data = []
-    for i in range(1, sh.max_row + 1):
-        for j in range(1, 4):
-            val = sh.cell(row=i, column=j).value
-            if val is not None:
-                data.append(val)
+        for event in EVENTS:
+            Meet[team][event] = {}
 
+# -> fill_team(team_dict, values) :: event / rank / player state machine over roster cell values.
+def fill_team(team_dict, values):
     curr_event = None
     curr_rank = None
 
-    for item in data:
-        if item in ["MD", "MS", "XD", "WS", "WD"]:
+    for item in values:
+        if item in EVENTS:
             curr_event = item
         elif isinstance(item, (int, float)):
             curr_rank = f"Rank {int(item)}"
@@ -42,6 +36,121 @@ def addPlayer(team_dict, team_name):
                 team_dict[curr_event][curr_rank] = {"Player Name": [item]}
             else:
                 team_dict[curr_event][curr_rank]["Player Name"].append(item)
+    return team_dict
+
+# -> parse_roster(file_name) :: stream one roster workbook (columns A-C) into a team dict.
+def parse_roster(file_name):
+    wb = openpyxl.load_workbook(file_name, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(min_col=1, max_col=3, values_only=True)
+        values = (val for row in rows for val in row if val is not None)
+        return fill_team({event: {} for event in EVENTS}, values)
+    finally:
+        wb.close()
+
+# -> team_name(path) :: "ucsc.xlsx" -> "UCSC", same rule as the interactive menu.
+def team_name(path):
+    return Path(path).name.upper().replace(".XLSX", "")
+
+# -> saved_availability(output, db, teams) :: the windows ingest carries over from the last save.
+def saved_availability(output, db, teams):
+    """
+    Each team's AVAILABILITY windows from an existing save.json and/or database (the JSON
+    wins). They aren't in the roster workbooks, so ingest keeps them across re-ingests.
+    """
+    found = {}
+    if db and os.path.exists(db):
+        conn = meet_store.connect(db, readonly=True)
+        for team, roster in meet_store.load_rosters(conn, teams).items():
+            if AVAILABILITY in roster:
+                found[team] = roster[AVAILABILITY]
+        conn.close()
+    if output and os.path.exists(output):
+        try:
+            with open(output, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            saved = {}
+        for team in teams:
+            if AVAILABILITY in saved.get(team, {}):
+                found[team] = saved[team][AVAILABILITY]
+    return found
+
+# -> ingest(rosters) :: parse several roster files concurrently and write save.json.
+def ingest(rosters, output="save.json", workers=None, cache_dir=None, db=None):
+    """
+    rosters: list of paths, or (team, path) pairs; bare paths are named with team_name().
+    cache_dir: reuse parsed rosters keyed by each file's content hash, so only
+               changed workbooks are parsed again.
+    db: also store the rosters in this SQLite file (meet_store); only these teams are
+        replaced. output=None skips the JSON file.
+    Availability windows already saved for these teams are kept (see saved_availability).
+    Returns the Meet dict that was written to `output`.
+    """
+    pairs = [r if isinstance(r, (tuple, list)) else (team_name(r), r) for r in rosters]
+    names = [team for team, _ in pairs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate team names: {names}")
+
+    paths = [str(path) for _, path in pairs]
+    teams = [None] * len(paths)
+    keys = [None] * len(paths)
+    if cache_dir:
+        for i, path in enumerate(paths):
+            keys[i] = pipeline_cache.params_digest(
+                {"roster": pipeline_cache.file_digest(path), "events": EVENTS}
+            )
+            teams[i] = pipeline_cache.get(cache_dir, "roster", keys[i])
+    todo = [i for i, team in enumerate(teams) if team is None]
+
+    workers = min(workers or os.cpu_count() or 1, len(todo) or 1)
+    if workers == 1:
+        parsed = [parse_roster(paths[i]) for i in todo]
+    else:
+        with process_pool(__name__, workers) as pool:
+            parsed = list(pool.map(parse_roster, [paths[i] for i in todo]))
+    for i, team in zip(todo, parsed):
+        teams[i] = team
+        if cache_dir:
+            pipeline_cache.put(cache_dir, "roster", keys[i], team)
+
+    Meet = dict(zip(names, teams))
+    for team, windows in saved_availability(output, db, names).items():
+        Meet[team] = {**Meet[team], AVAILABILITY: windows}
+    if output:
+        with open(output, "w") as f:
+            json.dump(Meet, f, indent=3)
+    if db:
+        conn = meet_store.connect(db)
+        meet_store.save_rosters(conn, Meet)
+        conn.close()
+    return Meet
+
+def roster_args(values):
+    """Command-line roster arguments: "path" or "TEAM=path" -> ingest()'s rosters list."""
+    rosters = []
+    for r in values:
+        if "=" in r:
+            team, path = r.split("=", 1)
+            rosters.append((team.strip().upper(), path))
+        else:
+            rosters.append(r)
+    return rosters
+
+# -> addPlayer() :: load players from Excel and insert into Meet JSON structure.
+def addPlayer(team_dict, team_name):
+    file_name = input(f"Enter Excel filename for {team_name} (include .xlsx): ").strip()
+    try:
+        parsed = parse_roster(file_name)
+    except Exception as e:
+        print(f"Error loading file: {e}")
+        return
+
+    # same streaming reader as ingest; players are added to any ranks already there
+    for event, ranks in parsed.items():
+        for rank, entry in ranks.items():
+            names = team_dict.setdefault(event, {}).setdefault(rank, {"Player Name": []})["Player Name"]
+            names.extend(entry["Player Name"])
 
     print(f"✅ Added players for team {team_name} successfully!")
 
@@ -63,51 +172,90 @@ def save(Meet):
 
 # ------------------- MAIN PROGRAM -------------------
 
-print("// PROGRAM START \\\\")
-team_count = int(input("How many teams are there in this meet? (Max 3): ").strip())
+def interactive():
+    print("// PROGRAM START \\\\")
+    team_count = int(input("How many teams are there in this meet?: ").strip())
 
-while team_count < 2 or team_count > 3:
-    team_count = int(input("❌ Invalid input. Enter 2 or 3 teams only: ").strip())
+    while team_count < 2:
+        team_count = int(input("❌ Invalid input. Enter at least 2 teams: ").strip())
 
-Meet = {}
-teams = []
+    Meet = {}
+    teams = []
 
-for i in range(1, team_count + 1):
-    name = input(f"Enter team name #{i}: ").strip().upper()
-    Meet[name] = {}
-    teams.append(name)
+    for i in range(1, team_count + 1):
+        name = input(f"Enter team name #{i}: ").strip().upper()
+        Meet[name] = {}
+        teams.append(name)
 
-addEvent(Meet)
+    addEvent(Meet)
 
-if team_count == 2:
-    print(f"Welcome to the meet between {teams[0]} and {teams[1]}!")
-else:
-    print(f"Welcome to the Trimeet between {', '.join(teams)}!")
+    if team_count == 2:
+        print(f"Welcome to the meet between {teams[0]} and {teams[1]}!")
+    elif team_count == 3:
+        print(f"Welcome to the Trimeet between {', '.join(teams)}!")
+    else:
+        print(f"Welcome to the {team_count}-team round robin between {', '.join(teams)}!")
+
+    while True:
+        choice = menu()
+
+        if choice == "A":
+            team_input = input("Which team are you adding players for?: ").strip()
+            team_key = team_input.upper().replace(".XLSX", "")
+
+            if team_key in Meet:
+                addPlayer(Meet[team_key], team_key)
+            else:
+                print(f"❌ Team '{team_input}' not found! Available teams: {list(Meet.keys())}")
 
-while True:
-    choice = menu()
+        elif choice == "S":
+            save(Meet)
 
-    if choice == "A":
-        team_input = input("Which team are you adding players for?: ").strip()
-        team_key = team_input.upper().replace(".XLSX", "")
+        elif choice == "V":
+            print(json.dumps(Meet, indent=3))
+
+        elif choice == "X":
+            print("Exiting program...")
+            break
 
-        if team_key in Meet:
-            addPlayer(Meet[team_key], team_key)
         else:
-            print(f"❌ Team '{team_input}' not found! Available teams: {list(Meet.keys())}")
+            print("❌ Invalid selection. Try again.")
 
-    elif choice == "S":
-        save(Meet)
+    print("Final Meet Data:")
+    print(json.dumps(Meet, indent=3))
 
-    elif choice == "V":
-        print(json.dumps(Meet, indent=3))
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert roster workbooks to save.json. Without files, starts the interactive menu."
+    )
+    parser.add_argument("rosters", nargs="*",
+                        help="roster .xlsx files; use TEAM=path to set the team name")
+    parser.add_argument("--out", help="output JSON (default: save.json, or none with --db)")
+    parser.add_argument("--db", nargs="?", const=meet_store.DEFAULT_DB, metavar="FILE",
+                        help=f"store the rosters in SQLite instead (default file: {meet_store.DEFAULT_DB})")
+    parser.add_argument("--workers", type=int, help="parallel parser processes (default: CPU count)")
+    parser.add_argument("--cache", nargs="?", const=pipeline_cache.DEFAULT_DIR, metavar="DIR",
+                        help=f"reuse unchanged parsed rosters (default dir: {pipeline_cache.DEFAULT_DIR})")
+    args = parser.parse_args(argv)
 
-    elif choice == "X":
-        print("Exiting program...")
-        break
+    if not args.rosters:
+        interactive()
+        return
 
-    else:
-        print("❌ Invalid selection. Try again.")
+    rosters = roster_args(args.rosters)
+    output = args.out or (None if args.db else "save.json")
+    try:
+        Meet = ingest(rosters, output=output, workers=args.workers, cache_dir=args.cache, db=args.db)
+    except Exception as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    for team, events in Meet.items():
+        players = {p for event, ranks in events.items() if event != AVAILABILITY
+                   for entry in ranks.values() for p in entry["Player Name"]}
+        print(f"✅ {team}: {len(players)} players")
+    for target in (output, args.db):
+        if target:
+            print(f"✅ Saved to {target}")
 
-print("Final Meet Data:")
-print(json.dumps(Meet, indent=3))
+if __name__ == "__main__":
+    main()